@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import math
+import random
+import statistics
+import time
+import tracemalloc
+from collections import Counter
+from dataclasses import dataclass
+from typing import Callable
+
+from trigger_eval import (
+    BM25,
+    BM25F,
+    DEFAULT_FIELD_BOOSTS,
+    FIELDS,
+    BodyChunk,
+    BodyIndex,
+    ShardedBM25,
+    Skill,
+    rank_with_body,
+    skill_doc,
+    skill_fields,
+    tokenize,
+)
+
+
+@dataclass(frozen=True)
+class _DictSkill:
+    """The pre-compact record layout (per-instance __dict__), kept for comparison."""
+
+    name: str
+    description: str
+    scope: str = "custom"
+    short_description: str = ""
+
+
+class _ListBM25:
+    """The pre-compact BM25 layout: token lists per doc and a str -> df dict; full scan per query."""
+
+    def __init__(self, docs: list[list[str]], *, k1: float = 1.5, b: float = 0.75):
+        self.docs = docs
+        self.k1 = k1
+        self.b = b
+        self.doc_lens = [len(d) for d in docs]
+        self.avgdl = sum(self.doc_lens) / max(1, len(self.doc_lens))
+        df: dict[str, int] = {}
+        for doc in docs:
+            for term in set(doc):
+                df[term] = df.get(term, 0) + 1
+        self.df = df
+        self.N = len(docs)
+
+    def score(self, query: list[str], doc_idx: int) -> float:
+        tf: dict[str, int] = {}
+        for t in self.docs[doc_idx]:
+            tf[t] = tf.get(t, 0) + 1
+        score = 0.0
+        for term in query:
+            if term not in tf:
+                continue
+            f = tf[term]
+            df = self.df.get(term, 0)
+            idf = math.log((self.N - df + 0.5) / (df + 0.5) + 1.0)
+            denom = f + self.k1 * (1 - self.b + self.b * (self.doc_lens[doc_idx] / self.avgdl))
+            score += idf * (f * (self.k1 + 1)) / denom
+        return score
+
+    def rank(self, query: list[str], *, top_k: int) -> list[tuple[int, float]]:
+        scored = [(idx, self.score(query, idx)) for idx in range(self.N)]
+        scored.sort(key=lambda p: p[1], reverse=True)
+        return scored[:top_k]
+
+
+def _synthetic_catalog(n_skills: int, *, vocab_size: int, seed: int) -> tuple[list[tuple[str, str]], list[str]]:
+    rng = random.Random(seed)
+    vocab = [f"term{i}" for i in range(vocab_size)]
+    # Zipf-ish term frequencies, like natural-language descriptions.
+    weights = [1.0 / (i + 1) for i in range(vocab_size)]
+    catalog = []
+    for i in range(n_skills):
+        words = rng.choices(vocab, weights=weights, k=rng.randint(25, 90))
+        catalog.append((f"skill-{i}", " ".join(words)))
+    queries = [" ".join(rng.choices(vocab, weights=weights, k=rng.randint(8, 30))) for _ in range(200)]
+    return catalog, queries
+
+
+def _synthetic_bodies(
+    n_skills: int, *, sections: int, vocab_size: int, seed: int
+) -> tuple[list[BodyChunk], list[dict[str, int]]]:
+    rng = random.Random(seed + 1)
+    vocab = [f"term{i}" for i in range(vocab_size)]
+    weights = [1.0 / (i + 1) for i in range(vocab_size)]
+    chunks: list[BodyChunk] = []
+    tfs: list[dict[str, int]] = []
+    for skill in range(n_skills):
+        for section in range(sections):
+            chunks.append(BodyChunk(skill, f"Section {section}", "", 0, 0))
+            tfs.append(dict(Counter(rng.choices(vocab, weights=weights, k=rng.randint(40, 160)))))
+    return chunks, tfs
+
+
+def _measure(build: Callable[[], object]) -> tuple[object, dict]:
+    # Time without tracemalloc (it slows every allocation), then build again to measure memory.
+    gc.collect()
+    start = time.perf_counter()
+    built = build()
+    elapsed = time.perf_counter() - start
+    del built
+    gc.collect()
+    tracemalloc.start()
+    built = build()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return built, {"build_s": round(elapsed, 4), "retained_mb": round(current / 2**20, 2), "peak_mb": round(peak / 2**20, 2)}
+
+
+def _query_latency(index, queries: list[list[str]], *, top_k: int) -> dict:
+    samples = []
+    for q in queries:
+        start = time.perf_counter()
+        index.rank(q, top_k=top_k)
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return {
+        "query_p50_ms": round(statistics.median(samples), 3),
+        "query_p95_ms": round(samples[int(0.95 * (len(samples) - 1))], 3),
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark BM25 memory (tracemalloc) and latency on a synthetic catalog.")
+    parser.add_argument("--skills", type=int, default=20000, help="Synthetic catalog size (default: 20000).")
+    parser.add_argument("--vocab", type=int, default=20000, help="Synthetic vocabulary size (default: 20000).")
+    parser.add_argument("--top-k", type=int, default=20, help="Top-k per query (default: 20).")
+    parser.add_argument("--seed", type=int, default=7, help="Random seed (default: 7).")
+    parser.add_argument(
+        "--body-sections",
+        type=int,
+        default=0,
+        help="Also compare description-only vs description + N body sections per skill (default: 0 = skip).",
+    )
+    parser.add_argument("--body-weight", type=float, default=0.5, help="Body score weight (default: 0.5).")
+    parser.add_argument(
+        "--bm25f",
+        action="store_true",
+        help="Also measure BM25F over name/description/short description (query cost should match 'compact').",
+    )
+    args = parser.parse_args(argv)
+
+    catalog, raw_queries = _synthetic_catalog(args.skills, vocab_size=args.vocab, seed=args.seed)
+    queries = [tokenize(q) for q in raw_queries]
+
+    def build_lists():
+        skills = [_DictSkill(name=n, description=d) for n, d in catalog]
+        return skills, _ListBM25([tokenize(f"{s.name}\n{s.description}") for s in skills])
+
+    def build_compact():
+        skills = [Skill(name=n, description=d) for n, d in catalog]
+        return skills, BM25(skill_doc(s) for s in skills)
+
+    report: dict = {"skills": args.skills, "vocab": args.vocab}
+    for label, build in (("list", build_lists), ("compact", build_compact)):
+        built, stats = _measure(build)
+        stats.update(_query_latency(built[1], queries, top_k=args.top_k))
+        report[label] = stats
+        del built
+    report["retained_ratio"] = round(report["list"]["retained_mb"] / max(1e-9, report["compact"]["retained_mb"]), 2)
+
+    if args.bm25f:
+        # Synthetic short descriptions: the first words of the description.
+        skills = [Skill(name=n, description=d, short_description=" ".join(d.split()[:8])) for n, d in catalog]
+        boosts = [DEFAULT_FIELD_BOOSTS[f] for f in FIELDS]
+        bm25f, stats = _measure(lambda: BM25F((skill_fields(s) for s in skills), boosts=boosts))
+        stats.update(_query_latency(bm25f, queries, top_k=args.top_k))
+        report["bm25f"] = stats
+        del bm25f
+
+    if args.body_sections > 0:
+        skills = [Skill(name=n, description=d) for n, d in catalog]
+        docs = [skill_doc(s) for s in skills]
+        chunks, tfs = _synthetic_bodies(args.skills, sections=args.body_sections, vocab_size=args.vocab, seed=args.seed)
+
+        desc, stats = _measure(lambda: ShardedBM25(docs, [s.scope for s in skills]))
+        stats.update(_query_latency(desc, queries, top_k=args.top_k))
+        body, body_stats = _measure(lambda: BodyIndex(chunks, tfs))
+
+        class _WithBody:
+            def rank(self, query: list[str], *, top_k: int) -> list[tuple[int, float]]:
+                return rank_with_body(desc, body, query, skills, top_k=top_k, body_weight=args.body_weight)[0]
+
+        body_stats.update(_query_latency(_WithBody(), queries, top_k=args.top_k))
+        body_stats["retained_mb"] = round(body_stats["retained_mb"] + stats["retained_mb"], 2)
+        body_stats["chunks"] = len(chunks)
+        report["description_only"] = stats
+        report["description_plus_body"] = body_stats
+
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import json
+import random
+from collections import Counter
+from pathlib import Path
+from typing import Callable
+
+# Optional: vectorized resampling. Without NumPy, random.Random draws a different resample stream, so
+# intervals are statistically equivalent but not identical, and a gate right at its threshold can
+# flip depending on whether NumPy is installed. Within one environment a seed is reproducible.
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - depends on the environment
+    np = None
+
+# Every rate in the trigger_eval summary is a mean over per-case outcomes of some subset of cases, so
+# a case-level bootstrap of that mean gives its confidence interval. Each entry maps a summary
+# metric to (per-case outcome, or None when the case does not count towards the metric).
+Outcome = Callable[[dict, int], "float | None"]
+
+
+def _routed(item: dict) -> bool:
+    return "codex_picks" in item
+
+
+def _bm25_hit(item: dict, top_k: int) -> float | None:
+    expected = set(item.get("expected", []))
+    if not expected:
+        return None
+    return 1.0 if expected & set(item.get("bm25_top_k", [])[:top_k]) else 0.0
+
+
+def _bm25_recall(item: dict, top_k: int) -> float | None:
+    expected = set(item.get("expected", []))
+    if not expected:
+        return None
+    return len(expected & set(item.get("bm25_top_k", [])[:top_k])) / len(expected)
+
+
+def _codex_positive(score: Callable[[set[str], set[str]], float]) -> Outcome:
+    def outcome(item: dict, top_k: int) -> float | None:
+        expected = set(item.get("expected", []))
+        if not expected or not _routed(item):
+            return None
+        return score(expected, set(item["codex_picks"]))
+
+    return outcome
+
+
+def _codex_false_invoke(item: dict, top_k: int) -> float | None:
+    if item.get("expected") or not _routed(item):
+        return None
+    return 1.0 if item["codex_picks"] else 0.0
+
+
+def _codex_exact(item: dict, top_k: int) -> float | None:
+    if not _routed(item):
+        return None
+    return 1.0 if set(item["codex_picks"]) == set(item.get("expected", [])) else 0.0
+
+
+def _cascade_exact(item: dict, top_k: int) -> float | None:
+    if item.get("route_picks") is None:
+        return None
+    return 1.0 if set(item["route_picks"]) == set(item.get("expected", [])) else 0.0
+
+
+METRICS: dict[str, Outcome] = {
+    "bm25_hit_at_k": _bm25_hit,
+    "bm25_recall_at_k": _bm25_recall,
+    "codex_hit_rate": _codex_positive(lambda e, g: 1.0 if e & g else 0.0),
+    "codex_macro_recall": _codex_positive(lambda e, g: len(e & g) / len(e)),
+    "codex_macro_precision": _codex_positive(lambda e, g: (len(e & g) / len(g)) if g else 0.0),
+    "codex_false_invoke_rate": _codex_false_invoke,
+    "codex_exact_match_rate": _codex_exact,
+    "cascade_exact_match_rate": _cascade_exact,
+}
+
+LOWER_IS_BETTER = {"codex_false_invoke_rate"}
+
+
+def case_ids(payload: dict) -> list[str]:
+    """Result ids in order; paired deltas match cases by id, so every id must be present and unique."""
+    ids = [str(item.get("id", "")).strip() for item in payload.get("results", [])]
+    blank = [pos for pos, case_id in enumerate(ids) if not case_id]
+    if blank:
+        raise SystemExit(f"Results have {len(blank)} case(s) without an id (first at position {blank[0]})")
+    duplicates = sorted(case_id for case_id, count in Counter(ids).items() if count > 1)
+    if duplicates:
+        raise SystemExit(f"Results have duplicate case ids: {', '.join(duplicates)}")
+    return ids
+
+
+def case_outcomes(payload: dict) -> dict[str, dict[str, float]]:
+    """metric -> {case id: outcome} for the cases that count towards each metric."""
+    top_k = int(payload.get("summary", {}).get("top_k", 5))
+    ids = case_ids(payload)
+    outcomes: dict[str, dict[str, float]] = {}
+    for name, outcome in METRICS.items():
+        values = {}
+        for case_id, item in zip(ids, payload.get("results", [])):
+            value = outcome(item, top_k)
+            if value is not None:
+                values[case_id] = value
+        if values:
+            outcomes[name] = values
+    return outcomes
+
+
+def bootstrap_means(values: list[float], *, resamples: int, seed: int) -> list[float]:
+    """Sorted means of `resamples` with-replacement resamples of values."""
+    n = len(values)
+    if np is not None:
+        rng = np.random.default_rng(seed)
+        data = np.asarray(values, dtype=np.float64)
+        means = data[rng.integers(0, n, size=(resamples, n))].mean(axis=1)
+        means.sort()
+        return means.tolist()
+    rng = random.Random(seed)
+    return sorted(sum(rng.choices(values, k=n)) / n for _ in range(resamples))
+
+
+def interval(values: list[float], *, confidence: float, resamples: int, seed: int) -> dict:
+    """Point estimate and percentile bootstrap interval of the mean of values."""
+    point = sum(values) / len(values)
+    if len(values) < 2:
+        return {"point": point, "low": point, "high": point, "n": len(values)}
+    means = bootstrap_means(values, resamples=resamples, seed=seed)
+    tail = (1.0 - confidence) / 2
+    low = means[min(len(means) - 1, int(tail * len(means)))]
+    high = means[min(len(means) - 1, int((1.0 - tail) * len(means)))]
+    return {"point": point, "low": low, "high": high, "n": len(values)}
+
+
+def metric_intervals(payload: dict, *, confidence: float = 0.95, resamples: int = 2000, seed: int = 0) -> dict:
+    return {
+        name: interval(list(values.values()), confidence=confidence, resamples=resamples, seed=seed)
+        for name, values in case_outcomes(payload).items()
+    }
+
+
+def paired_deltas(
+    payload: dict, baseline: dict, *, confidence: float = 0.95, resamples: int = 2000, seed: int = 0
+) -> dict:
+    """
+    Per metric, the bootstrap interval of the mean per-case change vs the baseline run, over cases
+    (matched by id) that count towards the metric in both runs. `regressed` means the whole interval
+    lies on the worse side of zero.
+    """
+
+    current, previous = case_outcomes(payload), case_outcomes(baseline)
+    deltas: dict[str, dict] = {}
+    for name in METRICS:
+        shared = sorted(set(current.get(name, {})) & set(previous.get(name, {})))
+        if not shared:
+            continue
+        diffs = [current[name][case_id] - previous[name][case_id] for case_id in shared]
+        stats = interval(diffs, confidence=confidence, resamples=resamples, seed=seed)
+        stats["regressed"] = stats["low"] > 0 if name in LOWER_IS_BETTER else stats["high"] < 0
+        deltas[name] = stats
+    return deltas
+
+
+def bounded_summary(summary: dict, intervals: dict, *, bound: str) -> dict:
+    """
+    Copy of summary with each rate replaced by a bound of its interval: `pessimistic` takes the worse
+    end (lower for higher-is-better rates), `optimistic` the better end, `point` changes nothing.
+    """
+
+    if bound == "point":
+        return dict(summary)
+    bounded = dict(summary)
+    for name, stats in intervals.items():
+        worse_is_low = name not in LOWER_IS_BETTER
+        take_low = worse_is_low if bound == "pessimistic" else not worse_is_low
+        bounded[name] = stats["low"] if take_low else stats["high"]
+    return bounded
+
+
+def format_intervals(intervals: dict, *, confidence: float) -> list[str]:
+    pct = round(confidence * 100)
+    return [
+        f"{name}: {s['point']:.3f} ({pct}% CI {s['low']:.3f}-{s['high']:.3f}, n={s['n']})"
+        for name, s in intervals.items()
+    ]
+
+
+def format_deltas(deltas: dict, *, confidence: float) -> list[str]:
+    pct = round(confidence * 100)
+    return [
+        f"{name}: {s['point']:+.3f} ({pct}% CI {s['low']:+.3f} to {s['high']:+.3f}, n={s['n']})"
+        + (" REGRESSED" if s["regressed"] else "")
+        for name, s in deltas.items()
+    ]
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Bootstrap confidence intervals for trigger_eval metrics, optionally paired against a baseline run."
+    )
+    parser.add_argument("results", help="trigger_eval_results.json to analyze.")
+    parser.add_argument("--baseline", default="", help="Baseline trigger_eval_results.json for paired deltas.")
+    parser.add_argument("--confidence", type=float, default=0.95, help="Interval confidence level (default: 0.95).")
+    parser.add_argument("--resamples", type=int, default=2000, help="Bootstrap resamples (default: 2000).")
+    parser.add_argument("--seed", type=int, default=0, help="Resampling seed (default: 0).")
+    parser.add_argument("--out", default="", help="Optional output JSON path.")
+    args = parser.parse_args(argv)
+
+    payload = json.loads(Path(args.results).expanduser().read_text(encoding="utf-8"))
+    options = {"confidence": float(args.confidence), "resamples": max(1, int(args.resamples)), "seed": int(args.seed)}
+    report: dict = {"intervals": metric_intervals(payload, **options)}
+    for line in format_intervals(report["intervals"], confidence=args.confidence):
+        print(line)
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).expanduser().read_text(encoding="utf-8"))
+        report["deltas"] = paired_deltas(payload, baseline, **options)
+        print("Paired change vs baseline:")
+        for line in format_deltas(report["deltas"], confidence=args.confidence):
+            print(f"  {line}")
+
+    if args.out:
+        out_path = Path(args.out).expanduser().resolve()
+        out_path.parent.mkdir(parents=True, exist_ok=True)
+        out_path.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+    return 1 if any(d["regressed"] for d in report.get("deltas", {}).values()) else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
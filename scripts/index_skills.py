@@ -5,11 +5,17 @@ import argparse
 import json
 import os
 import re
+import zipfile
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import asdict, dataclass
 from pathlib import Path
+from typing import Container
 
+from skill_text import markdown_sections, tokenize
 
-@dataclass(frozen=True)
+
+@dataclass(frozen=True, slots=True)
 class SkillRecord:
     name: str
     description: str
@@ -24,11 +30,15 @@ class SkillRecord:
     has_references: bool
     has_examples: bool
     has_assets: bool
+    aliases: str = ""
 
 
 FRONTMATTER_BOUNDARY = "---"
 
 
+SCOPES = (".system", ".curated", ".experimental", "custom")
+
+
 def _extract_frontmatter(text: str) -> str:
     lines = text.splitlines()
     if not lines or lines[0].strip() != FRONTMATTER_BOUNDARY:
@@ -45,7 +55,7 @@ def _parse_frontmatter_minimal(frontmatter: str) -> dict[str, str]:
     Minimal YAML-ish parser that supports:
       - key: value (single-line)
       - key: | / > (indented block scalar, incl. |-, >-, etc)
-      - metadata.short-description (nested)
+      - metadata.short-description, metadata.aliases (nested)
     We only extract a small set of fields for indexing.
     """
 
@@ -89,10 +99,12 @@ def _parse_frontmatter_minimal(frontmatter: str) -> dict[str, str]:
                 nested_key = nested_match.group(1)
                 nested_raw = nested_match.group(2)
 
-                # Only handle metadata.short-description for now.
-                if nested_key != "short-description":
-                    continue
-                result["metadata.short-description"] = parse_value(nested_raw)
+                if nested_key == "short-description":
+                    result["metadata.short-description"] = parse_value(nested_raw)
+                elif nested_key == "aliases":
+                    # Comma-separated, or a flow list: [pdf, "pdf tools"].
+                    items = parse_value(nested_raw).strip("[]").split(",")
+                    result["metadata.aliases"] = ", ".join(filter(None, (parse_value(item) for item in items)))
             continue
 
         is_block_scalar = raw_value.strip().startswith(("|", ">"))
@@ -128,6 +140,37 @@ def _parse_frontmatter_minimal(frontmatter: str) -> dict[str, str]:
     return result
 
 
+def _body_chunks(raw: bytes) -> list[dict]:
+    """
+    Split a SKILL.md body (after frontmatter) into sections at Markdown headings, skipping headings
+    inside fenced code blocks. Each chunk keeps its heading, byte range in the file (so the text can be
+    read back lazily) and term frequencies for indexing.
+    """
+
+    lines = raw.splitlines(keepends=True)
+    start_line = 0
+    if lines and lines[0].strip() == FRONTMATTER_BOUNDARY.encode():
+        for i in range(1, len(lines)):
+            if lines[i].strip() == FRONTMATTER_BOUNDARY.encode():
+                start_line = i + 1
+                break
+    pos = sum(len(line) for line in lines[:start_line])
+
+    chunks: list[dict] = []
+    for heading, start, end in markdown_sections(lines[start_line:], pos=pos):
+        tf = Counter(tokenize(raw[start:end].decode("utf-8", errors="replace")))
+        if tf:
+            chunks.append({"heading": heading, "start": start, "end": end, "tf": dict(tf)})
+    return chunks
+
+
+def _load_body_chunks(skill_md: Path) -> list[dict]:
+    try:
+        return _body_chunks(skill_md.read_bytes())
+    except OSError:
+        return []
+
+
 def _infer_scope(skill_dir: Path) -> str:
     parts = set(skill_dir.parts)
     if ".system" in parts:
@@ -139,6 +182,16 @@ def _infer_scope(skill_dir: Path) -> str:
     return "custom"
 
 
+def normalize_scope(raw: str) -> str:
+    """Accept scope names with or without the leading dot (e.g. `curated` -> `.curated`)."""
+    value = raw.strip()
+    if value in SCOPES:
+        return value
+    if f".{value}" in SCOPES:
+        return f".{value}"
+    raise SystemExit(f"Unknown scope '{raw}' (expected one of: {', '.join(SCOPES)})")
+
+
 def _default_skills_dir() -> Path:
     codex_home = Path(os.environ.get("CODEX_HOME", Path.home() / ".codex")).expanduser()
     return codex_home / "skills"
@@ -157,7 +210,43 @@ def _load_record(skill_dir: Path) -> SkillRecord | None:
         content = skill_md.read_text(encoding="utf-8", errors="replace")
     except Exception:
         return None
+    subdirs = {name for name in ("scripts", "references", "examples", "assets") if (skill_dir / name).is_dir()}
+    return _record_from_text(content, skill_dir, subdirs=subdirs)
+
 
+def _discover_skill_archives(root: Path) -> list[Path]:
+    return sorted(root.rglob("*.skill")) if root.exists() else []
+
+
+def _load_archive_record(archive: Path) -> SkillRecord | None:
+    """
+    Record for a packaged .skill file, read without extracting it: the file list comes from the zip
+    central directory and SKILL.md is the only member decompressed. skill_dir/skill_md point inside
+    the archive (`dist/foo.skill/foo/SKILL.md`).
+    """
+
+    from validate_skill import read_archive_skill
+
+    try:
+        with zipfile.ZipFile(archive) as zipf:
+            top, files, content = read_archive_skill(zipf)
+    except (OSError, zipfile.BadZipFile, ValueError):
+        return None
+    if content is None:
+        return None
+    subdirs = {relpath.parts[0] for relpath in files if len(relpath.parts) > 1}
+    return _record_from_text(content, archive / top, subdirs=subdirs)
+
+
+def load_archive_records(archives: list[Path], *, jobs: int = 0) -> list[SkillRecord]:
+    """Records for many archives, read concurrently."""
+    with ThreadPoolExecutor(max_workers=jobs or None) as pool:
+        return [r for r in pool.map(_load_archive_record, archives) if r is not None]
+
+
+def _record_from_text(content: str, skill_dir: Path, *, subdirs: Container[str]) -> SkillRecord:
+    """Build a record from SKILL.md text; `subdirs` names the skill's top-level directories."""
+    skill_md = skill_dir / "SKILL.md"
     frontmatter = _extract_frontmatter(content)
     parsed = _parse_frontmatter_minimal(frontmatter) if frontmatter else {}
     name = (parsed.get("name") or "").strip() or skill_dir.name
@@ -166,6 +255,7 @@ def _load_record(skill_dir: Path) -> SkillRecord | None:
     version = (parsed.get("version") or "").strip()
     license_text = (parsed.get("license") or "").strip()
     allowed_tools = (parsed.get("allowed-tools") or "").strip()
+    aliases = (parsed.get("metadata.aliases") or "").strip()
 
     return SkillRecord(
         name=name,
@@ -177,14 +267,84 @@ def _load_record(skill_dir: Path) -> SkillRecord | None:
         skill_dir=str(skill_dir),
         skill_md=str(skill_md),
         scope_hint=_infer_scope(skill_dir),
-        has_scripts=(skill_dir / "scripts").is_dir(),
-        has_references=(skill_dir / "references").is_dir(),
-        has_examples=(skill_dir / "examples").is_dir(),
-        has_assets=(skill_dir / "assets").is_dir(),
+        has_scripts="scripts" in subdirs,
+        has_references="references" in subdirs,
+        has_examples="examples" in subdirs,
+        has_assets="assets" in subdirs,
+        aliases=aliases,
     )
 
 
-def main() -> int:
+def write_index(
+    records: list[SkillRecord],
+    *,
+    skills_dir: Path,
+    out_path: Path,
+    binary_out: Path | None = None,
+    body_chunks: dict[str, list[dict]] | None = None,
+    mentions: bool = False,
+) -> None:
+    """
+    Write skills_index.json (and optionally the binary catalog). With body_chunks, the index also
+    carries `body_chunks`: SKILL.md path -> section chunks; with mentions, `mentions`: the serialized
+    name/alias automaton (see scripts/skill_mentions.py). The binary catalog holds records only.
+    """
+
+    records = sorted(records, key=lambda r: r.skill_dir)
+    payload: dict = {"skills_dir": str(skills_dir), "count": len(records), "skills": [asdict(r) for r in records]}
+    if body_chunks is not None:
+        payload["body_chunks"] = {r.skill_md: body_chunks[r.skill_md] for r in records if r.skill_md in body_chunks}
+    if mentions:
+        from skill_mentions import MentionAutomaton
+
+        payload["mentions"] = MentionAutomaton.from_records(payload["skills"]).to_json()
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    out_path.write_text(json.dumps(payload, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+    if binary_out is not None:
+        from skill_catalog import write_catalog
+
+        write_catalog(payload, binary_out)
+
+
+def update_index(*, skills_dir: Path, out_path: Path, changed: list[Path], binary_out: Path | None = None) -> int:
+    """
+    Re-read only the `changed` skill dirs and merge them into the index at out_path (dropping any that
+    no longer exist). Falls back to a full scan when out_path is missing or indexes another skills dir.
+    Returns the number of indexed skills.
+    """
+
+    skills_dir = skills_dir.resolve()
+    previous = json.loads(out_path.read_text(encoding="utf-8")) if out_path.is_file() else None
+    # Body chunks are kept up to date only when the existing index was built with --index-body.
+    body_chunks = previous.get("body_chunks") if previous is not None else None
+    mentions = previous is not None and "mentions" in previous
+    if previous is None or previous.get("skills_dir") != str(skills_dir):
+        records = [r for r in map(_load_record, _discover_skill_dirs(skills_dir)) if r is not None]
+        changed = [Path(r.skill_dir) for r in records]
+        body_chunks = {} if body_chunks is not None else None
+    else:
+        touched = {str(d.resolve()) for d in changed}
+        records = [SkillRecord(**raw) for raw in previous.get("skills", []) if raw.get("skill_dir") not in touched]
+        for skill_dir in changed:
+            record = _load_record(skill_dir.resolve())
+            if record is not None:
+                records.append(record)
+    if body_chunks is not None:
+        for skill_dir in changed:
+            skill_md = skill_dir.resolve() / "SKILL.md"
+            body_chunks[str(skill_md)] = _load_body_chunks(skill_md)
+    write_index(
+        records,
+        skills_dir=skills_dir,
+        out_path=out_path,
+        binary_out=binary_out,
+        body_chunks=body_chunks,
+        mentions=mentions,
+    )
+    return len(records)
+
+
+def main(argv: list[str] | None = None) -> int:
     parser = argparse.ArgumentParser(description="Index Codex skills (name/description/path) into JSON.")
     parser.add_argument(
         "--skills-dir",
@@ -196,31 +356,82 @@ def main() -> int:
         default="skills_index.json",
         help="Output JSON path (default: skills_index.json).",
     )
-    args = parser.parse_args()
-
-    skills_dir = Path(args.skills_dir).expanduser() if args.skills_dir else _default_skills_dir()
+    parser.add_argument(
+        "--binary-out",
+        default="",
+        help="Also write a memory-mapped binary catalog (see scripts/skill_catalog.py) to this path.",
+    )
+    parser.add_argument(
+        "--only-scope",
+        default="",
+        help="Re-index a single scope (.system/.curated/.experimental/custom) and keep other scopes from --out.",
+    )
+    parser.add_argument(
+        "--index-body",
+        action="store_true",
+        help="Also index SKILL.md bodies as heading-level chunks (stored under `body_chunks`).",
+    )
+    parser.add_argument(
+        "--mention-automaton",
+        action="store_true",
+        help="Also store the skill name/alias mention automaton (under `mentions`) for routing fast paths.",
+    )
+    parser.add_argument(
+        "--archives",
+        default="",
+        help="Index the packaged .skill files under this directory (e.g. dist/) instead of --skills-dir, "
+        "without extracting them.",
+    )
+    parser.add_argument("--jobs", type=int, default=0, help="With --archives: parallel archive reads (default: auto).")
+    args = parser.parse_args(argv)
+
+    if args.archives:
+        if args.index_body:
+            raise SystemExit("--index-body reads sections from SKILL.md files on disk; it does not support --archives.")
+        skills_dir = Path(args.archives).expanduser()
+    else:
+        skills_dir = Path(args.skills_dir).expanduser() if args.skills_dir else _default_skills_dir()
     skills_dir = skills_dir.resolve()
+    out_path = Path(args.out).expanduser().resolve()
+    only_scope = normalize_scope(args.only_scope) if args.only_scope else ""
 
     records: list[SkillRecord] = []
-    for skill_dir in _discover_skill_dirs(skills_dir):
-        record = _load_record(skill_dir)
-        if record is None:
-            continue
-        records.append(record)
-
-    out_path = Path(args.out).expanduser().resolve()
-    out_path.parent.mkdir(parents=True, exist_ok=True)
-    out_path.write_text(
-        json.dumps(
-            {"skills_dir": str(skills_dir), "count": len(records), "skills": [asdict(r) for r in records]},
-            ensure_ascii=False,
-            indent=2,
-        )
-        + "\n",
-        encoding="utf-8",
+    body_chunks: dict[str, list[dict]] | None = {} if args.index_body else None
+    if only_scope and out_path.is_file():
+        previous = json.loads(out_path.read_text(encoding="utf-8"))
+        for raw in previous.get("skills", []):
+            if raw.get("scope_hint") != only_scope:
+                records.append(SkillRecord(**raw))
+                if body_chunks is not None and raw.get("skill_md") in previous.get("body_chunks", {}):
+                    body_chunks[raw["skill_md"]] = previous["body_chunks"][raw["skill_md"]]
+
+    if args.archives:
+        archives = [a for a in _discover_skill_archives(skills_dir) if not only_scope or _infer_scope(a) == only_scope]
+        records.extend(load_archive_records(archives, jobs=args.jobs))
+    else:
+        for skill_dir in _discover_skill_dirs(skills_dir):
+            if only_scope and _infer_scope(skill_dir) != only_scope:
+                continue
+            record = _load_record(skill_dir)
+            if record is None:
+                continue
+            records.append(record)
+            if body_chunks is not None:
+                body_chunks[record.skill_md] = _load_body_chunks(Path(record.skill_md))
+    binary_out = Path(args.binary_out).expanduser().resolve() if args.binary_out else None
+    write_index(
+        records,
+        skills_dir=skills_dir,
+        out_path=out_path,
+        binary_out=binary_out,
+        body_chunks=body_chunks,
+        mentions=args.mention_automaton,
     )
 
-    print(f"Wrote {len(records)} skills to {out_path}")
+    if only_scope:
+        print(f"Re-indexed scope {only_scope}; wrote {len(records)} skills to {out_path}")
+    else:
+        print(f"Wrote {len(records)} skills to {out_path}")
     return 0
 
 
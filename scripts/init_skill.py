@@ -127,13 +127,13 @@ def init_skill(*, skill_name: str, parent_dir: Path, resources: list[str], examp
     return skill_dir
 
 
-def main() -> int:
+def main(argv: list[str] | None = None) -> int:
     parser = argparse.ArgumentParser(description="Initialize a new skill folder with a SKILL.md template.")
     parser.add_argument("skill_name", help="Skill name (will be normalized to hyphen-case)")
     parser.add_argument("--path", required=True, help="Parent output directory (e.g., skills/)")
     parser.add_argument("--resources", default="", help="Comma-separated list: scripts,references,assets")
     parser.add_argument("--examples", action="store_true", help="Create example files inside selected resource directories")
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
 
     raw_skill_name = str(args.skill_name)
     skill_name = _normalize_skill_name(raw_skill_name)
@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import shutil
+import stat
+import tempfile
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path, PurePosixPath
+
+from index_skills import _default_skills_dir, normalize_scope, update_index
+from package_skill import MANIFEST_FORMAT, MANIFEST_NAME, manifest_digest
+
+
+@dataclass(frozen=True)
+class InstallResult:
+    archive: str
+    skill: str
+    status: str  # installed | updated | unchanged | failed
+    detail: str = ""
+
+
+class InstallError(Exception):
+    pass
+
+
+def _installed_digest(skill_root: Path) -> str:
+    try:
+        return str(json.loads((skill_root / MANIFEST_NAME).read_text(encoding="utf-8")).get("digest", ""))
+    except (OSError, ValueError):
+        return ""
+
+
+def _read_archive_manifest(zipf: zipfile.ZipFile) -> tuple[str, dict]:
+    """The archive's single top-level directory and its verified manifest."""
+
+    tops: set[str] = set()
+    for info in zipf.infolist():
+        rel = PurePosixPath(info.filename)
+        # Zip-slip: every member must stay inside the skill directory once extracted.
+        if rel.is_absolute() or ".." in rel.parts or "\\" in info.filename or not rel.parts:
+            raise InstallError(f"unsafe member path {info.filename!r}")
+        if stat.S_ISLNK(info.external_attr >> 16):
+            raise InstallError(f"symlink member {info.filename!r}")
+        tops.add(rel.parts[0])
+    if len(tops) != 1:
+        raise InstallError(f"expected one top-level skill directory, found {sorted(tops)}")
+    top = tops.pop()
+    try:
+        manifest = json.loads(zipf.read(f"{top}/{MANIFEST_NAME}"))
+    except KeyError:
+        raise InstallError(f"no {MANIFEST_NAME} (repackage with scripts/package_skill.py)") from None
+    if manifest.get("format") != MANIFEST_FORMAT:
+        raise InstallError(f"unsupported manifest format {manifest.get('format')}")
+    files = manifest.get("files", {})
+    if manifest_digest(files) != manifest.get("digest"):
+        raise InstallError("manifest digest does not match its file list")
+    members = {
+        PurePosixPath(info.filename).relative_to(top).as_posix()
+        for info in zipf.infolist()
+        if not info.is_dir() and info.filename != f"{top}/{MANIFEST_NAME}"
+    }
+    if members != set(files):
+        extra, missing = sorted(members - set(files)), sorted(set(files) - members)
+        raise InstallError(f"archive does not match manifest (extra: {extra}, missing: {missing})")
+    return top, manifest
+
+
+def _extract_verified(zipf: zipfile.ZipFile, top: str, manifest: dict, dest: Path) -> None:
+    for relpath, entry in manifest["files"].items():
+        target = dest.joinpath(*PurePosixPath(relpath).parts)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        digest = hashlib.sha256()
+        with zipf.open(f"{top}/{relpath}") as src, target.open("wb") as dst:
+            for chunk in iter(lambda: src.read(1 << 20), b""):
+                digest.update(chunk)
+                dst.write(chunk)
+        if digest.hexdigest() != entry["sha256"]:
+            raise InstallError(f"sha256 mismatch for {relpath}")
+        target.chmod(int(entry["mode"]) & 0o777)
+    (dest / MANIFEST_NAME).write_text(json.dumps(manifest, indent=2) + "\n", encoding="utf-8")
+
+
+def _swap_into_place(staged: Path, skill_root: Path) -> None:
+    if not skill_root.exists():
+        staged.rename(skill_root)
+        return
+    # Two renames on the same filesystem: the old tree is moved aside only once the new one is complete,
+    # and restored if the second rename fails.
+    retired = Path(tempfile.mkdtemp(prefix=f".{skill_root.name}.old-", dir=skill_root.parent))
+    retired.rmdir()
+    skill_root.rename(retired)
+    try:
+        staged.rename(skill_root)
+    except OSError:
+        retired.rename(skill_root)
+        raise
+    shutil.rmtree(retired, ignore_errors=True)
+
+
+def install_archive(archive: Path, *, install_root: Path, force: bool = False) -> InstallResult:
+    try:
+        with zipfile.ZipFile(archive) as zipf:
+            top, manifest = _read_archive_manifest(zipf)
+            skill_root = install_root / top
+            existed = skill_root.exists()
+            if existed and not force and _installed_digest(skill_root) == manifest["digest"]:
+                return InstallResult(str(archive), top, "unchanged")
+            install_root.mkdir(parents=True, exist_ok=True)
+            # Stage next to the destination so the final rename never crosses filesystems.
+            staged = Path(tempfile.mkdtemp(prefix=f".{top}.installing-", dir=install_root))
+            try:
+                _extract_verified(zipf, top, manifest, staged)
+                staged.chmod(0o755)
+                _swap_into_place(staged, skill_root)
+            finally:
+                shutil.rmtree(staged, ignore_errors=True)
+    except (InstallError, zipfile.BadZipFile, OSError) as exc:
+        return InstallResult(str(archive), "", "failed", str(exc))
+    return InstallResult(str(archive), top, "updated" if existed else "installed")
+
+
+def install_archives(
+    archives: list[Path], *, install_root: Path, jobs: int = 0, force: bool = False
+) -> list[InstallResult]:
+    """Install archives concurrently; archives that target the same skill directory are rejected."""
+
+    by_name: dict[str, list[Path]] = {}
+    for archive in archives:
+        try:
+            with zipfile.ZipFile(archive) as zipf:
+                names = zipf.namelist()
+        except (zipfile.BadZipFile, OSError):
+            continue  # reported by install_archive
+        if names:
+            by_name.setdefault(PurePosixPath(names[0]).parts[0], []).append(archive)
+    clashes = {name: paths for name, paths in by_name.items() if len(paths) > 1}
+    if clashes:
+        raise SystemExit(f"Several archives install the same skill: {sorted(clashes)}")
+    with ThreadPoolExecutor(max_workers=jobs or None) as pool:
+        return list(pool.map(lambda a: install_archive(a, install_root=install_root, force=force), archives))
+
+
+def _collect_archives(paths: list[str]) -> list[Path]:
+    archives: list[Path] = []
+    for raw in paths:
+        path = Path(raw).expanduser().resolve()
+        archives.extend(sorted(path.glob("*.skill")) if path.is_dir() else [path])
+    return archives
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Install .skill archives into $CODEX_HOME/skills, verifying their embedded manifests."
+    )
+    parser.add_argument("archives", nargs="+", help=".skill files, or directories containing them.")
+    parser.add_argument(
+        "--skills-dir",
+        default="",
+        help="Skills directory (default: $CODEX_HOME/skills or ~/.codex/skills).",
+    )
+    parser.add_argument(
+        "--scope",
+        default="custom",
+        help="Install under this scope (.system/.curated/.experimental/custom; default: custom).",
+    )
+    parser.add_argument("--jobs", type=int, default=0, help="Parallel installs (default: auto).")
+    parser.add_argument("--force", action="store_true", help="Reinstall even when the installed digest matches.")
+    parser.add_argument(
+        "--index",
+        default="",
+        help="skills_index.json to refresh for the installed skills (default: skip).",
+    )
+    parser.add_argument("--binary-index", default="", help="Also rewrite this binary catalog with --index.")
+    args = parser.parse_args(argv)
+
+    skills_dir = (Path(args.skills_dir).expanduser() if args.skills_dir else _default_skills_dir()).resolve()
+    scope = normalize_scope(args.scope)
+    install_root = skills_dir if scope == "custom" else skills_dir / scope
+
+    results = install_archives(
+        _collect_archives(args.archives), install_root=install_root, jobs=args.jobs, force=args.force
+    )
+    for result in results:
+        if result.status == "failed":
+            print(f"[ERROR] {result.archive}: {result.detail}")
+        else:
+            print(f"[{result.status.upper()}] {result.skill}")
+
+    changed = [install_root / r.skill for r in results if r.status in {"installed", "updated"}]
+    if args.index and changed:
+        out_path = Path(args.index).expanduser().resolve()
+        binary_out = Path(args.binary_index).expanduser().resolve() if args.binary_index else None
+        count = update_index(skills_dir=skills_dir, out_path=out_path, changed=changed, binary_out=binary_out)
+        print(f"Refreshed {len(changed)} skill(s) in {out_path} ({count} indexed)")
+
+    counts = {
+        status: sum(1 for r in results if r.status == status)
+        for status in ("installed", "updated", "unchanged", "failed")
+    }
+    print(", ".join(f"{n} {status}" for status, n in counts.items()))
+    return 1 if counts["failed"] else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -2,13 +2,23 @@
 from __future__ import annotations
 
 import argparse
+import hashlib
+import json
 import zipfile
 from pathlib import Path
 
 from validate_skill import validate_skill
 
 
+# Written at the root of every packaged skill; install_skill.py verifies against it and keeps it in
+# the installed skill directory so re-installs can be skipped by digest.
+MANIFEST_NAME = ".skill_manifest.json"
+MANIFEST_FORMAT = 1
+
+
 def _should_exclude(relative_path: Path) -> bool:
+    if relative_path.as_posix() == MANIFEST_NAME:
+        return True
     parts = set(relative_path.parts)
     if ".git" in parts or ".skillops" in parts or "__pycache__" in parts:
         return True
@@ -19,6 +29,35 @@ def _should_exclude(relative_path: Path) -> bool:
     return False
 
 
+def _sha256_file(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as fh:
+        for chunk in iter(lambda: fh.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def manifest_digest(files: dict[str, dict]) -> str:
+    """Digest over (relpath, sha256, mode) of every file: equal digests mean identical skill contents."""
+    digest = hashlib.sha256()
+    for relpath in sorted(files):
+        entry = files[relpath]
+        digest.update(f"{relpath}\0{entry['sha256']}\0{entry['mode']:o}\n".encode("utf-8"))
+    return digest.hexdigest()
+
+
+def build_manifest(skill_dir: Path, files: list[Path]) -> dict:
+    entries: dict[str, dict] = {}
+    for file_path in files:
+        stat = file_path.stat()
+        entries[file_path.relative_to(skill_dir).as_posix()] = {
+            "sha256": _sha256_file(file_path),
+            "size": stat.st_size,
+            "mode": stat.st_mode & 0o777,
+        }
+    return {"format": MANIFEST_FORMAT, "name": skill_dir.name, "digest": manifest_digest(entries), "files": entries}
+
+
 def package_skill(*, skill_dir: Path, out_dir: Path) -> Path:
     skill_dir = skill_dir.expanduser().resolve()
     out_dir = out_dir.expanduser().resolve()
@@ -32,24 +71,23 @@ def package_skill(*, skill_dir: Path, out_dir: Path) -> Path:
     out_dir.mkdir(parents=True, exist_ok=True)
     out_path = out_dir / f"{skill_dir.name}.skill"
 
+    files = [
+        p for p in sorted(skill_dir.rglob("*")) if p.is_file() and not _should_exclude(p.relative_to(skill_dir))
+    ]
+    manifest = build_manifest(skill_dir, files)
     with zipfile.ZipFile(out_path, "w", zipfile.ZIP_DEFLATED) as zipf:
-        for file_path in sorted(skill_dir.rglob("*")):
-            if not file_path.is_file():
-                continue
-            relative = file_path.relative_to(skill_dir)
-            if _should_exclude(relative):
-                continue
-            arcname = file_path.relative_to(skill_dir.parent)
-            zipf.write(file_path, arcname)
+        for file_path in files:
+            zipf.write(file_path, file_path.relative_to(skill_dir.parent))
+        zipf.writestr(f"{skill_dir.name}/{MANIFEST_NAME}", json.dumps(manifest, indent=2) + "\n")
 
     return out_path
 
 
-def main() -> int:
+def main(argv: list[str] | None = None) -> int:
     parser = argparse.ArgumentParser(description="Package a skill folder into a distributable .skill (zip) file.")
     parser.add_argument("skill_dir", help="Path to the skill directory (contains SKILL.md)")
     parser.add_argument("out_dir", nargs="?", default="dist", help="Output directory for the .skill file (default: dist/)")
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
 
     out_path = package_skill(skill_dir=Path(args.skill_dir), out_dir=Path(args.out_dir))
     print(f"[OK] Wrote: {out_path}")
@@ -0,0 +1,315 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import re
+import threading
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from pathlib import Path
+
+# Router backends for trigger_eval.py --use-codex, selected with --router:
+#   codex  the `codex exec` CLI (the default)
+#   bm25   in-process: the top BM25 candidate, none when nothing scores; no I/O at all
+#   stub   a local HTTP server that replays recorded decisions with configurable latency and error
+#          rate, deterministically per seed, for exercising retries, deadlines and the circuit
+#          breaker (and measuring pipeline throughput) with no network or model
+# A backend raises TransientRouterError for failures worth retrying; anything else fails the case.
+
+
+class TransientRouterError(RuntimeError):
+    """A router failure worth retrying (timeout, non-zero exit)."""
+
+
+@dataclass(frozen=True)
+class RouteRequest:
+    case_id: str
+    prompt: str
+    router_prompt: str
+    candidates: list[str]
+    scores: list[float]
+
+
+def _extract_json(text: str) -> dict:
+    text = text.strip()
+    if text.startswith("```"):
+        match = re.search(r"```(?:json)?\s*(\{.*?\})\s*```", text, flags=re.DOTALL | re.IGNORECASE)
+        if match:
+            text = match.group(1).strip()
+    try:
+        return json.loads(text)
+    except Exception:
+        match = re.search(r"(\{.*\})", text, flags=re.DOTALL)
+        if not match:
+            raise
+        return json.loads(match.group(1))
+
+
+def _skill_names(payload: dict) -> list[str]:
+    skills = payload.get("skills", [])
+    if not isinstance(skills, list):
+        return []
+    return [str(s).strip() for s in skills if str(s).strip()]
+
+
+class RouterBackend(ABC):
+    name = ""
+
+    @abstractmethod
+    def select(self, request: RouteRequest, *, timeout_s: float) -> list[str]:
+        """Skills to invoke for the request; raise TransientRouterError for a retryable failure."""
+
+    def close(self) -> None:
+        pass
+
+
+class CodexBackend(RouterBackend):
+    name = "codex"
+
+    def select(self, request: RouteRequest, *, timeout_s: float) -> list[str]:
+        # Imported here so BM25-only runs (and `skillops` startup) skip subprocess/tempfile.
+        import subprocess
+        import tempfile
+
+        tmp_path: str | None = None
+        try:
+            with tempfile.NamedTemporaryFile(prefix="codex_skill_router_", suffix=".json", delete=False) as fh:
+                tmp_path = fh.name
+
+            try:
+                proc = subprocess.run(
+                    [
+                        "codex",
+                        "exec",
+                        "--skip-git-repo-check",
+                        "--sandbox",
+                        "read-only",
+                        "--output-last-message",
+                        tmp_path,
+                        "-",
+                    ],
+                    input=request.router_prompt.encode("utf-8"),
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.PIPE,
+                    timeout=timeout_s,
+                )
+            except subprocess.TimeoutExpired as e:
+                raise TransientRouterError(f"codex timed out after {timeout_s:.1f}s") from e
+            if proc.returncode != 0:
+                raise TransientRouterError(proc.stderr.decode("utf-8", errors="replace"))
+
+            raw = Path(tmp_path).read_text(encoding="utf-8", errors="replace")
+            return _skill_names(_extract_json(raw))
+        finally:
+            if tmp_path:
+                Path(tmp_path).unlink(missing_ok=True)
+
+
+class BM25Backend(RouterBackend):
+    name = "bm25"
+
+    def select(self, request: RouteRequest, *, timeout_s: float) -> list[str]:
+        if request.candidates and request.scores and request.scores[0] > 0:
+            return [request.candidates[0]]
+        return []
+
+
+def load_decisions(path: Path) -> dict[str, list[str]]:
+    """
+    prompt -> recorded skills, from a trigger_eval results file (codex_picks, else route_picks) or,
+    for an oracle stub, a cases file (expected).
+    """
+
+    payload = json.loads(path.read_text(encoding="utf-8"))
+    decisions: dict[str, list[str]] = {}
+    for item in payload.get("results", []):
+        picks = item.get("codex_picks", item.get("route_picks"))
+        if picks is not None:
+            decisions[str(item.get("prompt", "")).strip()] = list(picks)
+    for case in payload.get("cases", []):
+        decisions[str(case.get("prompt", "")).strip()] = [str(s).strip() for s in case.get("expected", [])]
+    return decisions
+
+
+class StubServer:
+    """
+    Replays `decisions` over HTTP (POST /route, JSON {"prompt": ...} -> {"skills": [...]}). Each request
+    waits latency_ms plus up to jitter_ms and fails with 503 at error_rate. The draws depend only on the
+    seed, the prompt and how often that prompt was asked before, so reruns see the same failures.
+    Unknown prompts route to no skill.
+    """
+
+    def __init__(
+        self,
+        decisions: dict[str, list[str]],
+        *,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+        error_rate: float = 0.0,
+        seed: int = 0,
+    ):
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        stub = self
+        self.decisions = decisions
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.seed = seed
+        self.requests = 0
+        self._attempts: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self) -> None:
+                length = int(self.headers.get("Content-Length", 0))
+                try:
+                    prompt = str(json.loads(self.rfile.read(length)).get("prompt", "")).strip()
+                except ValueError:
+                    self._reply(400, {"error": "invalid JSON"})
+                    return
+                status, body = stub.respond(prompt)
+                self._reply(status, body)
+
+            def _reply(self, status: int, body: dict) -> None:
+                data = json.dumps(body).encode("utf-8")
+                try:
+                    self.send_response(status)
+                    self.send_header("Content-Type", "application/json")
+                    self.send_header("Content-Length", str(len(data)))
+                    self.end_headers()
+                    self.wfile.write(data)
+                except (BrokenPipeError, ConnectionResetError):
+                    pass  # the client timed out first, which is what a timeout test wants
+
+            def log_message(self, *args: object) -> None:
+                pass  # keep load tests quiet
+
+        self.server = ThreadingHTTPServer((host, port), Handler)
+        self.server.daemon_threads = True
+        self.url = f"http://{host}:{self.server.server_address[1]}/route"
+
+    def respond(self, prompt: str) -> tuple[int, dict]:
+        with self._lock:
+            self.requests += 1
+            attempt = self._attempts.get(prompt, 0)
+            self._attempts[prompt] = attempt + 1
+        rng = random.Random(f"{self.seed}:{attempt}:{prompt}")
+        time.sleep((self.latency_ms + rng.uniform(0, self.jitter_ms)) / 1000)
+        if rng.random() < self.error_rate:
+            return 503, {"error": "stub: injected failure"}
+        return 200, {"skills": self.decisions.get(prompt, [])}
+
+    def start(self) -> StubServer:
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def close(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class StubBackend(RouterBackend):
+    name = "stub"
+
+    def __init__(self, url: str, *, server: StubServer | None = None):
+        self.url = url
+        self.server = server
+
+    def select(self, request: RouteRequest, *, timeout_s: float) -> list[str]:
+        import urllib.error
+        import urllib.request
+
+        body = json.dumps(
+            {"case_id": request.case_id, "prompt": request.prompt, "candidates": request.candidates}
+        ).encode("utf-8")
+        http_request = urllib.request.Request(self.url, data=body, headers={"Content-Type": "application/json"})
+        try:
+            with urllib.request.urlopen(http_request, timeout=timeout_s) as response:
+                return _skill_names(json.loads(response.read()))
+        except urllib.error.HTTPError as e:
+            if e.code >= 500:
+                raise TransientRouterError(f"stub router returned HTTP {e.code}") from e
+            raise
+        except (urllib.error.URLError, TimeoutError) as e:
+            raise TransientRouterError(f"stub router unreachable or timed out: {e}") from e
+
+    def close(self) -> None:
+        if self.server is not None:
+            self.server.close()
+
+
+BACKENDS = ("codex", "bm25", "stub")
+
+
+def create_backend(
+    name: str,
+    *,
+    url: str = "",
+    decisions_path: Path | None = None,
+    latency_ms: float = 0.0,
+    jitter_ms: float = 0.0,
+    error_rate: float = 0.0,
+    seed: int = 0,
+) -> RouterBackend:
+    """Backend by name. `stub` talks to `url`, or starts an in-process server replaying decisions_path."""
+    if name == "codex":
+        return CodexBackend()
+    if name == "bm25":
+        return BM25Backend()
+    if name == "stub":
+        if url:
+            return StubBackend(url)
+        if decisions_path is None:
+            raise SystemExit("The stub router needs recorded decisions or --router-url.")
+        server = StubServer(
+            load_decisions(decisions_path),
+            latency_ms=latency_ms,
+            jitter_ms=jitter_ms,
+            error_rate=error_rate,
+            seed=seed,
+        ).start()
+        return StubBackend(server.url, server=server)
+    raise SystemExit(f"Unknown router backend '{name}' (expected one of: {', '.join(BACKENDS)})")
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Run the stub skill router: replays recorded routing decisions over HTTP.")
+    parser.add_argument(
+        "decisions",
+        help="trigger_eval results JSON to replay (codex_picks), or a cases JSON (expected, for an oracle).",
+    )
+    parser.add_argument("--host", default="127.0.0.1", help="Bind address (default: 127.0.0.1).")
+    parser.add_argument("--port", type=int, default=8765, help="Port (default: 8765; 0 = any free port).")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Base latency per request (default: 0).")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="Extra uniform random latency (default: 0).")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests failing with 503 (default: 0).")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for latency/error draws (default: 0).")
+    args = parser.parse_args(argv)
+
+    server = StubServer(
+        load_decisions(Path(args.decisions).expanduser()),
+        host=args.host,
+        port=args.port,
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        seed=args.seed,
+    )
+    print(f"Stub router listening on {server.url} ({len(server.decisions)} recorded decisions)")
+    try:
+        server.server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
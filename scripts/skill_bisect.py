@@ -0,0 +1,318 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import subprocess
+from pathlib import Path, PurePosixPath
+from types import SimpleNamespace
+
+from index_skills import _infer_scope, _record_from_text
+from skillops_preflight import _gate_failures
+from trigger_eval import (
+    Case,
+    ShardedBM25,
+    Skill,
+    _cases_from_payload,
+    _parse_scopes,
+    skill_doc,
+    summarize_bm25,
+    tokenize,
+)
+
+# Commits are evaluated straight from git objects: `git ls-tree` lists the skills and cases blobs of
+# a commit, and one long-lived `git cat-file --batch` process reads the blobs that are not cached
+# yet. SKILL.md parses are cached on disk by blob hash (plus skill directory, which supplies the
+# default name), and metrics by the hash of every input blob, so a commit that does not touch
+# skills/ or the cases file costs one ls-tree call.
+
+CACHE_VERSION = 1
+
+
+def _git(repo: Path, *args: str) -> str:
+    proc = subprocess.run(["git", "-C", str(repo), *args], capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise SystemExit(f"git {' '.join(args)} failed: {proc.stderr.strip()}")
+    return proc.stdout
+
+
+class BlobReader:
+    """Reads blobs through a single `git cat-file --batch` process."""
+
+    def __init__(self, repo: Path):
+        self._proc = subprocess.Popen(
+            ["git", "-C", str(repo), "cat-file", "--batch"], stdin=subprocess.PIPE, stdout=subprocess.PIPE
+        )
+        self.reads = 0
+
+    def read(self, sha: str) -> bytes:
+        assert self._proc.stdin is not None and self._proc.stdout is not None
+        self._proc.stdin.write(sha.encode("ascii") + b"\n")
+        self._proc.stdin.flush()
+        header = self._proc.stdout.readline().split()
+        if len(header) != 3:
+            raise SystemExit(f"git cat-file: missing object {sha}")
+        data = self._proc.stdout.read(int(header[2]))
+        self._proc.stdout.read(1)  # trailing newline
+        self.reads += 1
+        return data
+
+    def close(self) -> None:
+        if self._proc.stdin is not None:
+            self._proc.stdin.close()
+        self._proc.wait()
+
+    def __enter__(self) -> BlobReader:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+
+def _ls_tree(repo: Path, commit: str, paths: list[str]) -> dict[str, str]:
+    """path -> blob sha for every blob under `paths` at `commit`."""
+    blobs: dict[str, str] = {}
+    for entry in _git(repo, "ls-tree", "-r", "-z", commit, "--", *paths).split("\0"):
+        if not entry:
+            continue
+        meta, path = entry.split("\t", 1)
+        _, kind, sha = meta.split()
+        if kind == "blob":
+            blobs[path] = sha
+    return blobs
+
+
+class CommitEvaluator:
+    def __init__(
+        self,
+        *,
+        repo: Path,
+        reader: BlobReader,
+        cache: dict,
+        skills_path: str,
+        cases_path: str,
+        top_k: int,
+        scopes: set[str] | None,
+        global_idf: bool,
+    ):
+        self.repo = repo
+        self.reader = reader
+        self.skills_path = skills_path.strip("/")
+        self.cases_path = cases_path
+        self.top_k = top_k
+        self.scopes = scopes
+        self.global_idf = global_idf
+        self.parses: dict[str, dict] = cache.setdefault("skills", {})
+        self.metrics: dict[str, dict] = cache.setdefault("metrics", {})
+        self._cases: dict[str, list[Case]] = {}
+        self._docs: dict[str, list[str]] = {}
+        self.parsed = 0
+
+    def _skill(self, skill_dir: str, sha: str, subdirs: set[str]) -> tuple[str, Skill]:
+        key = f"{sha} {skill_dir}"
+        parsed = self.parses.get(key)
+        if parsed is None:
+            text = self.reader.read(sha).decode("utf-8", errors="replace")
+            record = _record_from_text(text, Path(skill_dir), subdirs=subdirs)
+            parsed = {"name": record.name, "description": record.description, "short": record.short_description}
+            self.parses[key] = parsed
+            self.parsed += 1
+        skill = Skill(
+            name=parsed["name"],
+            description=parsed["description"],
+            scope=_infer_scope(Path(skill_dir)),
+            short_description=parsed["short"],
+        )
+        return key, skill
+
+    def evaluate(self, commit: str) -> dict | None:
+        """BM25 summary for a commit, or None when it has no cases file or no skills."""
+
+        blobs = _ls_tree(self.repo, commit, [self.skills_path, self.cases_path])
+        cases_sha = blobs.get(self.cases_path)
+        # Same order as index_skills (by skill directory), so BM25 ties break the same way.
+        skill_mds = sorted(
+            (p for p in blobs if p.startswith(f"{self.skills_path}/") and p.endswith("/SKILL.md")),
+            key=lambda p: str(PurePosixPath(p).parent),
+        )
+        if cases_sha is None or not skill_mds:
+            return None
+
+        state = hashlib.sha256()
+        state.update(f"{self.top_k} {sorted(self.scopes or [])} {self.global_idf} {cases_sha}".encode("utf-8"))
+        for path in skill_mds:
+            state.update(f"\n{path} {blobs[path]}".encode("utf-8"))
+        state_key = state.hexdigest()
+        if state_key in self.metrics:
+            return self.metrics[state_key]
+
+        subdirs: dict[str, set[str]] = {str(PurePosixPath(p).parent): set() for p in skill_mds}
+        for path in blobs:
+            parts = PurePosixPath(path).parts
+            for depth in range(1, len(parts) - 1):
+                skill_dir = "/".join(parts[:depth])
+                if skill_dir in subdirs:
+                    subdirs[skill_dir].add(parts[depth])
+
+        keys: list[str] = []
+        skills: list[Skill] = []
+        for path in skill_mds:
+            skill_dir = str(PurePosixPath(path).parent)
+            key, skill = self._skill(skill_dir, blobs[path], subdirs[skill_dir])
+            keys.append(key)
+            skills.append(skill)
+        if cases_sha not in self._cases:
+            self._cases[cases_sha] = _cases_from_payload(json.loads(self.reader.read(cases_sha)))
+        cases = self._cases[cases_sha]
+
+        docs = []
+        for key, skill in zip(keys, skills):
+            if key not in self._docs:
+                self._docs[key] = skill_doc(skill)
+            docs.append(self._docs[key])
+        bm25 = ShardedBM25(docs, [s.scope for s in skills], global_idf=self.global_idf)
+        items = []
+        for c in cases:
+            ranked = bm25.rank(tokenize(c.prompt), top_k=self.top_k, scopes=self.scopes)
+            items.append({"expected": c.expected, "bm25_top_k": [skills[idx].name for idx, _ in ranked]})
+        summary = summarize_bm25(items, top_k=self.top_k)
+        self.metrics[state_key] = summary
+        return summary
+
+
+def _failures(summary: dict | None, gates: SimpleNamespace) -> list[str]:
+    if summary is None:
+        return ["no skills or cases file at this commit"]
+    return _gate_failures(summary, gates)
+
+
+def _load_cache(path: Path) -> dict:
+    try:
+        cache = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {"version": CACHE_VERSION}
+    return cache if cache.get("version") == CACHE_VERSION else {"version": CACHE_VERSION}
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Evaluate BM25 trigger metrics across a commit range, or bisect to the first commit that fails a gate."
+    )
+    parser.add_argument("range", help="Commit range GOOD..BAD (first-parent history; GOOD is assumed to pass).")
+    parser.add_argument("--scan", action="store_true", help="Evaluate every commit in the range instead of bisecting.")
+    parser.add_argument("--repo", default=".", help="Git repository (default: current directory).")
+    parser.add_argument("--skills-path", default="skills", help="Skills directory inside the repo (default: skills).")
+    parser.add_argument(
+        "--cases-path",
+        default="datasets/trigger_cases.json",
+        help="Cases file inside the repo (default: datasets/trigger_cases.json).",
+    )
+    parser.add_argument("--top-k", type=int, default=5, help="Top-k for BM25 metrics (default: 5).")
+    parser.add_argument("--scopes", default="", help="Comma-separated scopes to route over (default: all).")
+    parser.add_argument("--per-shard-idf", action="store_true", help="Score scope shards with their own IDF/avgdl.")
+    parser.add_argument("--min-bm25-hit-at-k", type=float, default=0.8, help="Gate: minimum bm25_hit_at_k.")
+    parser.add_argument("--min-bm25-recall-at-k", type=float, default=0.6, help="Gate: minimum bm25_recall_at_k.")
+    parser.add_argument(
+        "--cache",
+        default=".skillops/bisect_cache.json",
+        help="Parse/metrics cache, relative to --repo (default: .skillops/bisect_cache.json).",
+    )
+    parser.add_argument("--out", default="", help="Optional output JSON path.")
+    args = parser.parse_args(argv)
+
+    repo = Path(args.repo).expanduser().resolve()
+    if ".." not in args.range:
+        raise SystemExit("Expected a range GOOD..BAD")
+    good, bad = args.range.split("..", 1)
+    commits = _git(repo, "rev-list", "--reverse", "--first-parent", f"{good}..{bad}").split()
+    if not commits:
+        raise SystemExit(f"No commits in {args.range}")
+    subjects = dict(
+        line.split(" ", 1) for line in _git(repo, "log", "--format=%H %s", "--first-parent", f"{good}..{bad}").splitlines()
+    )
+
+    gates = SimpleNamespace(
+        min_bm25_hit_at_k=args.min_bm25_hit_at_k,
+        min_bm25_recall_at_k=args.min_bm25_recall_at_k,
+        use_codex=False,
+        cascade=False,
+        min_cascade_fast_path_accuracy=0.0,
+    )
+    cache_path = Path(args.cache).expanduser()
+    cache_path = cache_path if cache_path.is_absolute() else repo / cache_path
+    cache = _load_cache(cache_path)
+
+    evaluated: dict[str, dict | None] = {}
+    with BlobReader(repo) as reader:
+        evaluator = CommitEvaluator(
+            repo=repo,
+            reader=reader,
+            cache=cache,
+            skills_path=args.skills_path,
+            cases_path=args.cases_path,
+            top_k=max(1, int(args.top_k)),
+            scopes=_parse_scopes(args.scopes),
+            global_idf=not args.per_shard_idf,
+        )
+
+        def evaluate(commit: str) -> list[str]:
+            if commit not in evaluated:
+                evaluated[commit] = evaluator.evaluate(commit)
+            return _failures(evaluated[commit], gates)
+
+        first_bad: str | None = None
+        if args.scan:
+            for commit in commits:
+                if evaluate(commit) and first_bad is None:
+                    first_bad = commit
+        elif evaluate(commits[-1]):
+            # Invariant: commits[lo - 1] passes (or is GOOD) and commits[hi] fails.
+            lo, hi = 0, len(commits) - 1
+            while lo < hi:
+                mid = (lo + hi) // 2
+                if evaluate(commits[mid]):
+                    hi = mid
+                else:
+                    lo = mid + 1
+            first_bad = commits[hi]
+        blob_reads = reader.reads
+
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    cache_path.write_text(json.dumps(cache, ensure_ascii=False) + "\n", encoding="utf-8")
+
+    rows = []
+    for commit in commits:
+        if commit not in evaluated:
+            continue
+        summary = evaluated[commit]
+        failures = _failures(summary, gates)
+        rows.append({"commit": commit, "subject": subjects.get(commit, ""), "summary": summary, "failures": failures})
+        hit = f"{summary['bm25_hit_at_k']:.3f}" if summary else "  -  "
+        recall = f"{summary['bm25_recall_at_k']:.3f}" if summary else "  -  "
+        status = "FAIL" if failures else "ok"
+        print(f"{commit[:10]}  hit@k {hit}  recall@k {recall}  {status:4}  {subjects.get(commit, '')}")
+    print(
+        f"Evaluated {len(evaluated)} of {len(commits)} commit(s); parsed {evaluator.parsed} SKILL.md blob(s), "
+        f"read {blob_reads} blob(s)"
+    )
+    if first_bad is None:
+        print("No commit in range fails the gates.")
+    else:
+        print(f"First failing commit: {first_bad} {subjects.get(first_bad, '')}")
+        for failure in _failures(evaluated[first_bad], gates):
+            print(f"- {failure}")
+
+    if args.out:
+        out_path = Path(args.out).expanduser().resolve()
+        out_path.parent.mkdir(parents=True, exist_ok=True)
+        out_path.write_text(
+            json.dumps({"range": args.range, "first_bad": first_bad, "commits": rows}, ensure_ascii=False, indent=2)
+            + "\n",
+            encoding="utf-8",
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import shutil
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path, PurePosixPath
+
+from index_skills import _default_skills_dir, _discover_skill_dirs
+from package_skill import _sha256_file, _should_exclude
+from validate_skill import validate_skill
+
+# A bundle is a zip archive with:
+#   bundle.json       {"format": 1, "skills": {<skill path>: {"files": {<relpath>: {sha256, size, mode}}}}}
+#   blobs/<sha256>    each distinct file body, stored once however many skills ship it
+# Skill paths are relative to the skills root (e.g. `.system/frontend-design`), so scopes survive a
+# round trip. Extracting one skill reads the manifest and only that skill's blobs via the zip
+# central directory.
+
+BUNDLE_FORMAT = 1
+MANIFEST_NAME = "bundle.json"
+
+# Already-compressed formats: deflating them again costs time and saves nothing.
+_STORED_SUFFIXES = {".png", ".jpg", ".jpeg", ".gif", ".webp", ".woff", ".woff2", ".zip", ".gz", ".skill", ".pdf"}
+
+
+def _skill_files(skill_dir: Path) -> list[Path]:
+    files: list[Path] = []
+    for file_path in sorted(skill_dir.rglob("*")):
+        if file_path.is_file() and not _should_exclude(file_path.relative_to(skill_dir)):
+            files.append(file_path)
+    return files
+
+
+def _safe_relpath(raw: str) -> PurePosixPath:
+    rel = PurePosixPath(raw)
+    if rel.is_absolute() or not rel.parts or ".." in rel.parts:
+        raise SystemExit(f"Refusing unsafe path in bundle: {raw!r}")
+    return rel
+
+
+def build_bundle(*, skills_dir: Path, out_path: Path, only: set[str] | None = None, jobs: int = 0) -> dict:
+    """Bundle every valid skill under skills_dir; returns size/dedup stats."""
+
+    skills_dir = skills_dir.expanduser().resolve()
+    skill_dirs = [d for d in _discover_skill_dirs(skills_dir) if only is None or d.name in only]
+    failures: list[str] = []
+    for skill_dir in skill_dirs:
+        validation = validate_skill(skill_dir)
+        if not validation.ok:
+            failures.append(f"{skill_dir.relative_to(skills_dir)}: {'; '.join(validation.errors)}")
+    if failures:
+        raise SystemExit("[ERROR] Refusing to bundle invalid skills:\n  " + "\n  ".join(failures))
+
+    files = [(skill_dir, path) for skill_dir in skill_dirs for path in _skill_files(skill_dir)]
+    # hashlib, zlib and file I/O release the GIL, so a thread pool parallelizes hashing here (and archive
+    # reads in install_skill, index_skills and validate_skill). jobs=0 keeps ThreadPoolExecutor's default.
+    with ThreadPoolExecutor(max_workers=jobs or None) as pool:
+        digests = list(pool.map(_sha256_file, (path for _, path in files)))
+
+    skills: dict[str, dict] = {
+        skill_dir.relative_to(skills_dir).as_posix(): {"files": {}} for skill_dir in skill_dirs
+    }
+    blobs: dict[str, Path] = {}
+    total_bytes = 0
+    for (skill_dir, path), digest in zip(files, digests):
+        stat = path.stat()
+        total_bytes += stat.st_size
+        skills[skill_dir.relative_to(skills_dir).as_posix()]["files"][path.relative_to(skill_dir).as_posix()] = {
+            "sha256": digest,
+            "size": stat.st_size,
+            "mode": stat.st_mode & 0o777,
+        }
+        blobs.setdefault(digest, path)
+
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = out_path.with_name(out_path.name + ".tmp")
+    with zipfile.ZipFile(tmp_path, "w", zipfile.ZIP_DEFLATED) as zipf:
+        zipf.writestr(MANIFEST_NAME, json.dumps({"format": BUNDLE_FORMAT, "skills": skills}, indent=2) + "\n")
+        for digest in sorted(blobs):
+            path = blobs[digest]
+            compression = zipfile.ZIP_STORED if path.suffix.lower() in _STORED_SUFFIXES else zipfile.ZIP_DEFLATED
+            zipf.write(path, f"blobs/{digest}", compress_type=compression)
+    tmp_path.replace(out_path)
+
+    unique_bytes = sum(path.stat().st_size for path in blobs.values())
+    return {
+        "skills": len(skills),
+        "files": len(files),
+        "unique_blobs": len(blobs),
+        "input_bytes": total_bytes,
+        "unique_bytes": unique_bytes,
+        "bundle_bytes": out_path.stat().st_size,
+    }
+
+
+def read_manifest(zipf: zipfile.ZipFile) -> dict:
+    manifest = json.loads(zipf.read(MANIFEST_NAME))
+    if manifest.get("format") != BUNDLE_FORMAT:
+        raise SystemExit(f"Unsupported bundle format {manifest.get('format')} (expected {BUNDLE_FORMAT})")
+    return manifest
+
+
+def _resolve_skill(skills: dict[str, dict], name: str) -> str:
+    if name in skills:
+        return name
+    matches = [key for key in skills if PurePosixPath(key).name == name]
+    if len(matches) == 1:
+        return matches[0]
+    if not matches:
+        raise SystemExit(f"Skill not in bundle: {name}")
+    raise SystemExit(f"Ambiguous skill name {name!r}; use one of: {', '.join(sorted(matches))}")
+
+
+def extract_skills(*, bundle_path: Path, dest: Path, names: list[str] | None = None) -> list[Path]:
+    """Extract the named skills (all when None) under dest, verifying each blob's sha256."""
+
+    dest = dest.expanduser().resolve()
+    written: list[Path] = []
+    with zipfile.ZipFile(bundle_path) as zipf:
+        skills = read_manifest(zipf)["skills"]
+        keys = sorted(skills) if names is None else [_resolve_skill(skills, name) for name in names]
+        for key in keys:
+            skill_root = dest.joinpath(*_safe_relpath(key).parts)
+            tmp_root = skill_root.with_name(skill_root.name + ".extracting")
+            shutil.rmtree(tmp_root, ignore_errors=True)
+            for relpath, entry in sorted(skills[key]["files"].items()):
+                target = tmp_root.joinpath(*_safe_relpath(relpath).parts)
+                target.parent.mkdir(parents=True, exist_ok=True)
+                digest = hashlib.sha256()
+                with zipf.open(f"blobs/{entry['sha256']}") as src, target.open("wb") as dst:
+                    for chunk in iter(lambda: src.read(1 << 20), b""):
+                        digest.update(chunk)
+                        dst.write(chunk)
+                if digest.hexdigest() != entry["sha256"]:
+                    shutil.rmtree(tmp_root, ignore_errors=True)
+                    raise SystemExit(f"Checksum mismatch for {key}/{relpath}")
+                target.chmod(int(entry.get("mode", 0o644)))
+            shutil.rmtree(skill_root, ignore_errors=True)
+            tmp_root.replace(skill_root)
+            written.append(skill_root)
+    return written
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Package a skills tree into one content-addressed bundle (each unique file stored once)."
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    build = sub.add_parser("build", help="Bundle every skill under a skills directory.")
+    build.add_argument(
+        "--skills-dir",
+        default="",
+        help="Skills directory (default: $CODEX_HOME/skills or ~/.codex/skills).",
+    )
+    build.add_argument("--out", default="dist/skills.skillbundle", help="Output path (default: dist/skills.skillbundle).")
+    build.add_argument("--only", default="", help="Comma-separated skill directory names to include (default: all).")
+    build.add_argument("--jobs", type=int, default=0, help="Hashing threads (default: auto).")
+
+    listing = sub.add_parser("list", help="List the skills in a bundle.")
+    listing.add_argument("bundle", help="Path to the bundle.")
+
+    extract = sub.add_parser("extract", help="Extract one, several, or all skills from a bundle.")
+    extract.add_argument("bundle", help="Path to the bundle.")
+    extract.add_argument("skills", nargs="*", help="Skill paths or names to extract (default: all).")
+    extract.add_argument("--dest", required=True, help="Destination skills directory.")
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        skills_dir = Path(args.skills_dir).expanduser() if args.skills_dir else _default_skills_dir()
+        only = {item.strip() for item in args.only.split(",") if item.strip()} or None
+        out_path = Path(args.out).expanduser().resolve()
+        stats = build_bundle(skills_dir=skills_dir, out_path=out_path, only=only, jobs=args.jobs)
+        print(json.dumps(stats, indent=2))
+        print(f"[OK] Wrote: {out_path}")
+        return 0
+
+    bundle_path = Path(args.bundle).expanduser().resolve()
+    if args.command == "list":
+        with zipfile.ZipFile(bundle_path) as zipf:
+            skills = read_manifest(zipf)["skills"]
+        for key in sorted(skills):
+            files = skills[key]["files"]
+            print(f"{key}  ({len(files)} files, {sum(e['size'] for e in files.values())} bytes)")
+        return 0
+
+    for skill_root in extract_skills(bundle_path=bundle_path, dest=Path(args.dest), names=args.skills or None):
+        print(f"[OK] Extracted: {skill_root}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+from dataclasses import asdict, fields
+from pathlib import Path
+from typing import Iterator
+
+from index_skills import SkillRecord
+
+# Binary catalog layout (all integers little-endian):
+#
+#   header    MAGIC, format version, record count, hash bucket count, skills_dir (offset, length),
+#             and the byte offsets of the record, hash and string sections
+#   records   count fixed-width records: an (offset, length) pair into the string table for each
+#             string field of SkillRecord, in declaration order, then one byte of boolean flags
+#   hash      bucket count (a power of two) open-addressing slots of (name hash, record index + 1);
+#             index 0 marks an empty slot
+#   strings   UTF-8 string table; identical strings (scope hints, licenses, ...) are stored once
+#
+# Opening a catalog maps the file and reads only the header; records are decoded on access, and a
+# name lookup touches one hash probe sequence plus the matching records.
+
+MAGIC = b"SKILLCAT"
+FORMAT_VERSION = 2
+
+STRING_FIELDS = tuple(f.name for f in fields(SkillRecord) if f.type in ("str", str))
+FLAG_FIELDS = tuple(f.name for f in fields(SkillRecord) if f.type in ("bool", bool))
+
+_HEADER = struct.Struct("<8sIIIIIQQQ")
+_RECORD = struct.Struct(f"<{2 * len(STRING_FIELDS)}IB3x")
+_SLOT = struct.Struct("<II")
+
+
+def _name_hash(name: str) -> int:
+    return int.from_bytes(hashlib.blake2b(name.encode("utf-8"), digest_size=4).digest(), "little")
+
+
+def encode_catalog(payload: dict) -> bytes:
+    """Encode a skills_index.json payload (`skills_dir` + `skills`) as a binary catalog."""
+
+    records = [r if isinstance(r, SkillRecord) else SkillRecord(**r) for r in payload.get("skills", [])]
+    strings = bytearray()
+    interned: dict[str, tuple[int, int]] = {}
+
+    def intern(value: str) -> tuple[int, int]:
+        ref = interned.get(value)
+        if ref is None:
+            raw = value.encode("utf-8")
+            ref = (len(strings), len(raw))
+            strings.extend(raw)
+            interned[value] = ref
+        return ref
+
+    skills_dir_ref = intern(str(payload.get("skills_dir", "")))
+    record_bytes = bytearray()
+    for record in records:
+        refs: list[int] = []
+        for name in STRING_FIELDS:
+            refs.extend(intern(getattr(record, name)))
+        flags = sum(1 << bit for bit, name in enumerate(FLAG_FIELDS) if getattr(record, name))
+        record_bytes += _RECORD.pack(*refs, flags)
+
+    n_buckets = 1
+    while n_buckets < 2 * len(records):
+        n_buckets *= 2
+    slots = [(0, 0)] * n_buckets
+    for idx, record in enumerate(records):
+        h = _name_hash(record.name)
+        pos = h & (n_buckets - 1)
+        while slots[pos][1]:
+            pos = (pos + 1) & (n_buckets - 1)
+        slots[pos] = (h, idx + 1)
+    hash_bytes = b"".join(_SLOT.pack(*slot) for slot in slots)
+
+    records_off = _HEADER.size
+    hash_off = records_off + len(record_bytes)
+    strings_off = hash_off + len(hash_bytes)
+    header = _HEADER.pack(
+        MAGIC, FORMAT_VERSION, len(records), n_buckets, *skills_dir_ref, records_off, hash_off, strings_off
+    )
+    return header + bytes(record_bytes) + hash_bytes + bytes(strings)
+
+
+def write_catalog(payload: dict, path: Path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + ".tmp")
+    tmp_path.write_bytes(encode_catalog(payload))
+    # Replace atomically: readers may have the previous catalog mapped.
+    tmp_path.replace(path)
+
+
+def is_catalog(path: Path) -> bool:
+    try:
+        with path.open("rb") as fh:
+            return fh.read(len(MAGIC)) == MAGIC
+    except OSError:
+        return False
+
+
+class SkillCatalog:
+    """Read-only, memory-mapped view of a binary skill catalog."""
+
+    def __init__(self, path: Path):
+        with Path(path).open("rb") as fh:
+            # mmap refuses empty files, and a short header would fail in struct; check the size first.
+            size = os.fstat(fh.fileno()).st_size
+            if size < _HEADER.size:
+                raise SystemExit(f"Not a skill catalog (truncated: {size} bytes, header needs {_HEADER.size}): {path}")
+            self._buf = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        self._path = path
+        try:
+            self._read_header()
+        except BaseException:
+            self._buf.close()
+            raise
+
+    def _read_header(self) -> None:
+        (
+            magic,
+            version,
+            self._count,
+            self._n_buckets,
+            dir_off,
+            dir_len,
+            self._records_off,
+            self._hash_off,
+            self._strings_off,
+        ) = _HEADER.unpack_from(self._buf, 0)
+        if magic != MAGIC:
+            raise SystemExit(f"Not a skill catalog (bad magic): {self._path}")
+        if version != FORMAT_VERSION:
+            raise SystemExit(f"Unsupported skill catalog version {version} (expected {FORMAT_VERSION}): {self._path}")
+        if not (
+            self._records_off + self._count * _RECORD.size <= self._hash_off
+            and self._hash_off + self._n_buckets * _SLOT.size <= self._strings_off <= len(self._buf)
+            and (self._count == 0 or (self._n_buckets > self._count and not self._n_buckets & (self._n_buckets - 1)))
+        ):
+            raise SystemExit(f"Corrupt or truncated skill catalog (sections out of range): {self._path}")
+        self.skills_dir = self._string(dir_off, dir_len)
+
+    def close(self) -> None:
+        self._buf.close()
+
+    def __enter__(self) -> SkillCatalog:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _string(self, offset: int, length: int) -> str:
+        start = self._strings_off + offset
+        if start + length > len(self._buf):
+            raise SystemExit(f"Truncated skill catalog (string table ends early): {self._path}")
+        return self._buf[start : start + length].decode("utf-8")
+
+    def _name_at(self, idx: int) -> str:
+        # `name` is the first string field, so its reference is the first pair of the record.
+        offset, length = struct.unpack_from("<II", self._buf, self._records_off + idx * _RECORD.size)
+        return self._string(offset, length)
+
+    def __getitem__(self, idx: int) -> SkillRecord:
+        if idx < 0:
+            idx += self._count
+        if not 0 <= idx < self._count:
+            raise IndexError(idx)
+        *refs, flags = _RECORD.unpack_from(self._buf, self._records_off + idx * _RECORD.size)
+        values: dict[str, str | bool] = {
+            name: self._string(refs[2 * i], refs[2 * i + 1]) for i, name in enumerate(STRING_FIELDS)
+        }
+        for bit, name in enumerate(FLAG_FIELDS):
+            values[name] = bool(flags >> bit & 1)
+        return SkillRecord(**values)
+
+    def __iter__(self) -> Iterator[SkillRecord]:
+        for idx in range(self._count):
+            yield self[idx]
+
+    def indices(self, name: str) -> list[int]:
+        """Record indices whose name is `name` (names may repeat across scopes), in catalog order."""
+        if not self._count:
+            return []
+        h = _name_hash(name)
+        mask = self._n_buckets - 1
+        pos = h & mask
+        found: list[int] = []
+        while True:
+            slot_hash, slot = _SLOT.unpack_from(self._buf, self._hash_off + pos * _SLOT.size)
+            if not slot:
+                return sorted(found)
+            if slot_hash == h and self._name_at(slot - 1) == name:
+                found.append(slot - 1)
+            pos = (pos + 1) & mask
+
+    def get(self, name: str) -> SkillRecord | None:
+        found = self.indices(name)
+        return self[found[0]] if found else None
+
+    def find(self, name: str) -> list[SkillRecord]:
+        return [self[idx] for idx in self.indices(name)]
+
+    def to_payload(self) -> dict:
+        """The equivalent skills_index.json payload."""
+        return {"skills_dir": self.skills_dir, "count": self._count, "skills": [asdict(r) for r in self]}
+
+
+def read_index_payload(path: Path) -> dict:
+    """Load a skills index from either skills_index.json or a binary catalog."""
+    if is_catalog(path):
+        with SkillCatalog(path) as catalog:
+            return catalog.to_payload()
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Build, query, or export a binary (memory-mapped) skill catalog.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    build = sub.add_parser("build", help="Convert skills_index.json to a binary catalog.")
+    build.add_argument("--skills", required=True, help="Path to skills_index.json.")
+    build.add_argument("--out", required=True, help="Output catalog path.")
+
+    get = sub.add_parser("get", help="Print the record(s) for a skill name as JSON.")
+    get.add_argument("--catalog", required=True, help="Path to the binary catalog.")
+    get.add_argument("name", help="Skill name.")
+
+    dump = sub.add_parser("to-json", help="Export a binary catalog as skills_index.json.")
+    dump.add_argument("--catalog", required=True, help="Path to the binary catalog.")
+    dump.add_argument("--out", default="", help="Output JSON path (default: stdout).")
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        payload = json.loads(Path(args.skills).expanduser().read_text(encoding="utf-8"))
+        out_path = Path(args.out).expanduser().resolve()
+        write_catalog(payload, out_path)
+        print(f"Wrote {len(payload.get('skills', []))} skills to {out_path}")
+        return 0
+
+    with SkillCatalog(Path(args.catalog).expanduser()) as catalog:
+        if args.command == "get":
+            records = catalog.find(args.name)
+            if not records:
+                print(f"Skill not found: {args.name}", file=sys.stderr)
+                return 1
+            for record in records:
+                print(json.dumps(asdict(record), ensure_ascii=False, indent=2))
+            return 0
+        text = json.dumps(catalog.to_payload(), ensure_ascii=False, indent=2) + "\n"
+    if args.out:
+        out_path = Path(args.out).expanduser().resolve()
+        out_path.parent.mkdir(parents=True, exist_ok=True)
+        out_path.write_text(text, encoding="utf-8")
+    else:
+        sys.stdout.write(text)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
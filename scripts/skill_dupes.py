@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import sys
+from array import array
+from pathlib import Path
+
+from skill_catalog import read_index_payload
+from skill_text import tokenize
+
+# Minimum probability that a pair exactly at the threshold becomes an LSH candidate. Candidates are
+# then checked exactly, so low rows only cost time, while a knee above the threshold drops real pairs.
+MIN_CANDIDATE_RECALL = 0.99
+
+
+def minhash_signatures(token_sets: list[set[str]], *, num_perm: int = 128, seed: int = 1) -> list[tuple[int, ...]]:
+    """
+    MinHash signature per token set. Each token gets num_perm independent 64-bit hashes from a single
+    SHAKE-128 digest (computed once per distinct token), and the signature is their element-wise minimum.
+    """
+
+    salt = seed.to_bytes(8, "big")
+    token_hashes: dict[str, array] = {}
+    signatures: list[tuple[int, ...]] = []
+    for tokens in token_sets:
+        rows: list[array] = []
+        for token in tokens:
+            hashes = token_hashes.get(token)
+            if hashes is None:
+                hashes = array("Q", hashlib.shake_128(salt + token.encode("utf-8")).digest(8 * num_perm))
+                token_hashes[token] = hashes
+            rows.append(hashes)
+        signatures.append(tuple(map(min, *rows)) if len(rows) > 1 else tuple(rows[0]) if rows else ())
+    return signatures
+
+
+def lsh_candidate_pairs(signatures: list[tuple[int, ...]], *, bands: int, rows: int) -> set[tuple[int, int]]:
+    """
+    Pairs that collide in at least one LSH band. Cost is linear in the number of signatures plus the
+    size of the colliding buckets; pairs with Jaccard well below (1/bands)**(1/rows) rarely collide.
+    """
+
+    pairs: set[tuple[int, int]] = set()
+    for band in range(bands):
+        buckets: dict[tuple[int, ...], list[int]] = {}
+        lo, hi = band * rows, (band + 1) * rows
+        for idx, sig in enumerate(signatures):
+            if sig:
+                buckets.setdefault(sig[lo:hi], []).append(idx)
+        for members in buckets.values():
+            for i in range(len(members)):
+                for j in range(i + 1, len(members)):
+                    pairs.add((members[i], members[j]))
+    return pairs
+
+
+def collision_probability(jaccard: float, *, bands: int, rows: int) -> float:
+    """Probability that a pair with this Jaccard collides in at least one of `bands` bands of `rows` rows."""
+    return 1.0 - (1.0 - jaccard**rows) ** bands
+
+
+def lsh_bands(threshold: float, *, num_perm: int) -> tuple[int, int]:
+    """
+    (bands, rows) with the most rows per band (fewest spurious candidates) for which a pair at the
+    threshold still collides with probability >= MIN_CANDIDATE_RECALL. bands * rows may leave a few
+    signature hashes unused.
+    """
+
+    for rows in range(num_perm, 1, -1):
+        bands = num_perm // rows
+        if collision_probability(threshold, bands=bands, rows=rows) >= MIN_CANDIDATE_RECALL:
+            return bands, rows
+    return num_perm, 1
+
+
+def find_near_duplicates(
+    docs: list[tuple[str, str]],
+    *,
+    threshold: float = 0.5,
+    num_perm: int = 128,
+    bands: int | None = None,
+    seed: int = 1,
+) -> list[dict]:
+    """
+    Near-duplicate (name, text) pairs with exact Jaccard >= threshold, most similar first. MinHash + LSH
+    only selects the candidate pairs; bands defaults to lsh_bands(threshold). An explicit bands whose
+    knee sits above the threshold is allowed, with a warning, since it misses real pairs.
+    """
+
+    if bands is None:
+        bands, rows = lsh_bands(threshold, num_perm=num_perm)
+    else:
+        if not 1 <= bands <= num_perm:
+            raise SystemExit(f"bands ({bands}) must be between 1 and num_perm ({num_perm})")
+        rows = num_perm // bands
+        recall = collision_probability(threshold, bands=bands, rows=rows)
+        if recall < MIN_CANDIDATE_RECALL:
+            print(
+                f"warning: {bands} bands x {rows} rows catch a pair at Jaccard {threshold:.2f} only "
+                f"{recall:.0%} of the time; omit --bands to derive them from the threshold",
+                file=sys.stderr,
+            )
+    token_sets = [set(tokenize(text)) for _, text in docs]
+    signatures = minhash_signatures(token_sets, num_perm=num_perm, seed=seed)
+    pairs: list[dict] = []
+    for i, j in lsh_candidate_pairs(signatures, bands=bands, rows=rows):
+        union = token_sets[i] | token_sets[j]
+        jaccard = len(token_sets[i] & token_sets[j]) / len(union) if union else 0.0
+        if jaccard < threshold:
+            continue
+        pairs.append(
+            {
+                "a": docs[i][0],
+                "b": docs[j][0],
+                "jaccard_est": sum(1 for x, y in zip(signatures[i], signatures[j]) if x == y) / num_perm,
+                "jaccard": jaccard,
+            }
+        )
+    pairs.sort(key=lambda p: (-p["jaccard"], p["a"], p["b"]))
+    return pairs
+
+
+def record_docs(index_payload: dict) -> list[tuple[str, str]]:
+    docs: list[tuple[str, str]] = []
+    for raw in index_payload.get("skills", []):
+        name = str(raw.get("name", "")).strip()
+        text = " ".join(str(raw.get(k, "")).strip() for k in ("description", "short_description"))
+        docs.append((name, text))
+    return docs
+
+
+def new_collisions(pairs: list[dict], baseline_payload: dict | None) -> list[dict]:
+    """Pairs involving at least one skill absent from the baseline index (all pairs without a baseline)."""
+    if baseline_payload is None:
+        return pairs
+    known = {str(raw.get("name", "")).strip() for raw in baseline_payload.get("skills", [])}
+    return [p for p in pairs if p["a"] not in known or p["b"] not in known]
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Find near-duplicate skill descriptions (MinHash + LSH over skills_index.json records)."
+    )
+    parser.add_argument("--skills", required=True, help="Path to skills_index.json or a binary catalog (from scripts/index_skills.py).")
+    parser.add_argument("--threshold", type=float, default=0.5, help="Minimum Jaccard to report (default: 0.5).")
+    parser.add_argument("--num-perm", type=int, default=128, help="MinHash hashes per signature (default: 128).")
+    parser.add_argument(
+        "--bands",
+        type=int,
+        default=None,
+        help="LSH bands (rows = num_perm // bands). Pairs start colliding near Jaccard (1/bands)**(1/rows) "
+        "(default: derived from --threshold so a pair at the threshold is a candidate >= 99%% of the time).",
+    )
+    parser.add_argument("--seed", type=int, default=1, help="Hash seed (default: 1).")
+    parser.add_argument(
+        "--baseline",
+        default="",
+        help="Previous skills_index.json; with --fail-on-new, only pairs involving new skills count.",
+    )
+    parser.add_argument("--fail-on-new", action="store_true", help="Exit 2 if any (new) skill collides.")
+    parser.add_argument("--out", default="", help="Optional output JSON path.")
+    args = parser.parse_args(argv)
+
+    payload = read_index_payload(Path(args.skills).expanduser())
+    pairs = find_near_duplicates(
+        record_docs(payload),
+        threshold=float(args.threshold),
+        num_perm=int(args.num_perm),
+        bands=args.bands,
+        seed=int(args.seed),
+    )
+    baseline = read_index_payload(Path(args.baseline).expanduser()) if args.baseline else None
+    collisions = new_collisions(pairs, baseline)
+
+    if args.out:
+        out_path = Path(args.out).expanduser().resolve()
+        out_path.parent.mkdir(parents=True, exist_ok=True)
+        out_path.write_text(
+            json.dumps({"threshold": args.threshold, "pairs": pairs}, ensure_ascii=False, indent=2) + "\n",
+            encoding="utf-8",
+        )
+
+    for p in pairs:
+        print(f"{p['jaccard_est']:.2f} (exact {p['jaccard']:.2f})  {p['a']} <-> {p['b']}")
+    print(f"{len(pairs)} near-duplicate pair(s) at Jaccard >= {args.threshold:.2f}")
+    if args.fail_on_new and collisions:
+        print(f"{len(collisions)} pair(s) involve new skills")
+        return 2
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import re
+import time
+from collections import deque
+from itertools import accumulate
+from pathlib import Path
+from typing import Sequence
+
+from skill_catalog import read_index_payload
+
+# Aho–Corasick automaton over every spelling of every skill name and alias. One pass over a prompt
+# finds all mentions regardless of catalog size, where a regex alternation or per-name scan grows
+# with the number of skills. index_skills.py --mention-automaton serializes it into the index
+# (`mentions`) so routers load it instead of rebuilding it.
+
+AUTOMATON_VERSION = 1
+
+_WORD_CHAR = re.compile(r"[a-z0-9-]")
+_CJK = re.compile(r"[\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af]")
+
+
+def name_variants(name: str) -> set[str]:
+    """Spellings that count as a mention of `name`: hyphen/space/underscore forms; CJK without spaces."""
+    base = " ".join(name.lower().split())
+    if not base:
+        return set()
+    variants = {base, base.replace("-", " "), base.replace(" ", "-"), base.replace("-", "_").replace(" ", "_")}
+    if _CJK.search(base):
+        variants.add(base.replace(" ", "").replace("-", ""))
+    return variants
+
+
+def record_aliases(raw: dict) -> list[str]:
+    return [a.strip() for a in str(raw.get("aliases", "")).split(",") if a.strip()]
+
+
+class MentionAutomaton:
+    def __init__(
+        self, patterns: list[str], skills: list[str], goto: list[dict[str, int]], fail: list[int], out: list[Sequence[int]]
+    ):
+        self.patterns = patterns
+        self.skills = skills
+        self.goto = goto
+        self.fail = fail
+        self.out = out
+
+    @classmethod
+    def build(cls, names: dict[str, list[str]]) -> MentionAutomaton:
+        """From skill name -> aliases; the name itself is always a pattern."""
+        spellings: dict[str, str] = {}
+        for name, aliases in names.items():
+            for alias in [name, *aliases]:
+                for variant in name_variants(alias):
+                    spellings.setdefault(variant, name)
+        patterns = sorted(spellings)
+        skills = [spellings[p] for p in patterns]
+
+        goto: list[dict[str, int]] = [{}]
+        out: list[list[int]] = [[]]
+        for pid, pattern in enumerate(patterns):
+            state = 0
+            for ch in pattern:
+                nxt = goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[state][ch] = nxt
+                    goto.append({})
+                    out.append([])
+                state = nxt
+            out[state].append(pid)
+
+        # Breadth-first, so a state's fail target (always shallower) is final before its children need it.
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in goto[state].items():
+                queue.append(nxt)
+                f = fail[state]
+                while f and ch not in goto[f]:
+                    f = fail[f]
+                fail[nxt] = goto[f][ch] if state and ch in goto[f] else 0
+                # Fold the fail state's outputs in, so matching never walks output links.
+                out[nxt].extend(out[fail[nxt]])
+        return cls(patterns, skills, goto, fail, out)
+
+    @classmethod
+    def from_records(cls, records: list[dict]) -> MentionAutomaton:
+        names: dict[str, list[str]] = {}
+        for raw in records:
+            name = str(raw.get("name", "")).strip()
+            if name:
+                names.setdefault(name, []).extend(record_aliases(raw))
+        return cls.build(names)
+
+    def to_json(self) -> dict:
+        # Compact form: per state its edge characters as one string, with the targets flattened in the
+        # same order, and outputs only for the states that have any. Loading it takes about half the time
+        # of rebuilding from the patterns.
+        return {
+            "version": AUTOMATON_VERSION,
+            "patterns": self.patterns,
+            "skills": self.skills,
+            "edges": ["".join(edges) for edges in self.goto],
+            "targets": [target for edges in self.goto for target in edges.values()],
+            "fail": self.fail,
+            "out": {str(state): pids for state, pids in enumerate(self.out) if pids},
+        }
+
+    @classmethod
+    def from_json(cls, data: dict) -> MentionAutomaton | None:
+        if data.get("version") != AUTOMATON_VERSION:
+            return None
+        edges, targets = data["edges"], data["targets"]
+        goto = [
+            {chars: targets[end - 1]} if len(chars) == 1 else dict(zip(chars, targets[end - len(chars) : end]))
+            for chars, end in zip(edges, accumulate(map(len, edges)))
+        ]
+        # States without outputs share one empty tuple: most of the automaton, and matching only reads it.
+        out: list[Sequence[int]] = [()] * len(goto)
+        for state, pids in data["out"].items():
+            out[int(state)] = pids
+        return cls(data["patterns"], data["skills"], goto, data["fail"], out)
+
+    def spans(self, text: str) -> list[tuple[int, int, str]]:
+        """
+        Non-overlapping (start, end, skill) mentions in text, leftmost-longest. ASCII spellings must be
+        whole words (not inside [a-z0-9-] runs); spellings with CJK characters match anywhere.
+        """
+
+        text = text.lower()
+        goto, fail, out, patterns = self.goto, self.fail, self.out, self.patterns
+        found: list[tuple[int, int, int]] = []
+        state = 0
+        for end, ch in enumerate(text, start=1):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            for pid in out[state]:
+                start = end - len(patterns[pid])
+                if not _CJK.search(patterns[pid]) and (
+                    (start > 0 and _WORD_CHAR.match(text[start - 1])) or (end < len(text) and _WORD_CHAR.match(text[end]))
+                ):
+                    continue
+                found.append((start, end, pid))
+        found.sort(key=lambda m: (m[0], -m[1]))
+        spans: list[tuple[int, int, str]] = []
+        last_end = 0
+        for start, end, pid in found:
+            if start >= last_end:
+                spans.append((start, end, self.skills[pid]))
+                last_end = end
+        return spans
+
+    def find(self, text: str) -> list[str]:
+        """Mentioned skills in order of first mention."""
+        names: list[str] = []
+        for _, _, name in self.spans(text):
+            if name not in names:
+                names.append(name)
+        return names
+
+    def strip(self, text: str) -> str:
+        """text (lowercased) with every mention blanked out."""
+        lowered = text.lower()
+        parts: list[str] = []
+        pos = 0
+        for start, end, _ in self.spans(lowered):
+            parts.append(lowered[pos:start])
+            parts.append(" ")
+            pos = end
+        parts.append(lowered[pos:])
+        return "".join(parts)
+
+
+def load_automaton(payload: dict) -> MentionAutomaton:
+    """The automaton serialized in an index payload, or one built from its records."""
+    serialized = payload.get("mentions")
+    automaton = MentionAutomaton.from_json(serialized) if isinstance(serialized, dict) else None
+    return automaton or MentionAutomaton.from_records(payload.get("skills", []))
+
+
+def _bench(args: argparse.Namespace) -> int:
+    from trigger_eval import ShardedBM25, Skill, skill_doc, tokenize
+
+    rng = random.Random(args.seed)
+    words = [f"w{i}" for i in range(5000)]
+    names = [f"{rng.choice(words)}-{rng.choice(words)}-{i}" for i in range(args.skills)]
+    skills = [Skill(name=n, description=" ".join(rng.choices(words, k=40))) for n in names]
+    prompts = []
+    for i in range(args.prompts):
+        text = " ".join(rng.choices(words, k=30))
+        if i % 2 == 0:
+            text = f"Use the {rng.choice(names).replace('-', ' ' if i % 4 else '-')} skill: {text}"
+        prompts.append(text)
+
+    report: dict = {"skills": args.skills, "prompts": args.prompts}
+
+    start = time.perf_counter()
+    automaton = MentionAutomaton.build({n: [] for n in names})
+    report["automaton_build_s"] = round(time.perf_counter() - start, 3)
+    serialized = json.dumps(automaton.to_json())
+    report["automaton_json_bytes"] = len(serialized)
+    start = time.perf_counter()
+    MentionAutomaton.from_json(json.loads(serialized))
+    report["automaton_load_s"] = round(time.perf_counter() - start, 3)
+
+    variants = sorted({v for n in names for v in name_variants(n)}, key=len, reverse=True)
+    regex = re.compile(rf"(?<![a-z0-9-])(?:{'|'.join(map(re.escape, variants))})(?![a-z0-9-])")
+    bm25 = ShardedBM25([skill_doc(s) for s in skills], [s.scope for s in skills])
+
+    def throughput(fn) -> float:
+        start = time.perf_counter()
+        for prompt in prompts:
+            fn(prompt)
+        return round(len(prompts) / (time.perf_counter() - start), 1)
+
+    report["aho_corasick_prompts_per_s"] = throughput(automaton.find)
+    report["regex_alternation_prompts_per_s"] = throughput(lambda p: regex.findall(p.lower()))
+    report["bm25_rank_prompts_per_s"] = throughput(lambda p: bm25.rank(tokenize(p), top_k=20))
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Find explicit skill mentions (Aho–Corasick over names and aliases).")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    find = sub.add_parser("find", help="Print the skills mentioned in a prompt.")
+    find.add_argument("--skills", required=True, help="Path to skills_index.json or a binary catalog.")
+    find.add_argument("prompt", help="Prompt text.")
+
+    bench = sub.add_parser("bench", help="Compare mention detection throughput on a synthetic catalog.")
+    bench.add_argument("--skills", type=int, default=10000, help="Synthetic catalog size (default: 10000).")
+    bench.add_argument("--prompts", type=int, default=2000, help="Synthetic prompts (default: 2000).")
+    bench.add_argument("--seed", type=int, default=7, help="Random seed (default: 7).")
+    args = parser.parse_args(argv)
+
+    if args.command == "bench":
+        return _bench(args)
+    automaton = load_automaton(read_index_payload(Path(args.skills).expanduser()))
+    for name in automaton.find(args.prompt):
+        print(name)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
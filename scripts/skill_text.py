@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+import re
+
+# Text handling shared by the indexer (index_skills.py) and the evaluators (trigger_eval.py and the
+# tools built on it), so indexing never has to import the evaluator.
+
+HEADING_RE = re.compile(r"^#{1,6}\s+(.*?)[\s#]*$")
+
+
+def tokenize(text: str) -> list[str]:
+    text = text.lower()
+    tokens: list[str] = []
+
+    tokens.extend(re.findall(r"[a-z0-9]+(?:-[a-z0-9]+)*", text))
+
+    cjk = re.findall(r"[\u4e00-\u9fff]", text)
+    tokens.extend(cjk)
+    tokens.extend([cjk[i] + cjk[i + 1] for i in range(len(cjk) - 1)])
+    return tokens
+
+
+def markdown_sections(lines: list[bytes], *, pos: int = 0) -> list[tuple[str, int, int]]:
+    """
+    (heading, start, end) byte ranges of the Markdown sections in `lines` (with line endings), which
+    start at byte offset `pos`. Sections break at ATX headings outside fenced code blocks; text before
+    the first heading is a section with heading "".
+    """
+
+    sections: list[tuple[str, int, int]] = []
+    heading, section_start, in_fence = "", pos, False
+    for line in lines:
+        text = line.decode("utf-8", errors="replace").rstrip("\r\n")
+        if text.lstrip().startswith(("```", "~~~")):
+            in_fence = not in_fence
+        match = None if in_fence else HEADING_RE.match(text)
+        if match:
+            sections.append((heading, section_start, pos))
+            heading, section_start = match.group(1), pos
+        pos += len(line)
+    sections.append((heading, section_start, pos))
+    return sections
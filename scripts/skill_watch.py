@@ -0,0 +1,375 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import os
+import select
+import struct
+import time
+from bisect import bisect_left
+from pathlib import Path
+from typing import Callable
+
+from index_skills import SkillRecord, _discover_skill_dirs, _load_record
+from trigger_eval import (
+    Case,
+    ShardedBM25,
+    Skill,
+    TrigramIndex,
+    _load_cases,
+    build_query,
+    skill_doc,
+    skill_fields,
+    summarize_bm25,
+)
+
+# inotify(7) constants (linux/inotify.h).
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+WATCH_MASK = IN_CLOSE_WRITE | IN_MODIFY | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF
+EVENT_HEADER = struct.Struct("iIII")
+
+RESOURCE_DIRS = ("scripts", "references", "examples", "assets")
+
+
+class _InotifyWatcher:
+    """Recursive inotify watcher over the skills tree (plus the cases file), via ctypes; Linux only."""
+
+    def __init__(self, skills_dir: Path, extra_files: list[Path]):
+        import ctypes
+        import ctypes.util
+
+        libc_name = ctypes.util.find_library("c")
+        if not libc_name:
+            raise OSError("libc not found")
+        self._libc = ctypes.CDLL(libc_name, use_errno=True)
+        if not hasattr(self._libc, "inotify_init1"):
+            raise OSError("inotify not available")
+        fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._fd = fd
+        self._wd_paths: dict[int, Path] = {}
+        self._extra_files = {p.resolve() for p in extra_files}
+        for directory in {p.parent for p in self._extra_files}:
+            self._add_watch(directory)
+        self._add_tree(skills_dir)
+
+    def _add_watch(self, directory: Path) -> None:
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(str(directory)), WATCH_MASK)
+        if wd >= 0:
+            self._wd_paths[wd] = directory
+
+    def _add_tree(self, root: Path) -> None:
+        if not root.is_dir():
+            return
+        self._add_watch(root)
+        for dirpath, dirnames, _ in os.walk(root):
+            for name in dirnames:
+                self._add_watch(Path(dirpath) / name)
+
+    def wait(self, timeout_s: float, *, debounce_s: float = 0.05) -> tuple[set[Path], bool]:
+        changed: set[Path] = set()
+        rescan = False
+        ready, _, _ = select.select([self._fd], [], [], timeout_s)
+        while ready:
+            try:
+                buf = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                buf = b""
+            offset = 0
+            while offset + EVENT_HEADER.size <= len(buf):
+                wd, mask, _, name_len = EVENT_HEADER.unpack_from(buf, offset)
+                offset += EVENT_HEADER.size
+                name = buf[offset : offset + name_len].split(b"\0", 1)[0].decode("utf-8", errors="replace")
+                offset += name_len
+                if mask & IN_Q_OVERFLOW:
+                    rescan = True
+                    continue
+                parent = self._wd_paths.get(wd)
+                if parent is None:
+                    continue
+                path = parent / name if name else parent
+                if mask & IN_ISDIR or mask & (IN_DELETE_SELF | IN_MOVE_SELF):
+                    rescan = True
+                    if mask & (IN_CREATE | IN_MOVED_TO):
+                        self._add_tree(path)
+                changed.add(path)
+            # Editors often write several events per save; coalesce them into one update.
+            ready, _, _ = select.select([self._fd], [], [], debounce_s)
+        return changed, rescan
+
+    def close(self) -> None:
+        os.close(self._fd)
+
+
+class _PollingWatcher:
+    """Portable fallback: stat SKILL.md files, resource dirs and the cases file every interval."""
+
+    def __init__(self, skills_dir: Path, extra_files: list[Path], *, interval_s: float):
+        self._skills_dir = skills_dir
+        self._extra_files = [p.resolve() for p in extra_files]
+        self._interval_s = interval_s
+        self._snapshot = self._take_snapshot()
+
+    def _take_snapshot(self) -> dict[Path, tuple[int, int]]:
+        snapshot: dict[Path, tuple[int, int]] = {}
+        paths = list(self._extra_files)
+        for skill_dir in _discover_skill_dirs(self._skills_dir):
+            paths.append(skill_dir / "SKILL.md")
+            paths.extend(skill_dir / name for name in RESOURCE_DIRS if (skill_dir / name).is_dir())
+        for path in paths:
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            snapshot[path] = (st.st_mtime_ns, st.st_size)
+        return snapshot
+
+    def wait(self, timeout_s: float) -> tuple[set[Path], bool]:
+        deadline = time.monotonic() + timeout_s
+        while True:
+            current = self._take_snapshot()
+            changed = {p for p in current.keys() | self._snapshot.keys() if current.get(p) != self._snapshot.get(p)}
+            if changed:
+                rescan = current.keys() != self._snapshot.keys()
+                self._snapshot = current
+                return changed, rescan
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return set(), False
+            time.sleep(min(self._interval_s, remaining))
+
+    def close(self) -> None:
+        pass
+
+
+def _record_skill(record: SkillRecord) -> Skill:
+    return Skill(
+        name=record.name,
+        description=record.description,
+        scope=record.scope_hint,
+        short_description=record.short_description,
+    )
+
+
+class WatchState:
+    """
+    Parsed records, token lists, the sharded BM25 index and per-case results, kept in memory.
+
+    apply() re-parses only the skill directories that changed and rebuilds only the scope shards they
+    live in (or the whole index when skills are added/removed). With collection-wide statistics (the
+    default) or a renamed skill every case is re-scored; with per-shard statistics only the cases whose
+    query shares a term with a rebuilt shard are.
+    """
+
+    def __init__(
+        self,
+        *,
+        skills_dir: Path,
+        cases_path: Path,
+        top_k: int,
+        scopes: set[str] | None,
+        global_idf: bool,
+        fuzzy: bool,
+        fuzzy_max_edits: int,
+        fuzzy_weight: float,
+        field_boosts: list[float] | None = None,
+    ):
+        self.skills_dir = skills_dir
+        self.cases_path = cases_path.resolve()
+        self.top_k = top_k
+        self.scopes = scopes
+        self.global_idf = global_idf
+        self.fuzzy = fuzzy
+        self.fuzzy_max_edits = fuzzy_max_edits
+        self.fuzzy_weight = fuzzy_weight
+        self.field_boosts = field_boosts
+
+        self.records: dict[Path, SkillRecord] = {}
+        self.docs: dict[Path, list[str]] = {}
+        for skill_dir in _discover_skill_dirs(skills_dir):
+            record = _load_record(skill_dir)
+            if record is not None:
+                self.records[skill_dir] = record
+                self.docs[skill_dir] = self._doc(record)
+        self.cases: list[Case] = []
+        self.case_terms: list[set[str]] = []
+        self.items: list[dict] = []
+        self._rebuild_index()
+        self._load_cases()
+
+    def _doc(self, record: SkillRecord) -> list:
+        skill = _record_skill(record)
+        return skill_doc(skill) if self.field_boosts is None else skill_fields(skill)
+
+    def _rebuild_index(self) -> None:
+        self.order = sorted(self.records)
+        self.skills = [_record_skill(self.records[d]) for d in self.order]
+        self.bm25 = ShardedBM25(
+            [self.docs[d] for d in self.order],
+            [s.scope for s in self.skills],
+            global_idf=self.global_idf,
+            field_boosts=self.field_boosts,
+        )
+        self.vocabulary = self.bm25.terms()
+        self.trigrams = TrigramIndex(self.vocabulary) if self.fuzzy else None
+
+    def _load_cases(self) -> None:
+        self.cases = _load_cases(self.cases_path) if self.cases_path.is_file() else []
+        self.case_terms = [set() for _ in self.cases]
+        self.items = [{} for _ in self.cases]
+        self._rescore(range(len(self.cases)))
+
+    def _rescore(self, case_ids) -> int:
+        count = 0
+        for i in case_ids:
+            c = self.cases[i]
+            query, weights, _ = build_query(
+                c.prompt,
+                vocabulary=self.vocabulary,
+                trigrams=self.trigrams,
+                max_edits=self.fuzzy_max_edits,
+                weight=self.fuzzy_weight,
+            )
+            ranked = self.bm25.rank(query, top_k=self.top_k, weights=weights, scopes=self.scopes)
+            self.case_terms[i] = set(query)
+            self.items[i] = {"id": c.id, "expected": c.expected, "bm25_top_k": [self.skills[idx].name for idx, _ in ranked]}
+            count += 1
+        return count
+
+    def summary(self) -> dict:
+        return summarize_bm25(self.items, top_k=self.top_k)
+
+    def _owning_skill_dir(self, path: Path) -> Path | None:
+        if self.skills_dir not in path.parents:
+            return None
+        for candidate in (path, *path.parents):
+            if candidate in self.records or (candidate / "SKILL.md").is_file():
+                return candidate
+            if candidate == self.skills_dir:
+                break
+        return None
+
+    def apply(self, changed: set[Path], *, rescan: bool) -> dict:
+        """Apply file changes; returns update stats (changed skill names, re-scored case count)."""
+        if self.cases_path in changed:
+            self._load_cases()
+            return {"skills_changed": [], "cases_rescored": len(self.cases), "cases_reloaded": True}
+
+        dirty: set[Path] = set()
+        for path in changed:
+            owner = self._owning_skill_dir(path)
+            if owner is not None:
+                dirty.add(owner)
+        if rescan:
+            current = set(_discover_skill_dirs(self.skills_dir))
+            dirty |= current ^ set(self.records)
+
+        old_vocab: dict[str, set[str]] = {}
+        touched_scopes: set[str] = set()
+        membership_changed = False
+        renamed = False
+        changed_names: list[str] = []
+        for skill_dir in sorted(dirty):
+            old = self.records.get(skill_dir)
+            new = _load_record(skill_dir) if (skill_dir / "SKILL.md").is_file() else None
+            if new == old:
+                continue
+            changed_names.append((new or old).name)
+            for record in (old, new):
+                if record is not None:
+                    touched_scopes.add(record.scope_hint)
+            if (old is None) != (new is None):
+                membership_changed = True
+            elif old.name != new.name:
+                renamed = True
+            if new is None:
+                self.records.pop(skill_dir, None)
+                self.docs.pop(skill_dir, None)
+            else:
+                self.records[skill_dir] = new
+                self.docs[skill_dir] = self._doc(new)
+
+        if not changed_names:
+            return {"skills_changed": [], "cases_rescored": 0}
+
+        for scope in touched_scopes:
+            shard = self.bm25.shards.get(scope)
+            old_vocab[scope] = shard.terms() if shard else set()
+
+        # Collection-wide BM25F field lengths are baked into every shard's postings.
+        if membership_changed or (self.global_idf and self.field_boosts is not None):
+            self._rebuild_index()
+            affected = range(len(self.cases))
+        else:
+            for skill_dir in dirty:
+                if skill_dir in self.records:
+                    self.skills[bisect_left(self.order, skill_dir)] = _record_skill(self.records[skill_dir])
+            for scope in touched_scopes:
+                ids = [i for i, d in enumerate(self.order) if self.records[d].scope_hint == scope]
+                self.bm25.rebuild_shard(scope, [self.docs[self.order[i]] for i in ids], ids)
+            self.vocabulary = self.bm25.terms()
+            if self.fuzzy:
+                self.trigrams = TrigramIndex(self.vocabulary)
+            if self.global_idf or self.fuzzy or renamed:
+                # Collection-wide stats (or fuzzy expansions) moved for every shard, or an old name may
+                # sit anywhere in a top-k (zero-score fill included).
+                affected = range(len(self.cases))
+            else:
+                touched_terms: set[str] = set()
+                for scope in touched_scopes:
+                    touched_terms |= old_vocab[scope]
+                    shard = self.bm25.shards.get(scope)
+                    touched_terms |= shard.terms() if shard else set()
+                affected = [i for i, terms in enumerate(self.case_terms) if terms & touched_terms]
+
+        return {"skills_changed": changed_names, "cases_rescored": self._rescore(affected)}
+
+
+def watch(
+    state: WatchState,
+    *,
+    report: Callable[[dict, dict], None],
+    poll_interval_s: float = 0.5,
+    force_polling: bool = False,
+) -> int:
+    """Block until Ctrl-C, calling report(summary, update_stats) after the initial pass and every change."""
+    extra_files = [state.cases_path]
+    watcher: _InotifyWatcher | _PollingWatcher
+    backend = "polling"
+    if force_polling:
+        watcher = _PollingWatcher(state.skills_dir, extra_files, interval_s=poll_interval_s)
+    else:
+        try:
+            watcher = _InotifyWatcher(state.skills_dir, extra_files)
+            backend = "inotify"
+        except (OSError, AttributeError):
+            watcher = _PollingWatcher(state.skills_dir, extra_files, interval_s=poll_interval_s)
+
+    print(f"[watch] {len(state.records)} skills, {len(state.cases)} cases; watching {state.skills_dir} ({backend})", flush=True)
+    report(state.summary(), {"skills_changed": [], "cases_rescored": len(state.cases), "elapsed_ms": 0.0})
+    try:
+        while True:
+            changed, rescan = watcher.wait(1.0)
+            if not changed and not rescan:
+                continue
+            start = time.perf_counter()
+            stats = state.apply(changed, rescan=rescan)
+            stats["elapsed_ms"] = (time.perf_counter() - start) * 1000
+            if stats["skills_changed"] or stats.get("cases_reloaded"):
+                report(state.summary(), stats)
+    except KeyboardInterrupt:
+        return 0
+    finally:
+        watcher.close()
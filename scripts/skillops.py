@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import sys
+
+# Only `sys` is imported at module level: a subcommand's module (and its dependencies) is imported
+# when that subcommand runs, so `skillops <cmd> --help` and no-op invocations stay cheap.
+
+VERSION = "0.1.0"
+
+COMMANDS: dict[str, tuple[str, str]] = {
+    "init": ("init_skill", "Initialize a new skill folder with a SKILL.md template."),
+    "validate": ("validate_skill", "Validate skill folders or packaged .skill files."),
+    "index": ("index_skills", "Index skills (name/description/path) into JSON."),
+    "eval": ("trigger_eval", "Evaluate skill discoverability with a prompt suite."),
+    "compare": ("trigger_compare", "A/B compare two catalogs, BM25 settings or routers over one case suite."),
+    "stub-router": ("router_backends", "Serve recorded routing decisions over HTTP for offline router load tests."),
+    "stats": ("gate_stats", "Bootstrap confidence intervals for trigger metrics; paired deltas vs a baseline."),
+    "package": ("package_skill", "Package a skill folder into a .skill file."),
+    "install": ("install_skill", "Install .skill archives into $CODEX_HOME/skills with manifest verification."),
+    "bundle": ("skill_bundle", "Bundle a skills tree into one content-addressed archive, or extract from it."),
+    "preflight": ("skillops_preflight", "Index skills, run trigger backtests, and enforce gates."),
+    "catalog": ("skill_catalog", "Build, query, or export a memory-mapped binary skill catalog."),
+    "bisect": ("skill_bisect", "Evaluate trigger metrics across commits; bisect to the first failing gate."),
+    "dupes": ("skill_dupes", "Find near-duplicate skill descriptions (MinHash + LSH)."),
+    "mentions": ("skill_mentions", "Find explicit skill mentions in a prompt (Aho–Corasick over names and aliases)."),
+}
+
+BUILTINS: dict[str, str] = {
+    "version": "Print the skillops version (no-op; used to measure startup).",
+    "zipapp": "Build a single-file skillops.pyz from scripts/.",
+    "bench-startup": "Measure startup time of a no-op subcommand.",
+}
+
+
+def _usage() -> str:
+    lines = ["usage: skillops <command> [args...]", "", "commands:"]
+    width = max(len(name) for name in [*COMMANDS, *BUILTINS])
+    for name, (_, help_text) in COMMANDS.items():
+        lines.append(f"  {name.ljust(width)}  {help_text}")
+    for name, help_text in BUILTINS.items():
+        lines.append(f"  {name.ljust(width)}  {help_text}")
+    return "\n".join(lines)
+
+
+def _entry_point() -> str:
+    from pathlib import Path
+
+    here = Path(__file__).resolve()
+    # Inside a zipapp __file__ is <archive>.pyz/skillops.py; the archive itself is the entry point.
+    return str(here.parent if here.parent.is_file() else here)
+
+
+def _build_zipapp(argv: list[str]) -> int:
+    import argparse
+    import py_compile
+    import tempfile
+    import zipfile
+    from pathlib import Path
+
+    parser = argparse.ArgumentParser(prog="skillops zipapp", description=BUILTINS["zipapp"])
+    parser.add_argument("--out", default="dist/skillops.pyz", help="Output archive path (default: dist/skillops.pyz).")
+    parser.add_argument(
+        "--python",
+        default="/usr/bin/env python3",
+        help="Interpreter for the archive shebang (default: /usr/bin/env python3).",
+    )
+    args = parser.parse_args(argv)
+
+    source = Path(__file__).resolve().parent
+    if source.is_file():
+        raise SystemExit("Already running from a zipapp; build from the scripts/ checkout instead.")
+    out_path = Path(args.out).expanduser().resolve()
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+
+    # Same layout as `python -m zipapp`, plus unchecked-hash .pyc files next to each module:
+    # zipimport cannot write bytecode caches, so without them every run recompiles every module.
+    with tempfile.TemporaryDirectory(prefix="skillops_zipapp_") as tmp, out_path.open("wb") as fh:
+        fh.write(b"#!" + args.python.encode("utf-8") + b"\n")
+        with zipfile.ZipFile(fh, "w", zipfile.ZIP_DEFLATED) as zipf:
+            zipf.writestr("__main__.py", "import sys\nimport skillops\nsys.exit(skillops.main())\n")
+            for py_path in sorted(source.glob("*.py")):
+                pyc_path = Path(tmp) / f"{py_path.stem}.pyc"
+                py_compile.compile(
+                    str(py_path),
+                    cfile=str(pyc_path),
+                    dfile=py_path.name,
+                    doraise=True,
+                    invalidation_mode=py_compile.PycInvalidationMode.UNCHECKED_HASH,
+                )
+                zipf.write(py_path, py_path.name)
+                zipf.write(pyc_path, pyc_path.name)
+    out_path.chmod(0o755)
+    print(f"[OK] Wrote: {out_path}")
+    return 0
+
+
+def _bench_startup(argv: list[str]) -> int:
+    import argparse
+    import statistics
+    import subprocess
+    import time
+
+    parser = argparse.ArgumentParser(prog="skillops bench-startup", description=BUILTINS["bench-startup"])
+    parser.add_argument("--runs", type=int, default=20, help="Number of timed runs (default: 20).")
+    parser.add_argument("--max-ms", type=float, default=0.0, help="Fail if median overhead exceeds this (default: off).")
+    args = parser.parse_args(argv)
+
+    def measure(cmd: list[str]) -> float:
+        samples: list[float] = []
+        for _ in range(max(1, args.runs)):
+            start = time.perf_counter()
+            subprocess.run(cmd, stdout=subprocess.DEVNULL, check=True)
+            samples.append((time.perf_counter() - start) * 1000)
+        return statistics.median(samples)
+
+    bare_ms = measure([sys.executable, "-c", "pass"])
+    noop_ms = measure([sys.executable, _entry_point(), "version"])
+    overhead_ms = noop_ms - bare_ms
+    print(f"python -c pass:    {bare_ms:.1f} ms (median of {args.runs})")
+    print(f"skillops version:  {noop_ms:.1f} ms (median of {args.runs})")
+    print(f"skillops overhead: {overhead_ms:.1f} ms")
+    if args.max_ms and overhead_ms > args.max_ms:
+        print(f"Startup overhead {overhead_ms:.1f} ms > {args.max_ms:.1f} ms")
+        return 2
+    return 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    argv = list(sys.argv[1:] if argv is None else argv)
+    if not argv or argv[0] in {"-h", "--help", "help"}:
+        print(_usage())
+        return 0 if argv else 1
+
+    command, rest = argv[0], argv[1:]
+    if command in {"version", "--version"}:
+        print(f"skillops {VERSION}")
+        return 0
+    if command == "zipapp":
+        return _build_zipapp(rest)
+    if command == "bench-startup":
+        return _bench_startup(rest)
+    if command not in COMMANDS:
+        print(f"Unknown command: {command}\n", file=sys.stderr)
+        print(_usage(), file=sys.stderr)
+        return 1
+
+    import importlib
+
+    module = importlib.import_module(COMMANDS[command][0])
+    # argparse derives `prog` from argv[0]; make subcommand help read `skillops <cmd>`.
+    sys.argv[0] = f"skillops {command}"
+    return int(module.main(rest) or 0)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
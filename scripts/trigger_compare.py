@@ -0,0 +1,407 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import heapq
+import json
+import time
+from dataclasses import dataclass, replace
+from itertools import islice
+from pathlib import Path
+
+from gate_stats import format_deltas, paired_deltas
+from skill_catalog import read_index_payload
+from skill_mentions import load_automaton
+from trigger_eval import (
+    CascadeThresholds,
+    Case,
+    ShardedBM25,
+    Skill,
+    Vocabulary,
+    _load_cases,
+    _parse_scopes,
+    _skills_from_payload,
+    calibrate_cascade,
+    cascade_decision,
+    mention_decision,
+    parse_field_boosts,
+    skill_doc,
+    skill_fields,
+    summarize_bm25,
+    tokenize,
+)
+
+# A/B comparison of two routing setups over one case suite, in one pass. A side is a catalog, BM25
+# parameters (optionally BM25F field boosts) and a router (`bm25`: the top-ranked skill, none when
+# nothing scores; `cascade`: the trigger_eval.py --cascade fast path, which may escalate).
+# Every prompt is tokenized once, both indices share one Vocabulary, and sides with the same catalog
+# and parameters share one index, so comparing two routers costs one index build.
+
+
+@dataclass(frozen=True)
+class Side:
+    label: str
+    skills_path: Path
+    k1: float
+    b: float
+    router: str
+    field_boosts: tuple[float, ...] | None = None
+
+
+class Arm:
+    def __init__(self, side: Side, payload: dict, bm25: ShardedBM25):
+        self.side = side
+        self.payload = payload
+        self.skills: list[Skill] = _skills_from_payload(payload)
+        self.bm25 = bm25
+        self.thresholds = CascadeThresholds()
+        self.calibrated = False
+
+
+def rank_from_scores(
+    scores: dict[int, float], skills: list[Skill], *, top_k: int, scopes: set[str] | None = None
+) -> list[tuple[int, float]]:
+    """The ShardedBM25.rank ordering from its scores: (-score, idx), zero-score in-scope skills last."""
+    ranked = heapq.nsmallest(top_k, scores.items(), key=lambda p: (-p[1], p[0]))
+    if len(ranked) < top_k:
+        tail = (idx for idx, s in enumerate(skills) if idx not in scores and (scopes is None or s.scope in scopes))
+        ranked.extend((idx, 0.0) for idx in islice(tail, top_k - len(ranked)))
+        ranked.sort(key=lambda p: (-p[1], p[0]))
+    return ranked
+
+
+def expected_ranks(scores: dict[int, float], skills: list[Skill], expected: list[str]) -> dict[str, int | None]:
+    """1-based rank of each expected skill in the full ordering (None when it scores zero or is unknown)."""
+    positions: dict[str, int | None] = {}
+    by_name = {s.name: idx for idx, s in enumerate(skills)}
+    for name in expected:
+        idx = by_name.get(name)
+        score = scores.get(idx) if idx is not None else None
+        if not score:
+            positions[name] = None
+            continue
+        positions[name] = 1 + sum(1 for j, other in scores.items() if other > score or (other == score and j < idx))
+    return positions
+
+
+def _side_items(cases: list[Case], arm: Arm, ranked: list[list[tuple[int, float]]], top_k: int) -> list[dict]:
+    items = []
+    for c, ranking in zip(cases, ranked):
+        items.append(
+            {"id": c.id, "expected": c.expected, "bm25_top_k": [arm.skills[idx].name for idx, _ in ranking[:top_k]]}
+        )
+    return items
+
+
+def _route(arm: Arm, cases: list[Case], ranked: list[list[tuple[int, float]]], args: argparse.Namespace) -> list[dict]:
+    """Routing for one side: stage and picks per case (None when escalated)."""
+    if arm.side.router == "bm25":
+        return [
+            {"route_stage": "bm25", "route_picks": [arm.skills[r[0][0]].name] if r and r[0][1] > 0 else []}
+            for r in ranked
+        ]
+    scopes = _parse_scopes(args.scopes)
+    routable = {s.name for s in arm.skills if scopes is None or s.scope in scopes}
+    automaton = load_automaton(arm.payload)
+    mentions = [
+        mention_decision(c.prompt, automaton, arm.bm25, arm.skills, routable=routable, scopes=scopes, trust=args.mention_trust)
+        for c in cases
+    ]
+    # Thresholds that are not given are calibrated on the suite being scored, as trigger_eval.py does,
+    # which flatters the cascade; the summary records when that happened.
+    arm.thresholds = CascadeThresholds(margin=args.cascade_margin, abstain=args.cascade_abstain)
+    if arm.thresholds.margin is None or arm.thresholds.abstain is None:
+        calibrated = calibrate_cascade(
+            [(ranking, set(c.expected)) for c, ranking, m in zip(cases, ranked, mentions) if m == []],
+            arm.skills,
+            target_precision=float(args.cascade_target_precision),
+        )
+        arm.thresholds = CascadeThresholds(
+            margin=calibrated.margin if arm.thresholds.margin is None else arm.thresholds.margin,
+            abstain=calibrated.abstain if arm.thresholds.abstain is None else arm.thresholds.abstain,
+        )
+        arm.calibrated = True
+    routes = []
+    for ranking, picks in zip(ranked, mentions):
+        stage = "mention"
+        if picks == []:
+            stage, picks = "bm25", cascade_decision(ranking, arm.skills, arm.thresholds)
+        routes.append({"route_stage": stage if picks is not None else "escalated", "route_picks": picks})
+    return routes
+
+
+def _metrics(items: list[dict], *, top_k: int, compared: list[bool]) -> dict:
+    """
+    Side metrics. Route exact match is over the cases both sides decided (`compared`), so its delta is
+    the paired point estimate; a side that escalates more shows up in route_escalation_rate instead.
+    """
+
+    metrics = summarize_bm25(items, top_k=top_k)
+    escalated = sum(1 for item in items if item["route_picks"] is None)
+    metrics["route_escalation_rate"] = escalated / len(items) if items else 0.0
+    routed = [item for item, both in zip(items, compared) if both]
+    metrics["route_exact_match_rate"] = (
+        sum(1 for item in routed if set(item["route_picks"]) == set(item["expected"])) / len(routed) if routed else 0.0
+    )
+    return metrics
+
+
+def compare(baseline: Side, candidate: Side, cases: list[Case], args: argparse.Namespace) -> dict:
+    scopes = _parse_scopes(args.scopes)
+    vocab = Vocabulary()
+    payloads: dict[Path, dict] = {}
+    indices: dict[tuple[Path, float, float, tuple[float, ...] | None], ShardedBM25] = {}
+    arms: list[Arm] = []
+    start = time.perf_counter()
+    for side in (baseline, candidate):
+        if side.skills_path not in payloads:
+            payloads[side.skills_path] = read_index_payload(side.skills_path)
+        payload = payloads[side.skills_path]
+        key = (side.skills_path, side.k1, side.b, side.field_boosts)
+        if key not in indices:
+            skills = _skills_from_payload(payload)
+            fields = side.field_boosts is not None
+            indices[key] = ShardedBM25(
+                [skill_fields(s) if fields else skill_doc(s) for s in skills],
+                [s.scope for s in skills],
+                k1=side.k1,
+                b=side.b,
+                global_idf=not args.per_shard_idf,
+                vocab=vocab,
+                field_boosts=list(side.field_boosts) if fields else None,
+            )
+        arms.append(Arm(side, payload, indices[key]))
+    build_s = time.perf_counter() - start
+    if not all(arm.skills for arm in arms):
+        raise SystemExit("No skills loaded for one of the sides. Check --baseline/--candidate.")
+
+    start = time.perf_counter()
+    queries = [tokenize(c.prompt) for c in cases]
+    tokenize_s = time.perf_counter() - start
+
+    # Each distinct index scores a query once; top-k and expected ranks are both read off those scores.
+    # The cascade needs the runner-up for its margin, so rankings keep at least two.
+    ranked: list[list[list[tuple[int, float]]]] = [[] for _ in arms]
+    ranks: list[list[dict[str, int | None]]] = [[] for _ in arms]
+    rank_s = [0.0 for _ in arms]
+    for c, query in zip(cases, queries):
+        scored: dict[int, tuple[dict[int, float], float]] = {}
+        for pos, arm in enumerate(arms):
+            start = time.perf_counter()
+            if id(arm.bm25) in scored:
+                scores, shared_s = scored[id(arm.bm25)]
+            else:
+                scores, shared_s = arm.bm25.scores(query, scopes=scopes), 0.0
+                scored[id(arm.bm25)] = (scores, time.perf_counter() - start)
+            ranked[pos].append(rank_from_scores(scores, arm.skills, top_k=max(2, args.top_k), scopes=scopes))
+            rank_s[pos] += shared_s + time.perf_counter() - start
+            ranks[pos].append(expected_ranks(scores, arm.skills, c.expected))
+
+    side_items = [_side_items(cases, arm, ranked[pos], args.top_k) for pos, arm in enumerate(arms)]
+    for pos, arm in enumerate(arms):
+        for item, route in zip(side_items[pos], _route(arm, cases, ranked[pos], args)):
+            item.update(route)
+
+    results: list[dict] = []
+    flips: dict[str, list[str]] = {
+        "rank_changed": [],
+        "top_k_changed": [],
+        "hit_gained": [],
+        "hit_lost": [],
+        "route_changed": [],
+    }
+    for case_pos, c in enumerate(cases):
+        before, after = side_items[0][case_pos], side_items[1][case_pos]
+        item: dict = {
+            "id": c.id,
+            "prompt": c.prompt,
+            "expected": c.expected,
+            baseline.label: {**before, "expected_ranks": ranks[0][case_pos]},
+            candidate.label: {**after, "expected_ranks": ranks[1][case_pos]},
+        }
+        for entry in (item[baseline.label], item[candidate.label]):
+            entry.pop("id")
+            entry.pop("expected")
+        rank_changes = {
+            name: [ranks[0][case_pos][name], ranks[1][case_pos][name]]
+            for name in c.expected
+            if ranks[0][case_pos][name] != ranks[1][case_pos][name]
+        }
+        if rank_changes:
+            item["rank_changes"] = rank_changes
+            flips["rank_changed"].append(c.id)
+        old_top, new_top = set(before["bm25_top_k"]), set(after["bm25_top_k"])
+        if old_top != new_top:
+            item["top_k_entered"] = [name for name in after["bm25_top_k"] if name not in old_top]
+            item["top_k_left"] = [name for name in before["bm25_top_k"] if name not in new_top]
+            flips["top_k_changed"].append(c.id)
+        expected = set(c.expected)
+        if expected:
+            hit_before, hit_after = bool(expected & old_top), bool(expected & new_top)
+            if hit_before != hit_after:
+                item["hit_flip"] = "gained" if hit_after else "lost"
+                flips[f"hit_{item['hit_flip']}"].append(c.id)
+        if before["route_picks"] != after["route_picks"]:
+            flips["route_changed"].append(c.id)
+        results.append(item)
+
+    compared = [
+        before["route_picks"] is not None and after["route_picks"] is not None
+        for before, after in zip(side_items[0], side_items[1])
+    ]
+    metrics = [_metrics(items, top_k=args.top_k, compared=compared) for items in side_items]
+    deltas = {
+        name: metrics[1][name] - metrics[0][name]
+        for name in metrics[0]
+        if name in metrics[1] and name not in {"top_k", "cases_total", "cases_positive", "cases_negative"}
+    }
+    # Per-case paired bootstrap (see gate_stats.py); route picks are scored as cascade_exact_match_rate.
+    side_payloads = [{"summary": {"top_k": args.top_k}, "results": items} for items in side_items]
+    paired = paired_deltas(side_payloads[1], side_payloads[0], resamples=max(1, int(args.bootstrap_resamples)))
+
+    return {
+        "summary": {
+            "sides": {
+                arm.side.label: {
+                    "skills": str(arm.side.skills_path),
+                    "k1": arm.side.k1,
+                    "b": arm.side.b,
+                    "router": arm.side.router,
+                    **({"field_boosts": list(arm.side.field_boosts)} if arm.side.field_boosts is not None else {}),
+                    **(
+                        {
+                            "cascade_thresholds": {
+                                "margin": arm.thresholds.margin,
+                                "abstain": arm.thresholds.abstain,
+                                "calibrated_on_suite": arm.calibrated,
+                            }
+                        }
+                        if arm.side.router == "cascade"
+                        else {}
+                    ),
+                    "metrics": metrics[pos],
+                    "rank_s": rank_s[pos],
+                }
+                for pos, arm in enumerate(arms)
+            },
+            "deltas": deltas,
+            "route_cases_compared": sum(compared),
+            "paired_deltas": paired,
+            "changed_cases": flips,
+            "indices_built": len(indices),
+            "index_build_s": build_s,
+            "tokenize_s": tokenize_s,
+            "top_k": args.top_k,
+        },
+        "results": results,
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Compare two skill catalogs, BM25 parameter sets, or routers over one case suite in a single pass."
+    )
+    parser.add_argument("--baseline", required=True, help="Baseline skills_index.json or binary catalog.")
+    parser.add_argument("--candidate", default="", help="Candidate skills_index.json or catalog (default: --baseline).")
+    parser.add_argument("--cases", required=True, help="Path to cases JSON (see datasets/trigger_cases.example.json).")
+    parser.add_argument("--baseline-k1", type=float, default=1.5, help="Baseline BM25 k1 (default: 1.5).")
+    parser.add_argument("--baseline-b", type=float, default=0.75, help="Baseline BM25 b (default: 0.75).")
+    parser.add_argument("--candidate-k1", type=float, default=None, help="Candidate BM25 k1 (default: baseline's).")
+    parser.add_argument("--candidate-b", type=float, default=None, help="Candidate BM25 b (default: baseline's).")
+    for label in ("baseline", "candidate"):
+        parser.add_argument(
+            f"--{label}-bm25f",
+            nargs="?",
+            const="",
+            default=None,
+            metavar="BOOSTS",
+            help=f"Score the {label} with BM25F, optionally with field boosts like 'name=3,description=1' "
+            "(default: single-field BM25; not inherited by the candidate).",
+        )
+    parser.add_argument(
+        "--baseline-router", choices=["bm25", "cascade"], default="bm25", help="Baseline router (default: bm25)."
+    )
+    parser.add_argument(
+        "--candidate-router", choices=["bm25", "cascade"], default=None, help="Candidate router (default: baseline's)."
+    )
+    parser.add_argument("--top-k", type=int, default=5, help="Top-k for hit/recall and flips (default: 5).")
+    parser.add_argument("--scopes", default="", help="Comma-separated scopes to route over (default: all scopes).")
+    parser.add_argument("--per-shard-idf", action="store_true", help="Score scope shards with their own IDF/avgdl.")
+    parser.add_argument(
+        "--mention-trust",
+        choices=["corroborated", "always"],
+        default="corroborated",
+        help="Cascade router: mention trust (default: corroborated; see trigger_eval.py --help).",
+    )
+    parser.add_argument(
+        "--cascade-target-precision",
+        type=float,
+        default=0.95,
+        help="Cascade router: calibration precision target (default: 0.95).",
+    )
+    parser.add_argument(
+        "--cascade-margin",
+        type=float,
+        default=None,
+        help="Cascade router: BM25 top-1 acceptance margin (default: calibrated on the suite).",
+    )
+    parser.add_argument(
+        "--cascade-abstain",
+        type=float,
+        default=None,
+        help="Cascade router: abstain score (default: calibrated on the suite).",
+    )
+    parser.add_argument("--bootstrap-resamples", type=int, default=2000, help="Paired bootstrap resamples (default: 2000).")
+    parser.add_argument("--out", default="trigger_compare.json", help="Output JSON path.")
+    args = parser.parse_args(argv)
+
+    baseline_path = Path(args.baseline).expanduser().resolve()
+    baseline = Side(
+        "baseline",
+        baseline_path,
+        args.baseline_k1,
+        args.baseline_b,
+        args.baseline_router,
+        None if args.baseline_bm25f is None else tuple(parse_field_boosts(args.baseline_bm25f)),
+    )
+    candidate = Side(
+        "candidate",
+        Path(args.candidate).expanduser().resolve() if args.candidate else baseline_path,
+        args.baseline_k1 if args.candidate_k1 is None else args.candidate_k1,
+        args.baseline_b if args.candidate_b is None else args.candidate_b,
+        args.candidate_router or args.baseline_router,
+        None if args.candidate_bm25f is None else tuple(parse_field_boosts(args.candidate_bm25f)),
+    )
+    if replace(candidate, label=baseline.label) == baseline:
+        raise SystemExit("Baseline and candidate are identical; change the catalog, BM25 parameters, BM25F or router.")
+    cases = _load_cases(Path(args.cases).expanduser().resolve())
+    if not cases:
+        raise SystemExit("No cases loaded. Check --cases path.")
+
+    report = compare(baseline, candidate, cases, args)
+    out_path = Path(args.out).expanduser().resolve()
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    out_path.write_text(json.dumps(report, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+
+    summary = report["summary"]
+    for name, delta in summary["deltas"].items():
+        before = summary["sides"]["baseline"]["metrics"][name]
+        scope = ""
+        if name == "route_exact_match_rate":
+            scope = f", over {summary['route_cases_compared']} case(s) both routed"
+        print(f"{name}: {before:.3f} -> {before + delta:.3f} ({delta:+.3f}{scope})")
+    if any(side.get("cascade_thresholds", {}).get("calibrated_on_suite") for side in summary["sides"].values()):
+        print("Cascade thresholds were calibrated on this suite; fix them with --cascade-margin/--cascade-abstain.")
+    print("Paired change (95% CI):")
+    for line in format_deltas(summary["paired_deltas"], confidence=0.95):
+        print(f"  {line}")
+    for name, ids in summary["changed_cases"].items():
+        if ids:
+            more = f", ... (+{len(ids) - 10})" if len(ids) > 10 else ""
+            print(f"{name}: {len(ids)} case(s): {', '.join(ids[:10])}{more}")
+    print(f"Wrote: {out_path}")
+    return 1 if any(d["regressed"] for d in summary["paired_deltas"].values()) else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -2,92 +2,678 @@
 from __future__ import annotations
 
 import argparse
+import heapq
 import json
 import math
-import re
-import subprocess
-import tempfile
+import random
+import threading
+import time
+from array import array
+from bisect import bisect_left
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
+from itertools import accumulate, repeat
 from pathlib import Path
+from typing import Callable, Container, Iterable, Iterator
 
+from index_skills import normalize_scope
+from router_backends import BACKENDS, RouteRequest, TransientRouterError, create_backend
+from skill_catalog import read_index_payload
+from skill_mentions import MentionAutomaton, load_automaton
+from skill_text import tokenize
 
-def tokenize(text: str) -> list[str]:
-    text = text.lower()
-    tokens: list[str] = []
 
-    tokens.extend(re.findall(r"[a-z0-9]+(?:-[a-z0-9]+)*", text))
-
-    cjk = re.findall(r"[\u4e00-\u9fff]", text)
-    tokens.extend(cjk)
-    tokens.extend([cjk[i] + cjk[i + 1] for i in range(len(cjk) - 1)])
-    return tokens
-
-
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Skill:
     name: str
     description: str
+    scope: str = "custom"
+    short_description: str = ""
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Case:
     id: str
     prompt: str
     expected: list[str]
 
 
+class Vocabulary:
+    """Term <-> integer id mapping. Several indices can share one (shards, A/B comparisons)."""
+
+    __slots__ = ("ids", "terms")
+
+    def __init__(self) -> None:
+        self.ids: dict[str, int] = {}
+        self.terms: list[str] = []
+
+    def add(self, term: str) -> int:
+        tid = self.ids.get(term)
+        if tid is None:
+            tid = len(self.terms)
+            self.ids[term] = tid
+            self.terms.append(term)
+        return tid
+
+    def get(self, term: str) -> int | None:
+        return self.ids.get(term)
+
+    def __contains__(self, term: object) -> bool:
+        return term in self.ids
+
+    def __len__(self) -> int:
+        return len(self.terms)
+
+    def __iter__(self):
+        return iter(self.terms)
+
+
+def _zeros(n: int) -> array:
+    return array("I", bytes(4 * n))
+
+
 class BM25:
-    def __init__(self, docs: list[list[str]], *, k1: float = 1.5, b: float = 0.75):
-        self.docs = docs
+    """
+    BM25 over integer-encoded documents.
+
+    Documents are stored as an inverted index in CSR form: for term id t, its postings are
+    post_docs/post_tfs[term_offsets[t]:term_offsets[t + 1]] (doc ids ascending). All buffers are
+    `array('I')`, so memory is ~8 bytes per (term, doc) pair instead of a Python str per token.
+    """
+
+    def __init__(
+        self,
+        docs: Iterable[list[str]],
+        *,
+        k1: float = 1.5,
+        b: float = 0.75,
+        vocab: Vocabulary | None = None,
+    ):
         self.k1 = k1
         self.b = b
-        self.doc_lens = [len(d) for d in docs]
-        self.avgdl = sum(self.doc_lens) / max(1, len(self.doc_lens))
+        self.vocab = vocab if vocab is not None else Vocabulary()
+        doc_lens = array("I")
+
+        def counts() -> Iterator[Counter]:
+            for doc in docs:
+                doc_lens.append(len(doc))
+                yield Counter(doc)
+
+        self._build_postings(counts(), doc_lens, tf_type="I")
+
+    def _build_postings(self, doc_counts: Iterable[dict[str, float]], doc_lens: array, *, tf_type: str) -> None:
+        """Inverted index from per-doc term -> tf maps; tf_type is the array typecode of the stored tfs."""
+        pair_terms = array("I")
+        pair_docs = array("I")
+        pair_tfs = array(tf_type)
+        ids = self.vocab.ids
+        for doc_idx, counts in enumerate(doc_counts):
+            for term in counts:
+                if term not in ids:
+                    self.vocab.add(term)
+            pair_terms.extend(map(ids.__getitem__, counts))
+            pair_tfs.extend(counts.values())
+            pair_docs.extend(repeat(doc_idx, len(counts)))
+
+        df = _zeros(len(self.vocab))
+        for tid, count in Counter(pair_terms).items():
+            df[tid] = count
+        term_offsets = array("I", [0])
+        term_offsets.extend(accumulate(df))
 
-        df: dict[str, int] = {}
-        for doc in docs:
-            for term in set(doc):
-                df[term] = df.get(term, 0) + 1
+        # Counting sort of (term, doc, tf) triples by term id; docs stay ascending within a term.
+        cursor = array("I", term_offsets)
+        post_docs = _zeros(len(pair_terms))
+        post_tfs = array(tf_type, bytes(pair_tfs.itemsize * len(pair_terms)))
+        for tid, doc_idx, tf in zip(pair_terms, pair_docs, pair_tfs):
+            pos = cursor[tid]
+            post_docs[pos] = doc_idx
+            post_tfs[pos] = tf
+            cursor[tid] = pos + 1
+
+        self.term_offsets = term_offsets
+        self.post_docs = post_docs
+        self.post_tfs = post_tfs
+        self.doc_lens = doc_lens
         self.df = df
-        self.N = len(docs)
+        self.N = len(doc_lens)
+        self.avgdl = sum(doc_lens) / max(1, self.N)
+        self.use_collection_stats(N=self.N, df=self.df, avgdl=self.avgdl)
+
+    def use_collection_stats(self, *, N: int, df: array, avgdl: float) -> None:
+        """Score with IDF and length normalisation taken from a larger collection (e.g. all shards)."""
+        self._stats_N = N
+        self._stats_df = df
+        self._stats_avgdl = avgdl
+        # Per-doc length normalisation, k1 * (1 - b + b * dl / avgdl), precomputed once per stats change.
+        self._norms = array(
+            "d", (self.k1 * (1 - self.b + self.b * ((dl / avgdl) if avgdl else 0.0)) for dl in self.doc_lens)
+        )
+
+    def terms(self) -> set[str]:
+        """Terms that occur in at least one document of this index."""
+        return {self.vocab.terms[tid] for tid, count in enumerate(self.df) if count}
 
     def idf(self, term: str) -> float:
-        df = self.df.get(term, 0)
-        return math.log((self.N - df + 0.5) / (df + 0.5) + 1.0)
-
-    def score(self, query: list[str], doc_idx: int) -> float:
-        doc = self.docs[doc_idx]
-        dl = self.doc_lens[doc_idx]
-        if not doc:
-            return 0.0
-        tf: dict[str, int] = {}
-        for t in doc:
-            tf[t] = tf.get(t, 0) + 1
+        tid = self.vocab.get(term)
+        df = self._stats_df[tid] if tid is not None and tid < len(self._stats_df) else 0
+        return math.log((self._stats_N - df + 0.5) / (df + 0.5) + 1.0)
+
+    def _postings(self, term: str) -> tuple[int, int]:
+        tid = self.vocab.get(term)
+        if tid is None or tid >= len(self.df):
+            return 0, 0
+        return self.term_offsets[tid], self.term_offsets[tid + 1]
+
+    def _term_scale(self, term: str, weights: dict[str, float] | None) -> float:
+        weight = weights.get(term, 1.0) if weights else 1.0
+        return weight * self.idf(term)
+
+    def score(self, query: list[str], doc_idx: int, *, weights: dict[str, float] | None = None) -> float:
+        k1p1 = self.k1 + 1
         score = 0.0
         for term in query:
-            if term not in tf:
-                continue
-            f = tf[term]
-            denom = f + self.k1 * (1 - self.b + self.b * (dl / self.avgdl))
-            score += self.idf(term) * (f * (self.k1 + 1)) / denom
+            lo, hi = self._postings(term)
+            pos = bisect_left(self.post_docs, doc_idx, lo, hi)
+            if pos < hi and self.post_docs[pos] == doc_idx:
+                tf = self.post_tfs[pos]
+                score += self._term_scale(term, weights) * (tf * k1p1) / (tf + self._norms[doc_idx])
         return score
 
-    def rank(self, query: list[str], *, top_k: int) -> list[tuple[int, float]]:
-        scored = [(idx, self.score(query, idx)) for idx in range(self.N)]
-        scored.sort(key=lambda p: p[1], reverse=True)
+    def scores(self, query: list[str], *, weights: dict[str, float] | None = None) -> dict[int, float]:
+        """Scores of the documents that contain at least one query term."""
+        # Term-at-a-time: only documents containing a query term are touched.
+        k1p1 = self.k1 + 1
+        norms = self._norms
+        scores: dict[int, float] = {}
+        get = scores.get
+        for term in query:
+            lo, hi = self._postings(term)
+            if lo == hi:
+                continue
+            scale = self._term_scale(term, weights)
+            for doc_idx, tf in zip(self.post_docs[lo:hi], self.post_tfs[lo:hi]):
+                scores[doc_idx] = get(doc_idx, 0.0) + scale * (tf * k1p1) / (tf + norms[doc_idx])
+        return scores
+
+    def rank(
+        self, query: list[str], *, top_k: int, weights: dict[str, float] | None = None
+    ) -> list[tuple[int, float]]:
+        scores = self.scores(query, weights=weights)
+        if len(scores) > top_k:
+            scored = heapq.nsmallest(top_k, scores.items(), key=lambda p: (-p[1], p[0]))
+        else:
+            scored = sorted(scores.items(), key=lambda p: (-p[1], p[0]))
+        if len(scored) < top_k:
+            # Zero-score documents fill the tail in index order, as a full scan would.
+            scored.extend((idx, 0.0) for idx in range(self.N) if idx not in scores)
         return scored[:top_k]
 
 
+FIELDS = ("name", "description", "short_description")
+DEFAULT_FIELD_BOOSTS = {"name": 3.0, "description": 1.0, "short_description": 0.5}
+
+
+def field_average_lengths(docs: Iterable[list[list[str]]]) -> list[float]:
+    totals: list[int] = []
+    n = 0
+    for fields in docs:
+        totals = [t + len(f) for t, f in zip(totals, fields)] if totals else [len(f) for f in fields]
+        n += 1
+    return [t / n for t in totals] if n else []
+
+
+def parse_field_boosts(raw: str) -> list[float]:
+    """'name=3,description=1' -> boosts in FIELDS order; unnamed fields keep DEFAULT_FIELD_BOOSTS."""
+    boosts = dict(DEFAULT_FIELD_BOOSTS)
+    for item in raw.split(","):
+        if not item.strip():
+            continue
+        field, _, value = item.partition("=")
+        field = field.strip().replace("-", "_")
+        if field not in boosts:
+            raise SystemExit(f"Unknown field '{field}' in field boosts (expected one of: {', '.join(FIELDS)})")
+        try:
+            boosts[field] = float(value)
+        except ValueError:
+            raise SystemExit(f"Invalid boost for field '{field}': {value!r}") from None
+    return [boosts[field] for field in FIELDS]
+
+
+class BM25F(BM25):
+    """
+    BM25F over per-field token lists (FIELDS order). Each field is length-normalised against its own
+    average length and boosted, giving a pseudo term frequency
+
+        tf~(t, d) = sum_f boost_f * tf_f(t, d) / (1 - b + b * len_f(d) / avglen_f)
+
+    which is saturated once, as tf~ * (k1 + 1) / (tf~ + k1). tf~ is precomputed here and stored in the
+    postings, so a query runs the same postings loop as BM25. Field average lengths are fixed at build
+    time (pass field_avglens to share them across shards).
+    """
+
+    def __init__(
+        self,
+        docs: Iterable[list[list[str]]],
+        *,
+        boosts: list[float],
+        k1: float = 1.5,
+        b: float = 0.75,
+        vocab: Vocabulary | None = None,
+        field_avglens: list[float] | None = None,
+    ):
+        self.k1 = k1
+        self.b = b
+        self.vocab = vocab if vocab is not None else Vocabulary()
+        self.boosts = boosts
+        docs = list(docs)
+        self.field_avglens = field_avglens if field_avglens is not None else field_average_lengths(docs)
+        doc_lens = array("I", (sum(len(field) for field in fields) for fields in docs))
+        self._build_postings(map(self._pseudo_tfs, docs), doc_lens, tf_type="d")
+
+    def _pseudo_tfs(self, fields: list[list[str]]) -> dict[str, float]:
+        tfs: dict[str, float] = {}
+        for tokens, boost, avglen in zip(fields, self.boosts, self.field_avglens):
+            if not tokens or not boost:
+                continue
+            scale = boost / (1 - self.b + self.b * (len(tokens) / avglen if avglen else 0.0))
+            for term, tf in Counter(tokens).items():
+                tfs[term] = tfs.get(term, 0.0) + scale * tf
+        return tfs
+
+    def use_collection_stats(self, *, N: int, df: array, avgdl: float) -> None:
+        # Length normalisation is already inside tf~; only IDF comes from the collection.
+        super().use_collection_stats(N=N, df=df, avgdl=avgdl)
+        self._norms = array("d", repeat(self.k1, len(self.doc_lens)))
+
+
+class ShardedBM25:
+    """
+    One BM25 shard per skill scope (see index_skills.SCOPES).
+
+    By default every shard scores with collection-wide IDF and average length, so merged scores are
+    comparable and identical to an unsharded index. global_idf=False gives each shard its own statistics
+    (opt-in: scores from different shards are then not comparable). Queries can be restricted to a set
+    of scopes; excluded shards are never scored. With field_boosts, docs are per-field token lists (see
+    skill_fields) and every shard is a BM25F index.
+    """
+
+    def __init__(
+        self,
+        docs: list,
+        scopes: list[str],
+        *,
+        k1: float = 1.5,
+        b: float = 0.75,
+        global_idf: bool = True,
+        vocab: Vocabulary | None = None,
+        field_boosts: list[float] | None = None,
+    ):
+        self.k1 = k1
+        self.b = b
+        self.global_idf = global_idf
+        self.vocab = vocab if vocab is not None else Vocabulary()
+        self.field_boosts = field_boosts
+        self.field_avglens = field_average_lengths(docs) if field_boosts is not None and global_idf else None
+        self.shards: dict[str, BM25] = {}
+        self.doc_ids: dict[str, list[int]] = {}
+
+        grouped: dict[str, list[int]] = {}
+        for idx, scope in enumerate(scopes):
+            grouped.setdefault(scope, []).append(idx)
+        for scope, ids in grouped.items():
+            self.shards[scope] = self._shard([docs[i] for i in ids])
+            self.doc_ids[scope] = ids
+        self._refresh_collection_stats()
+
+    def _shard(self, docs: list) -> BM25:
+        if self.field_boosts is None:
+            return BM25(docs, k1=self.k1, b=self.b, vocab=self.vocab)
+        return BM25F(
+            docs, boosts=self.field_boosts, k1=self.k1, b=self.b, vocab=self.vocab, field_avglens=self.field_avglens
+        )
+
+    def rebuild_shard(self, scope: str, docs: list[list[str]], doc_ids: list[int]) -> None:
+        """Replace one scope's shard; other shards are untouched (only shared stats are refreshed)."""
+        if docs:
+            self.shards[scope] = self._shard(docs)
+            self.doc_ids[scope] = list(doc_ids)
+        else:
+            self.shards.pop(scope, None)
+            self.doc_ids.pop(scope, None)
+        self._refresh_collection_stats()
+
+    def _refresh_collection_stats(self) -> None:
+        # Shards share self.vocab, so collection df is an element-wise sum over term ids.
+        df = _zeros(len(self.vocab))
+        total_len = 0
+        for shard in self.shards.values():
+            total_len += sum(shard.doc_lens)
+            for tid, count in enumerate(shard.df):
+                if count:
+                    df[tid] += count
+        self.df = df
+        self.N = sum(shard.N for shard in self.shards.values())
+        avgdl = total_len / max(1, self.N)
+        for shard in self.shards.values():
+            if self.global_idf:
+                shard.use_collection_stats(N=self.N, df=df, avgdl=avgdl)
+            else:
+                shard.use_collection_stats(N=shard.N, df=shard.df, avgdl=shard.avgdl)
+
+    def scores(
+        self, query: list[str], *, weights: dict[str, float] | None = None, scopes: set[str] | None = None
+    ) -> dict[int, float]:
+        """Scores (by global doc id) of the documents that contain at least one query term."""
+        merged: dict[int, float] = {}
+        for scope, shard in self.shards.items():
+            if scopes is not None and scope not in scopes:
+                continue
+            ids = self.doc_ids[scope]
+            merged.update((ids[idx], score) for idx, score in shard.scores(query, weights=weights).items())
+        return merged
+
+    def terms(self) -> set[str]:
+        """Terms that occur in at least one document of any shard."""
+        return {self.vocab.terms[tid] for tid, count in enumerate(self.df) if count}
+
+    def rank(
+        self,
+        query: list[str],
+        *,
+        top_k: int,
+        weights: dict[str, float] | None = None,
+        scopes: set[str] | None = None,
+    ) -> list[tuple[int, float]]:
+        merged: list[tuple[int, float]] = []
+        for scope, shard in self.shards.items():
+            if scopes is not None and scope not in scopes:
+                continue
+            ids = self.doc_ids[scope]
+            merged.extend((ids[idx], score) for idx, score in shard.rank(query, top_k=top_k, weights=weights))
+        merged.sort(key=lambda p: (-p[1], p[0]))
+        return merged[:top_k]
+
+
+@dataclass(frozen=True, slots=True)
+class BodyChunk:
+    skill: int
+    heading: str
+    skill_md: str
+    start: int
+    end: int
+
+
+class BodyIndex:
+    """
+    BM25 over SKILL.md body sections (index_skills.py --index-body). Only term frequencies and byte
+    ranges are held in memory; section text is read from disk when a hit is reported.
+    """
+
+    def __init__(self, chunks: list[BodyChunk], tfs: list[dict[str, int]], *, k1: float = 1.5, b: float = 0.75):
+        self.chunks = chunks
+        self.bm25 = BM25((list(Counter(tf).elements()) for tf in tfs), k1=k1, b=b)
+
+    def best_chunks(self, query: list[str], *, weights: dict[str, float] | None = None) -> dict[int, tuple[float, int]]:
+        """skill index -> (best section score, chunk index) for skills with a matching section."""
+        best: dict[int, tuple[float, int]] = {}
+        for chunk_idx, score in self.bm25.scores(query, weights=weights).items():
+            skill = self.chunks[chunk_idx].skill
+            if skill not in best or score > best[skill][0]:
+                best[skill] = (score, chunk_idx)
+        return best
+
+    def text(self, chunk_idx: int) -> str:
+        chunk = self.chunks[chunk_idx]
+        with open(chunk.skill_md, "rb") as fh:
+            fh.seek(chunk.start)
+            return fh.read(chunk.end - chunk.start).decode("utf-8", errors="replace")
+
+
+def load_body_index(payload: dict) -> BodyIndex | None:
+    """BodyIndex from an index payload's `body_chunks`, in the order of payload['skills']."""
+    body = payload.get("body_chunks")
+    if not body:
+        return None
+    chunks: list[BodyChunk] = []
+    tfs: list[dict[str, int]] = []
+    for idx, raw in enumerate(payload.get("skills", [])):
+        skill_md = str(raw.get("skill_md", ""))
+        for chunk in body.get(skill_md, []):
+            chunks.append(BodyChunk(idx, chunk["heading"], skill_md, int(chunk["start"]), int(chunk["end"])))
+            tfs.append(chunk["tf"])
+    return BodyIndex(chunks, tfs)
+
+
+def rank_with_body(
+    bm25: ShardedBM25,
+    body: BodyIndex,
+    query: list[str],
+    skills: list[Skill],
+    *,
+    top_k: int,
+    body_weight: float,
+    weights: dict[str, float] | None = None,
+    scopes: set[str] | None = None,
+) -> tuple[list[tuple[int, float]], dict[int, tuple[float, int]]]:
+    """
+    Rank by description score + body_weight * best section score; also returns the body hits.
+    Ties and the zero-score tail are ordered exactly as ShardedBM25.rank orders them.
+    """
+
+    best = body.best_chunks(query, weights=weights)
+    combined = bm25.scores(query, weights=weights, scopes=scopes)
+    get = combined.get
+    for idx, (score, _) in best.items():
+        if scopes is None or skills[idx].scope in scopes:
+            combined[idx] = get(idx, 0.0) + body_weight * score
+    ranked = heapq.nsmallest(top_k, combined.items(), key=lambda p: (-p[1], p[0]))
+    if len(ranked) < top_k:
+        tail = bm25.rank(query, top_k=top_k + len(combined), scopes=scopes)
+        ranked.extend(p for p in tail if p[0] not in combined)
+    return ranked[:top_k], best
+
+
+def _trigrams(term: str) -> set[str]:
+    padded = f"^^{term}$$"
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+def _edit_distance(a: str, b: str, max_edits: int) -> int:
+    """
+    Optimal-string-alignment distance (adjacent transpositions cost 1), with early exit.
+    Returns max_edits + 1 as soon as the distance is known to exceed max_edits.
+    """
+
+    if abs(len(a) - len(b)) > max_edits:
+        return max_edits + 1
+    prev2: list[int] = []
+    prev = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        cur = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            cur[j] = min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                cur[j] = min(cur[j], prev2[j - 2] + 1)
+        if min(cur) > max_edits:
+            return max_edits + 1
+        prev2, prev = prev, cur
+    return prev[-1]
+
+
+class TrigramIndex:
+    """
+    Character-trigram inverted index over a term vocabulary.
+
+    Lookups only touch the posting lists of the query's trigrams, then apply the q-gram count filter
+    (one edit destroys at most 4 padded trigrams, counting transpositions) before verifying candidates
+    with a bounded edit distance. The vocabulary is never scanned in full.
+    """
+
+    def __init__(self, vocabulary: Iterable[str]):
+        self.terms = sorted(set(vocabulary))
+        postings: dict[str, list[int]] = {}
+        for idx, term in enumerate(self.terms):
+            for gram in _trigrams(term):
+                postings.setdefault(gram, []).append(idx)
+        self.postings = postings
+
+    def lookup(self, term: str, *, max_edits: int) -> list[tuple[str, int]]:
+        grams = _trigrams(term)
+        min_shared = len(grams) - 4 * max_edits
+        if max_edits < 1 or min_shared < 1:
+            return []
+
+        shared: dict[int, int] = {}
+        for gram in grams:
+            for idx in self.postings.get(gram, ()):
+                shared[idx] = shared.get(idx, 0) + 1
+
+        matches: list[tuple[str, int]] = []
+        for idx, count in shared.items():
+            if count < min_shared:
+                continue
+            candidate = self.terms[idx]
+            if candidate == term:
+                continue
+            dist = _edit_distance(term, candidate, max_edits)
+            if dist <= max_edits:
+                matches.append((candidate, dist))
+        matches.sort(key=lambda p: (p[1], p[0]))
+        return matches
+
+
+def _fuzzy_budget(term: str, max_edits: int) -> int:
+    # Short tokens have too many neighbours to correct reliably; long ones can absorb two typos.
+    if len(term) < 4 or not term.isascii():
+        return 0
+    if len(term) < 8:
+        return min(1, max_edits)
+    return min(2, max_edits)
+
+
+def expand_query(
+    query: list[str],
+    *,
+    vocabulary: Container[str],
+    trigrams: TrigramIndex,
+    max_edits: int = 2,
+    weight: float = 0.5,
+) -> tuple[list[str], dict[str, float], dict[str, list[str]]]:
+    """
+    Add vocabulary terms within a small edit distance of out-of-vocabulary query terms.
+    Expansions are weighted by weight**distance; original terms keep weight 1.0.
+    Returns (expanded_query, weights, {original_term: [expansions]}).
+    """
+
+    expanded = list(query)
+    weights: dict[str, float] = {}
+    fuzzy_terms: dict[str, list[str]] = {}
+    present = set(query)
+    for term in dict.fromkeys(query):
+        if term in vocabulary:
+            continue
+        budget = _fuzzy_budget(term, max_edits)
+        if budget < 1:
+            continue
+        for candidate, dist in trigrams.lookup(term, max_edits=budget):
+            if candidate in present:
+                continue
+            present.add(candidate)
+            expanded.append(candidate)
+            weights[candidate] = weight**dist
+            fuzzy_terms.setdefault(term, []).append(candidate)
+    return expanded, weights, fuzzy_terms
+
+
+def build_query(
+    prompt: str,
+    *,
+    vocabulary: Container[str],
+    trigrams: TrigramIndex | None,
+    max_edits: int = 2,
+    weight: float = 0.5,
+) -> tuple[list[str], dict[str, float] | None, dict[str, list[str]]]:
+    query = tokenize(prompt)
+    if trigrams is None:
+        return query, None, {}
+    return expand_query(query, vocabulary=vocabulary, trigrams=trigrams, max_edits=max_edits, weight=weight)
+
+
+def skill_doc(skill: Skill) -> list[str]:
+    return tokenize(f"{skill.name}\n{skill.description}")
+
+
+def skill_fields(skill: Skill) -> list[list[str]]:
+    """Tokens per field (FIELDS order). The name field also holds a hyphenated name's parts."""
+    name = tokenize(skill.name)
+    if "-" in skill.name:
+        name.extend(tokenize(skill.name.replace("-", " ")))
+    return [name, tokenize(skill.description), tokenize(skill.short_description)]
+
+
+def percentile(values: list[float], q: float) -> float:
+    """Nearest-rank percentile (q in [0, 1]); 0.0 for no values."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, math.ceil(q * len(ordered)) - 1))]
+
+
+def summarize_bm25(items: list[dict], *, top_k: int) -> dict:
+    """BM25 summary metrics from per-case result items (`expected` + `bm25_top_k`)."""
+    positive_total = 0
+    hit_at_k = 0
+    recall_sum = 0.0
+    for item in items:
+        expected_set = set(item.get("expected", []))
+        if not expected_set:
+            continue
+        got_set = set(item.get("bm25_top_k", [])[:top_k])
+        positive_total += 1
+        hit_at_k += 1 if expected_set & got_set else 0
+        recall_sum += len(expected_set & got_set) / len(expected_set)
+    return {
+        "cases_total": len(items),
+        "cases_positive": positive_total,
+        "cases_negative": len(items) - positive_total,
+        "bm25_hit_at_k": (hit_at_k / positive_total) if positive_total else 0.0,
+        "bm25_recall_at_k": (recall_sum / positive_total) if positive_total else 0.0,
+        "top_k": top_k,
+    }
+
+
 def _load_skills(index_path: Path) -> list[Skill]:
-    data = json.loads(index_path.read_text(encoding="utf-8"))
+    return _skills_from_payload(read_index_payload(index_path))
+
+
+def _skills_from_payload(data: dict) -> list[Skill]:
     skills: list[Skill] = []
     for raw in data.get("skills", []):
-        skills.append(Skill(name=str(raw.get("name", "")).strip(), description=str(raw.get("description", "")).strip()))
+        skills.append(
+            Skill(
+                name=str(raw.get("name", "")).strip(),
+                description=str(raw.get("description", "")).strip(),
+                scope=str(raw.get("scope_hint", "") or "custom").strip(),
+                short_description=str(raw.get("short_description", "")).strip(),
+            )
+        )
     return skills
 
 
+def _parse_scopes(raw: str) -> set[str] | None:
+    if not raw.strip():
+        return None
+    return {normalize_scope(item) for item in raw.split(",") if item.strip()}
+
+
 def _load_cases(cases_path: Path) -> list[Case]:
-    data = json.loads(cases_path.read_text(encoding="utf-8"))
+    return _cases_from_payload(json.loads(cases_path.read_text(encoding="utf-8")))
+
+
+def _cases_from_payload(data: dict) -> list[Case]:
     cases: list[Case] = []
     for raw in data.get("cases", []):
         cases.append(
@@ -100,24 +686,7 @@ def _load_cases(cases_path: Path) -> list[Case]:
     return cases
 
 
-def _extract_json(text: str) -> dict:
-    text = text.strip()
-    if text.startswith("```"):
-        match = re.search(r"```(?:json)?\s*(\{.*?\})\s*```", text, flags=re.DOTALL | re.IGNORECASE)
-        if match:
-            text = match.group(1).strip()
-    try:
-        return json.loads(text)
-    except Exception:
-        match = re.search(r"(\{.*\})", text, flags=re.DOTALL)
-        if not match:
-            raise
-        return json.loads(match.group(1))
-
-
-def _codex_select(*, prompt: str, candidates: list[Skill], timeout_s: int) -> list[str]:
-    skills_block = "\n".join([f"- {s.name}: {s.description}" for s in candidates])
-    router_prompt = f"""You are a skill router.
+ROUTER_PROMPT_TEMPLATE = """You are a skill router.
 Given a user request and a list of available skills (name + description), choose which skill(s) should be invoked.
 
 Rules:
@@ -136,74 +705,484 @@ Return JSON:
 {{"skills": ["skill-name", "..."]}}
 """
 
-    tmp_path: str | None = None
-    try:
-        with tempfile.NamedTemporaryFile(prefix="codex_skill_router_", suffix=".json", delete=False) as fh:
-            tmp_path = fh.name
-
-        proc = subprocess.run(
-            [
-                "codex",
-                "exec",
-                "--skip-git-repo-check",
-                "--sandbox",
-                "read-only",
-                "--output-last-message",
-                tmp_path,
-                "-",
-            ],
-            input=router_prompt.encode("utf-8"),
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            timeout=timeout_s,
-        )
-        if proc.returncode != 0:
-            raise RuntimeError(proc.stderr.decode("utf-8", errors="replace"))
 
-        raw = Path(tmp_path).read_text(encoding="utf-8", errors="replace")
-        payload = _extract_json(raw)
-        skills = payload.get("skills", [])
-        if not isinstance(skills, list):
-            return []
-        return [str(s).strip() for s in skills if str(s).strip()]
-    finally:
-        if tmp_path:
-            Path(tmp_path).unlink(missing_ok=True)
+def build_router_prompt(prompt: str, candidates: list[Skill], *, short: set[str] | None = None) -> str:
+    """Router prompt over candidates; skills named in `short` are listed with their short_description."""
+    lines = []
+    for s in candidates:
+        text = s.short_description if short and s.name in short and s.short_description else s.description
+        lines.append(f"- {s.name}: {text}")
+    return ROUTER_PROMPT_TEMPLATE.format(skills_block="\n".join(lines), prompt=prompt)
+
+
+def select_candidates(
+    prompt: str,
+    ranked: list[tuple[int, float]],
+    skills: list[Skill],
+    *,
+    max_candidates: int,
+    min_candidates: int = 2,
+    min_relative_score: float = 0.0,
+    min_gap_ratio: float = 0.0,
+    char_budget: int = 0,
+) -> tuple[list[Skill], str]:
+    """
+    Adaptive router candidates from a BM25 ranking; returns (candidates, router_prompt).
+
+    The list is cut where a score falls below min_relative_score * top score, or below
+    min_gap_ratio * the previous score (a clear gap), but never below min_candidates. With a
+    char_budget, long descriptions fall back to short_description, and candidates that still do not
+    fit are dropped (the first candidate is always kept).
+    """
+
+    ranked = ranked[:max_candidates]
+    top_score = ranked[0][1] if ranked else 0.0
+    kept: list[int] = []
+    for pos, (idx, score) in enumerate(ranked):
+        if pos >= min_candidates:
+            if score <= 0.0 or score < min_relative_score * top_score:
+                break
+            if min_gap_ratio and score < min_gap_ratio * ranked[pos - 1][1]:
+                break
+        kept.append(idx)
+
+    candidates: list[Skill] = []
+    short: set[str] = set()
+    for idx in kept:
+        skill = skills[idx]
+        candidates.append(skill)
+        if not char_budget or len(build_router_prompt(prompt, candidates, short=short)) <= char_budget:
+            continue
+        if skill.short_description:
+            short.add(skill.name)
+            if len(build_router_prompt(prompt, candidates, short=short)) <= char_budget:
+                continue
+        if len(candidates) > 1:
+            candidates.pop()
+            short.discard(skill.name)
+            break
+    return candidates, build_router_prompt(prompt, candidates, short=short)
+
+
+@dataclass(frozen=True)
+class CascadeThresholds:
+    """
+    BM25 stage of the routing cascade: abstain (route to no skill) when the top score is <= `abstain`,
+    accept the top skill when its relative margin over the runner-up is >= `margin`; anything else
+    escalates. None disables that rule.
+    """
+
+    margin: float | None = None
+    abstain: float | None = None
+
+
+def score_margin(ranked: list[tuple[int, float]]) -> tuple[float, float]:
+    """(top score, relative margin of the top score over the runner-up) for a BM25 ranking."""
+    top = ranked[0][1] if ranked else 0.0
+    second = ranked[1][1] if len(ranked) > 1 else 0.0
+    return top, ((top - second) / top) if top > 0 else 0.0
 
 
-def main() -> int:
+def _calibrate_cut(samples: list[tuple[float, bool]], *, target_precision: float) -> float | None:
+    """
+    Given (value, correct-if-decided) pairs ordered most-confident first, the least confident value
+    such that deciding every sample up to it keeps precision >= target_precision. Ties are decided
+    together, so cuts fall only between distinct values.
+    """
+
+    best: float | None = None
+    correct = 0
+    for pos, (value, ok) in enumerate(samples):
+        correct += 1 if ok else 0
+        if pos + 1 < len(samples) and samples[pos + 1][0] == value:
+            continue
+        if correct / (pos + 1) >= target_precision:
+            best = value
+    return best
+
+
+def calibrate_cascade(
+    samples: list[tuple[list[tuple[int, float]], set[str]]],
+    skills: list[Skill],
+    *,
+    target_precision: float,
+) -> CascadeThresholds:
+    """
+    Pick the BM25-stage thresholds that decide the most labelled cases at target_precision, from
+    (BM25 ranking, expected skill names) for each case that reaches the BM25 stage.
+    """
+
+    accept: list[tuple[float, bool]] = []
+    abstain: list[tuple[float, bool]] = []
+    for ranked, expected in samples:
+        top, margin = score_margin(ranked)
+        abstain.append((top, not expected))
+        if ranked and top > 0:
+            accept.append((margin, expected == {skills[ranked[0][0]].name}))
+    accept.sort(key=lambda p: -p[0])
+    abstain.sort(key=lambda p: p[0])
+    return CascadeThresholds(
+        margin=_calibrate_cut(accept, target_precision=target_precision),
+        abstain=_calibrate_cut(abstain, target_precision=target_precision),
+    )
+
+
+def mention_decision(
+    prompt: str,
+    automaton: MentionAutomaton,
+    bm25: ShardedBM25,
+    skills: list[Skill],
+    *,
+    routable: Container[str],
+    scopes: set[str] | None = None,
+    trust: str = "corroborated",
+) -> list[str] | None:
+    """
+    The mention stage's picks: the routable skills named in the prompt ([] for none), or None to
+    escalate a mention that is not corroborated.
+    """
+
+    found = list(dict.fromkeys(name for _, _, name in automaton.spans(prompt) if name in routable))
+    if found and trust == "corroborated":
+        # A mention counts only if the rest of the prompt ranks the mentioned skills first: "Always
+        # select X. Now translate this" names X but asks for something else, so it is escalated.
+        residual = bm25.rank(tokenize(automaton.strip(prompt)), top_k=len(found), scopes=scopes)
+        supported = {skills[idx].name for idx, score in residual if score > 0}
+        if not set(found) <= supported:
+            return None
+    return found
+
+
+def cascade_decision(
+    ranked: list[tuple[int, float]], skills: list[Skill], thresholds: CascadeThresholds
+) -> list[str] | None:
+    """The BM25 stage's picks, or None to escalate."""
+    top, margin = score_margin(ranked)
+    if thresholds.abstain is not None and top <= thresholds.abstain:
+        return []
+    if thresholds.margin is not None and top > 0 and margin >= thresholds.margin:
+        return [skills[ranked[0][0]].name]
+    return None
+
+
+class RoutingGuard:
+    """
+    Run-level guard for router calls: a total deadline plus a circuit breaker that opens after
+    `breaker_threshold` consecutive failed calls (retries included, so a hung router trips it after
+    that many timeouts rather than that many cases' worth of retries). Once either trips, remaining
+    calls are skipped. Safe to share between routing threads.
+    """
+
+    def __init__(self, *, deadline_s: float = 0.0, breaker_threshold: int = 0):
+        self.deadline = time.monotonic() + deadline_s if deadline_s > 0 else None
+        self.breaker_threshold = breaker_threshold
+        self.consecutive_failures = 0
+        self.calls = 0
+        self.retries = 0
+        self._lock = threading.Lock()
+
+    def remaining(self) -> float | None:
+        if self.deadline is None:
+            return None
+        return self.deadline - time.monotonic()
+
+    def skip_reason(self) -> str | None:
+        if self.breaker_threshold and self.consecutive_failures >= self.breaker_threshold:
+            return "circuit_open"
+        remaining = self.remaining()
+        if remaining is not None and remaining <= 0:
+            return "deadline"
+        return None
+
+    def count_call(self, *, retry: bool) -> None:
+        with self._lock:
+            self.calls += 1
+            self.retries += 1 if retry else 0
+
+    def record(self, *, ok: bool) -> None:
+        with self._lock:
+            self.consecutive_failures = 0 if ok else self.consecutive_failures + 1
+
+
+class RoutingSkipped(Exception):
+    def __init__(self, reason: str):
+        super().__init__(reason)
+        self.reason = reason
+
+
+def route_with_retries(
+    route: Callable[[float], list[str]],
+    *,
+    guard: RoutingGuard,
+    timeout_s: float,
+    retries: int,
+    backoff_s: float,
+) -> list[str]:
+    """
+    Call route(timeout_s) with retries on TransientRouterError, full-jitter exponential backoff, and
+    per-attempt timeouts clipped to the run deadline.
+    Raises RoutingSkipped if the guard forbids the call; the last error once retries are exhausted.
+    """
+
+    attempt = 0
+    while True:
+        reason = guard.skip_reason()
+        if reason:
+            raise RoutingSkipped(reason)
+        remaining = guard.remaining()
+        attempt_timeout = timeout_s if remaining is None else min(timeout_s, remaining)
+        attempt += 1
+        guard.count_call(retry=attempt > 1)
+        try:
+            picks = route(attempt_timeout)
+        except TransientRouterError:
+            guard.record(ok=False)
+            if attempt > retries:
+                raise
+            delay = random.uniform(0, backoff_s * (2 ** (attempt - 1)))
+            remaining = guard.remaining()
+            if remaining is not None and delay >= remaining:
+                raise
+            time.sleep(delay)
+            continue
+        except Exception:
+            guard.record(ok=False)
+            raise
+        guard.record(ok=True)
+        return picks
+
+
+def main(argv: list[str] | None = None) -> int:
     parser = argparse.ArgumentParser(
         description="Evaluate skill discoverability with a prompt suite (BM25 baseline and optional Codex routing)."
     )
-    parser.add_argument("--skills", required=True, help="Path to skills_index.json (from scripts/index_skills.py).")
+    parser.add_argument(
+        "--skills",
+        required=True,
+        help="Path to skills_index.json or a binary catalog (from scripts/index_skills.py).",
+    )
     parser.add_argument("--cases", required=True, help="Path to cases JSON (see datasets/trigger_cases.example.json).")
     parser.add_argument("--top-k", type=int, default=5, help="Top-k for BM25 hit/recall metrics (default: 5).")
     parser.add_argument("--bm25-candidates", type=int, default=20, help="Top-N BM25 skills to pass to Codex (default: 20).")
+    parser.add_argument(
+        "--scopes",
+        default="",
+        help="Comma-separated scopes to route over, e.g. 'curated,custom' (default: all scopes).",
+    )
+    parser.add_argument(
+        "--per-shard-idf",
+        action="store_true",
+        help="Score each scope shard with its own IDF/avgdl instead of collection-wide statistics "
+        "(scores from different shards are then not comparable).",
+    )
+    parser.add_argument(
+        "--bm25f",
+        action="store_true",
+        help="Score name, description and short_description as separate BM25F fields (see --field-boosts).",
+    )
+    parser.add_argument(
+        "--field-boosts",
+        default="",
+        help="BM25F field boosts, e.g. 'name=3,description=1,short_description=0.5' (implies --bm25f; "
+        "unlisted fields keep these defaults).",
+    )
+    parser.add_argument(
+        "--fuzzy",
+        action="store_true",
+        help="Expand out-of-vocabulary prompt terms to near-miss vocabulary terms (typos, variant spellings).",
+    )
+    parser.add_argument("--fuzzy-max-edits", type=int, default=2, help="Max edit distance for --fuzzy (default: 2).")
+    parser.add_argument(
+        "--fuzzy-weight",
+        type=float,
+        default=0.5,
+        help="Weight of a fuzzy expansion per edit, applied as weight**distance (default: 0.5).",
+    )
+    parser.add_argument(
+        "--body-weight",
+        type=float,
+        default=0.0,
+        help="Add this times the best SKILL.md section score (needs index_skills.py --index-body; default: 0 = off).",
+    )
     parser.add_argument("--use-codex", action="store_true", help="Also run Codex as a skill-router over top-N candidates.")
+    parser.add_argument(
+        "--router",
+        choices=BACKENDS,
+        default="codex",
+        help="Router backend for --use-codex: the codex CLI, in-process BM25 top-1, or a local stub server "
+        "replaying recorded decisions (see scripts/router_backends.py; default: codex).",
+    )
+    parser.add_argument("--router-url", default="", help="Stub router: URL of a running stub server (default: start one).")
+    parser.add_argument(
+        "--stub-decisions",
+        default="",
+        help="Stub router: results JSON to replay, or a cases JSON for an oracle (default: --cases).",
+    )
+    parser.add_argument("--stub-latency-ms", type=float, default=0.0, help="Stub router: base latency (default: 0).")
+    parser.add_argument("--stub-jitter-ms", type=float, default=0.0, help="Stub router: random extra latency (default: 0).")
+    parser.add_argument("--stub-error-rate", type=float, default=0.0, help="Stub router: 503 rate (default: 0).")
+    parser.add_argument("--stub-seed", type=int, default=0, help="Stub router: latency/error seed (default: 0).")
     parser.add_argument("--timeout", type=int, default=120, help="Timeout seconds per Codex routing call (default: 120).")
+    parser.add_argument(
+        "--deadline",
+        type=float,
+        default=0.0,
+        help="Total seconds for all Codex routing calls; remaining cases are skipped after it (default: 0 = none).",
+    )
+    parser.add_argument("--retries", type=int, default=2, help="Retries per case on timeouts/non-zero exits (default: 2).")
+    parser.add_argument(
+        "--retry-backoff",
+        type=float,
+        default=1.0,
+        help="Base seconds for jittered exponential backoff between retries (default: 1.0).",
+    )
+    parser.add_argument(
+        "--breaker-threshold",
+        type=int,
+        default=5,
+        help="Skip remaining Codex cases after this many consecutive failed calls, retries included "
+        "(default: 5; 0 = off).",
+    )
+    parser.add_argument(
+        "--router-concurrency",
+        type=int,
+        default=1,
+        help="Route this many escalated cases at once; all share --deadline and the breaker (default: 1).",
+    )
+    parser.add_argument(
+        "--adaptive-candidates",
+        action="store_true",
+        help="Prune Codex candidates at BM25 score gaps/relative thresholds and enforce --prompt-char-budget.",
+    )
+    parser.add_argument("--candidate-min", type=int, default=2, help="Adaptive: always keep this many (default: 2).")
+    parser.add_argument(
+        "--candidate-rel-score",
+        type=float,
+        default=0.25,
+        help="Adaptive: drop candidates scoring below this fraction of the top score (default: 0.25).",
+    )
+    parser.add_argument(
+        "--candidate-gap-ratio",
+        type=float,
+        default=0.5,
+        help="Adaptive: cut where a score falls below this fraction of the previous one (default: 0.5).",
+    )
+    parser.add_argument(
+        "--prompt-char-budget",
+        type=int,
+        default=6000,
+        help="Adaptive: max router prompt characters, ~4 chars per token (default: 6000; 0 = unlimited).",
+    )
+    parser.add_argument(
+        "--cascade",
+        action="store_true",
+        help="Route explicit skill mentions and confident BM25 cases directly; escalate only the rest to Codex.",
+    )
+    parser.add_argument(
+        "--cascade-margin",
+        type=float,
+        default=None,
+        help="Cascade: accept BM25 top-1 at this relative margin over top-2 (default: calibrated on the suite).",
+    )
+    parser.add_argument(
+        "--cascade-abstain",
+        type=float,
+        default=None,
+        help="Cascade: route to no skill when the top BM25 score is <= this (default: calibrated on the suite).",
+    )
+    parser.add_argument(
+        "--mention-trust",
+        choices=["corroborated", "always"],
+        default="corroborated",
+        help="Cascade: route a named skill only when the rest of the prompt also ranks it first, or always "
+        "(default: corroborated).",
+    )
+    parser.add_argument(
+        "--cascade-target-precision",
+        type=float,
+        default=0.95,
+        help="Cascade: calibrate thresholds to keep BM25-stage decisions at this precision (default: 0.95).",
+    )
     parser.add_argument("--out", default="trigger_eval_results.json", help="Output JSON path.")
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
 
     skills_path = Path(args.skills).expanduser().resolve()
     cases_path = Path(args.cases).expanduser().resolve()
     out_path = Path(args.out).expanduser().resolve()
 
-    skills = _load_skills(skills_path)
+    scopes = _parse_scopes(args.scopes)
+    index_payload = read_index_payload(skills_path)
+    skills = _skills_from_payload(index_payload)
     cases = _load_cases(cases_path)
     if not skills:
         raise SystemExit("No skills loaded. Check --skills path.")
     if not cases:
         raise SystemExit("No cases loaded. Check --cases path.")
 
-    docs = [tokenize(f"{s.name}\n{s.description}") for s in skills]
-    bm25 = BM25(docs)
+    field_boosts = parse_field_boosts(args.field_boosts) if args.bm25f or args.field_boosts else None
+    docs = [skill_doc(s) for s in skills] if field_boosts is None else [skill_fields(s) for s in skills]
+    bm25 = ShardedBM25(docs, [s.scope for s in skills], global_idf=not args.per_shard_idf, field_boosts=field_boosts)
+    vocabulary = bm25.terms()
+    body = None
+    if args.body_weight > 0:
+        body = load_body_index(index_payload)
+        if body is None:
+            raise SystemExit("--body-weight needs an index built with index_skills.py --index-body.")
+        vocabulary = vocabulary | body.bm25.terms()
+    trigrams = TrigramIndex(vocabulary) if args.fuzzy else None
 
-    total = len(cases)
-    positive_total = 0
-    negative_total = 0
+    fuzzy_case_count = 0
+    prepared: list[tuple[Case, dict[str, float] | None, list[dict], list[tuple[int, float]], float]] = []
+    body_hits: list[dict[int, tuple[float, int]]] = []
+    for c in cases:
+        start = time.perf_counter()
+        query, weights, fuzzy_terms = build_query(
+            c.prompt,
+            vocabulary=vocabulary,
+            trigrams=trigrams,
+            max_edits=max(0, int(args.fuzzy_max_edits)),
+            weight=float(args.fuzzy_weight),
+        )
+        depth = max(args.top_k, args.bm25_candidates)
+        if body is not None:
+            ranked, best = rank_with_body(
+                bm25, body, query, skills, top_k=depth, body_weight=args.body_weight, weights=weights, scopes=scopes
+            )
+            body_hits.append(best)
+        else:
+            ranked = bm25.rank(query, top_k=depth, weights=weights, scopes=scopes)
+        prepared.append((c, weights, fuzzy_terms, ranked, time.perf_counter() - start))
 
-    hit_at_k = 0
-    recall_sum = 0.0
+    # Per case: explicitly mentioned skills, [] for none, None for an unsupported mention (escalated).
+    mentions: list[list[str] | None] = []
+    mention_s: list[float] = []
+    thresholds = CascadeThresholds()
+    if args.cascade:
+        routable = {s.name for s in skills if scopes is None or s.scope in scopes}
+        automaton = load_automaton(index_payload)
+        for c, *_ in prepared:
+            start = time.perf_counter()
+            mentions.append(
+                mention_decision(
+                    c.prompt, automaton, bm25, skills, routable=routable, scopes=scopes, trust=args.mention_trust
+                )
+            )
+            mention_s.append(time.perf_counter() - start)
+        thresholds = CascadeThresholds(margin=args.cascade_margin, abstain=args.cascade_abstain)
+        if thresholds.margin is None or thresholds.abstain is None:
+            calibrated = calibrate_cascade(
+                [(ranked, set(c.expected)) for (c, _, _, ranked, _), m in zip(prepared, mentions) if m == []],
+                skills,
+                target_precision=float(args.cascade_target_precision),
+            )
+            thresholds = CascadeThresholds(
+                margin=calibrated.margin if thresholds.margin is None else thresholds.margin,
+                abstain=calibrated.abstain if thresholds.abstain is None else thresholds.abstain,
+            )
+    codex_latencies_s: list[float] = []
+    stage_cases: dict[str, int] = {}
+    stage_exact: dict[str, int] = {}
+    fast_path_us: list[float] = []
 
     codex_positive_total = 0
     codex_negative_total = 0
@@ -213,24 +1192,28 @@ def main() -> int:
     codex_false_invoke = 0
     codex_exact_match = 0
     codex_error_count = 0
+    codex_prompt_chars: list[int] = []
+    codex_skipped: dict[str, int] = {}
+    guard = RoutingGuard(deadline_s=max(0.0, float(args.deadline)), breaker_threshold=max(0, int(args.breaker_threshold)))
+    router = None
+    if args.use_codex:
+        router = create_backend(
+            args.router,
+            url=args.router_url,
+            decisions_path=Path(args.stub_decisions).expanduser().resolve() if args.stub_decisions else cases_path,
+            latency_ms=max(0.0, float(args.stub_latency_ms)),
+            jitter_ms=max(0.0, float(args.stub_jitter_ms)),
+            error_rate=min(1.0, max(0.0, float(args.stub_error_rate))),
+            seed=int(args.stub_seed),
+        )
 
+    router_concurrency = max(1, int(args.router_concurrency))
+    escalated_cases: list[tuple[int, RouteRequest, str]] = []
     results: list[dict] = []
-    for c in cases:
-        query = tokenize(c.prompt)
-        ranked = bm25.rank(query, top_k=max(args.top_k, args.bm25_candidates))
+    for case_pos, (c, weights, fuzzy_terms, ranked, rank_s) in enumerate(prepared):
+        fuzzy_case_count += 1 if fuzzy_terms else 0
         expected_set = {e for e in c.expected}
-
         bm25_top_k = [skills[idx].name for idx, _ in ranked[: args.top_k]]
-        got_set = set(bm25_top_k)
-
-        if expected_set:
-            positive_total += 1
-            hit = bool(expected_set & got_set)
-            recall = len(expected_set & got_set) / len(expected_set)
-            hit_at_k += 1 if hit else 0
-            recall_sum += recall
-        else:
-            negative_total += 1
 
         item: dict = {
             "id": c.id,
@@ -238,61 +1221,178 @@ def main() -> int:
             "expected": c.expected,
             "bm25_top_k": bm25_top_k,
         }
+        if fuzzy_terms:
+            item["fuzzy_terms"] = fuzzy_terms
+        if body is not None:
+            # Section text is read from disk only here, for the reported top-k.
+            item["body_hits"] = [
+                {
+                    "skill": skills[idx].name,
+                    "heading": body.chunks[body_hits[case_pos][idx][1]].heading,
+                    "score": args.body_weight * body_hits[case_pos][idx][0],
+                    "excerpt": " ".join(body.text(body_hits[case_pos][idx][1]).split())[:200],
+                }
+                for idx, _ in ranked[: args.top_k]
+                if idx in body_hits[case_pos]
+            ]
 
-        if args.use_codex:
-            cand = [skills[idx] for idx, _ in ranked[: args.bm25_candidates]]
-            try:
-                codex_picks = _codex_select(prompt=c.prompt, candidates=cand, timeout_s=max(1, int(args.timeout)))
-                seen: set[str] = set()
-                deduped: list[str] = []
-                for s in codex_picks:
-                    if s in seen:
-                        continue
-                    seen.add(s)
-                    deduped.append(s)
-                codex_picks = deduped
-            except Exception as e:
-                codex_picks = []
-                item["codex_error"] = str(e)
-                codex_error_count += 1
-            item["codex_top_n"] = [s.name for s in cand]
-            item["codex_picks"] = codex_picks
-
-            codex_set = set(codex_picks)
-            if expected_set:
-                codex_positive_total += 1
-                inter = expected_set & codex_set
-                codex_hit += 1 if inter else 0
-                codex_recall_sum += len(inter) / len(expected_set)
-                codex_precision_sum += (len(inter) / len(codex_set)) if codex_set else 0.0
-                codex_exact_match += 1 if codex_set == expected_set else 0
+        escalate = True
+        if args.cascade:
+            start = time.perf_counter()
+            stage, picks = "mention", mentions[case_pos]
+            if picks == []:
+                stage, picks = "bm25", cascade_decision(ranked, skills, thresholds)
+            if picks is not None:
+                fast_path_us.append((rank_s + mention_s[case_pos] + time.perf_counter() - start) * 1e6)
+                escalate = False
+                item["route_stage"] = stage
+                item["route_picks"] = picks
+                stage_cases[stage] = stage_cases.get(stage, 0) + 1
+                stage_exact[stage] = stage_exact.get(stage, 0) + (1 if set(picks) == expected_set else 0)
             else:
-                codex_negative_total += 1
-                codex_false_invoke += 1 if codex_set else 0
-                codex_exact_match += 1 if not codex_set else 0
+                item["route_stage"] = "codex" if args.use_codex else "escalated"
+                if not args.use_codex:
+                    stage_cases["escalated"] = stage_cases.get("escalated", 0) + 1
+
+        if args.use_codex and escalate:
+            if args.adaptive_candidates:
+                cand, router_prompt = select_candidates(
+                    c.prompt,
+                    ranked,
+                    skills,
+                    max_candidates=args.bm25_candidates,
+                    min_candidates=max(1, int(args.candidate_min)),
+                    min_relative_score=float(args.candidate_rel_score),
+                    min_gap_ratio=float(args.candidate_gap_ratio),
+                    char_budget=max(0, int(args.prompt_char_budget)),
+                )
+            else:
+                cand = [skills[idx] for idx, _ in ranked[: args.bm25_candidates]]
+                router_prompt = build_router_prompt(c.prompt, cand)
+            item["codex_top_n"] = [s.name for s in cand]
+            scores = {skills[idx].name: score for idx, score in ranked}
+            request = RouteRequest(
+                case_id=c.id,
+                prompt=c.prompt,
+                router_prompt=router_prompt,
+                candidates=[s.name for s in cand],
+                scores=[scores.get(s.name, 0.0) for s in cand],
+            )
+            escalated_cases.append((len(results), request, router_prompt))
 
         results.append(item)
 
-    summary = {
-        "cases_total": total,
-        "cases_positive": positive_total,
-        "cases_negative": negative_total,
-        "bm25_hit_at_k": (hit_at_k / positive_total) if positive_total else 0.0,
-        "bm25_recall_at_k": (recall_sum / positive_total) if positive_total else 0.0,
-        "top_k": args.top_k,
-    }
+    def route_case(request: RouteRequest) -> tuple[list[str], str | None, str | None, float]:
+        """(picks, error, skip reason, latency) for one escalated case."""
+        start = time.perf_counter()
+        try:
+            picks = route_with_retries(
+                lambda timeout_s: router.select(request, timeout_s=timeout_s),
+                guard=guard,
+                timeout_s=max(1, int(args.timeout)),
+                retries=max(0, int(args.retries)),
+                backoff_s=max(0.0, float(args.retry_backoff)),
+            )
+        except RoutingSkipped as e:
+            return [], None, e.reason, 0.0
+        except Exception as e:
+            return [], str(e), None, time.perf_counter() - start
+        return list(dict.fromkeys(picks)), None, None, time.perf_counter() - start
+
+    # Escalated cases are routed concurrently under the shared guard, then scored in case order.
+    if escalated_cases:
+        with ThreadPoolExecutor(max_workers=router_concurrency) as pool:
+            outcomes = list(pool.map(route_case, [request for _, request, _ in escalated_cases]))
+    else:
+        outcomes = []
+    for (result_pos, request, router_prompt), (codex_picks, error, skip_reason, latency_s) in zip(
+        escalated_cases, outcomes
+    ):
+        item = results[result_pos]
+        if skip_reason:
+            # Skipped cases are reported separately and left out of every codex_* rate.
+            item["codex_skipped"] = skip_reason
+            codex_skipped[skip_reason] = codex_skipped.get(skip_reason, 0) + 1
+            continue
+        if error is not None:
+            item["codex_error"] = error
+            codex_error_count += 1
+        codex_latencies_s.append(latency_s)
+        item["codex_prompt_chars"] = len(router_prompt)
+        codex_prompt_chars.append(len(router_prompt))
+        item["codex_picks"] = codex_picks
+        expected_set = set(item["expected"])
+        if args.cascade:
+            item["route_picks"] = codex_picks
+            stage_cases["codex"] = stage_cases.get("codex", 0) + 1
+            stage_exact["codex"] = stage_exact.get("codex", 0) + (1 if set(codex_picks) == expected_set else 0)
+
+        codex_set = set(codex_picks)
+        if expected_set:
+            codex_positive_total += 1
+            inter = expected_set & codex_set
+            codex_hit += 1 if inter else 0
+            codex_recall_sum += len(inter) / len(expected_set)
+            codex_precision_sum += (len(inter) / len(codex_set)) if codex_set else 0.0
+            codex_exact_match += 1 if codex_set == expected_set else 0
+        else:
+            codex_negative_total += 1
+            codex_false_invoke += 1 if codex_set else 0
+            codex_exact_match += 1 if not codex_set else 0
+    if router is not None:
+        router.close()
+
+    summary = summarize_bm25(results, top_k=args.top_k)
+    bm25_ms = [rank_s * 1000 for *_, rank_s in prepared]
+    summary["bm25_latency_ms_p50"] = percentile(bm25_ms, 0.5)
+    summary["bm25_latency_ms_p95"] = percentile(bm25_ms, 0.95)
+    if scopes is not None:
+        summary["scopes"] = sorted(scopes)
+    if args.fuzzy:
+        summary["fuzzy_expanded_cases"] = fuzzy_case_count
+    if field_boosts is not None:
+        summary["field_boosts"] = dict(zip(FIELDS, field_boosts))
 
     if args.use_codex:
+        codex_routed = codex_positive_total + codex_negative_total
         summary.update(
             {
+                "router": args.router,
                 "codex_cases_positive": codex_positive_total,
                 "codex_cases_negative": codex_negative_total,
                 "codex_hit_rate": (codex_hit / codex_positive_total) if codex_positive_total else 0.0,
                 "codex_macro_recall": (codex_recall_sum / codex_positive_total) if codex_positive_total else 0.0,
                 "codex_macro_precision": (codex_precision_sum / codex_positive_total) if codex_positive_total else 0.0,
                 "codex_false_invoke_rate": (codex_false_invoke / codex_negative_total) if codex_negative_total else 0.0,
-                "codex_exact_match_rate": (codex_exact_match / total) if total else 0.0,
+                "codex_exact_match_rate": (codex_exact_match / codex_routed) if codex_routed else 0.0,
                 "codex_errors": codex_error_count,
+                "codex_retries": guard.retries,
+                "router_concurrency": router_concurrency,
+                "codex_skipped": sum(codex_skipped.values()),
+                "codex_skipped_reasons": codex_skipped,
+                "codex_prompt_chars_mean": (sum(codex_prompt_chars) / len(codex_prompt_chars)) if codex_prompt_chars else 0.0,
+                "codex_prompt_chars_max": max(codex_prompt_chars, default=0),
+                "codex_latency_s_p50": percentile(codex_latencies_s, 0.5),
+                "codex_latency_s_p95": percentile(codex_latencies_s, 0.95),
+                "codex_wall_s": sum(codex_latencies_s),
+            }
+        )
+
+    if args.cascade:
+        decided = sum(n for stage, n in stage_cases.items() if stage != "escalated")
+        escalated = stage_cases.get("codex", 0) + stage_cases.get("escalated", 0) + sum(codex_skipped.values())
+        fast_path_us.sort()
+        summary.update(
+            {
+                "cascade_thresholds": {"margin": thresholds.margin, "abstain": thresholds.abstain},
+                "cascade_cases_by_stage": stage_cases,
+                "cascade_escalation_rate": escalated / len(cases),
+                "cascade_stage_accuracy": {
+                    stage: stage_exact.get(stage, 0) / n for stage, n in stage_cases.items() if stage != "escalated"
+                },
+                "cascade_exact_match_rate": (sum(stage_exact.values()) / decided) if decided else 0.0,
+                "cascade_fast_path_us_p50": fast_path_us[len(fast_path_us) // 2] if fast_path_us else 0.0,
+                "cascade_fast_path_us_max": fast_path_us[-1] if fast_path_us else 0.0,
             }
         )
 
@@ -3,8 +3,11 @@ from __future__ import annotations
 
 import argparse
 import re
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from pathlib import Path
+from pathlib import Path, PurePosixPath
+from typing import Iterable
 
 MAX_SKILL_NAME_LENGTH = 64
 MAX_DESCRIPTION_LENGTH = 1024
@@ -107,33 +110,30 @@ def _parse_frontmatter_minimal(frontmatter: str) -> dict[str, str]:
     return result
 
 
-def _iter_skill_files(skill_dir: Path) -> list[Path]:
-    files: list[Path] = []
+def _iter_skill_files(skill_dir: Path) -> list[PurePosixPath]:
+    files: list[PurePosixPath] = []
     for path in skill_dir.rglob("*"):
         if path.is_dir():
             continue
         if path.name in IGNORED_FILE_NAMES:
             continue
-        files.append(path)
+        files.append(PurePosixPath(path.relative_to(skill_dir).as_posix()))
     return files
 
 
-def validate_skill(skill_dir: Path) -> ValidationResult:
-    skill_dir = skill_dir.expanduser().resolve()
+def validate_skill_content(content: str | None, *, dir_name: str, files: Iterable[PurePosixPath]) -> ValidationResult:
+    """
+    Checks shared by directories and archives: `content` is the SKILL.md text (None when missing),
+    `dir_name` the skill directory's name and `files` every file path relative to it.
+    """
+
     errors: list[str] = []
     warnings: list[str] = []
 
-    if not skill_dir.exists():
-        return ValidationResult(ok=False, errors=[f"Skill path not found: {skill_dir}"], warnings=[])
-    if not skill_dir.is_dir():
-        return ValidationResult(ok=False, errors=[f"Skill path is not a directory: {skill_dir}"], warnings=[])
-
-    skill_md = skill_dir / "SKILL.md"
-    if not skill_md.is_file():
+    if content is None:
         errors.append("Missing SKILL.md")
         return ValidationResult(ok=False, errors=errors, warnings=warnings)
 
-    content = skill_md.read_text(encoding="utf-8", errors="replace")
     if not content.startswith(FRONTMATTER_BOUNDARY):
         errors.append("SKILL.md must start with YAML frontmatter (---)")
         return ValidationResult(ok=False, errors=errors, warnings=warnings)
@@ -158,8 +158,8 @@ def validate_skill(skill_dir: Path) -> ValidationResult:
         if len(name) > MAX_SKILL_NAME_LENGTH:
             errors.append(f"Frontmatter 'name' too long ({len(name)} > {MAX_SKILL_NAME_LENGTH})")
 
-        if skill_dir.name != name:
-            warnings.append(f"Skill directory name '{skill_dir.name}' differs from frontmatter name '{name}'")
+        if dir_name != name:
+            warnings.append(f"Skill directory name '{dir_name}' differs from frontmatter name '{name}'")
 
     if description:
         if len(description) > MAX_DESCRIPTION_LENGTH:
@@ -173,31 +173,101 @@ def validate_skill(skill_dir: Path) -> ValidationResult:
     if line_count > RECOMMENDED_MAX_SKILL_MD_LINES:
         warnings.append(f"SKILL.md is long ({line_count} lines); consider moving details into references/ to save context")
 
-    for file_path in _iter_skill_files(skill_dir):
-        if file_path.name in DISALLOWED_DOC_FILENAMES:
-            errors.append(f"Disallowed doc file found: {file_path.relative_to(skill_dir)} (keep skills minimal; no extra docs)")
-        if file_path.name.endswith(".pyc") or "__pycache__" in file_path.parts:
-            warnings.append(f"Generated Python artifact found under skill: {file_path.relative_to(skill_dir)}")
+    for relpath in files:
+        if relpath.name in DISALLOWED_DOC_FILENAMES:
+            errors.append(f"Disallowed doc file found: {relpath} (keep skills minimal; no extra docs)")
+        if relpath.name.endswith(".pyc") or "__pycache__" in relpath.parts:
+            warnings.append(f"Generated Python artifact found under skill: {relpath}")
 
     ok = not errors
     return ValidationResult(ok=ok, errors=errors, warnings=warnings)
 
 
-def main() -> int:
+def validate_skill(skill_dir: Path) -> ValidationResult:
+    skill_dir = skill_dir.expanduser().resolve()
+
+    if not skill_dir.exists():
+        return ValidationResult(ok=False, errors=[f"Skill path not found: {skill_dir}"], warnings=[])
+    if not skill_dir.is_dir():
+        return ValidationResult(ok=False, errors=[f"Skill path is not a directory: {skill_dir}"], warnings=[])
+
+    skill_md = skill_dir / "SKILL.md"
+    content = skill_md.read_text(encoding="utf-8", errors="replace") if skill_md.is_file() else None
+    files = _iter_skill_files(skill_dir) if content is not None else []
+    return validate_skill_content(content, dir_name=skill_dir.name, files=files)
+
+
+def read_archive_skill(zipf: zipfile.ZipFile) -> tuple[str, list[PurePosixPath], str | None]:
+    """
+    (top-level directory, file paths relative to it, SKILL.md text or None) of a .skill archive. File
+    paths come from the central directory; SKILL.md is the only member decompressed.
+    """
+
+    tops: set[str] = set()
+    files: list[PurePosixPath] = []
+    for info in zipf.infolist():
+        rel = PurePosixPath(info.filename)
+        if not rel.parts:
+            continue
+        tops.add(rel.parts[0])
+        if not info.is_dir() and len(rel.parts) > 1 and rel.name not in IGNORED_FILE_NAMES:
+            files.append(PurePosixPath(*rel.parts[1:]))
+    if len(tops) != 1:
+        raise ValueError(f"expected one top-level skill directory, found {sorted(tops)}")
+    top = tops.pop()
+    try:
+        content = zipf.read(f"{top}/SKILL.md").decode("utf-8", errors="replace")
+    except KeyError:
+        content = None
+    return top, files, content
+
+
+def validate_archive(archive: Path) -> ValidationResult:
+    """validate_skill for a packaged .skill file, without extracting it."""
+    try:
+        with zipfile.ZipFile(archive.expanduser()) as zipf:
+            top, files, content = read_archive_skill(zipf)
+    except (OSError, zipfile.BadZipFile, ValueError) as exc:
+        return ValidationResult(ok=False, errors=[f"Unreadable skill archive {archive}: {exc}"], warnings=[])
+    return validate_skill_content(content, dir_name=top, files=files)
+
+
+def validate_path(path: Path) -> ValidationResult:
+    return validate_archive(path) if path.suffix == ".skill" and path.is_file() else validate_skill(path)
+
+
+def main(argv: list[str] | None = None) -> int:
     parser = argparse.ArgumentParser(description="Validate a skill folder (minimal checks; no external deps).")
-    parser.add_argument("skill_dir", help="Path to the skill directory (contains SKILL.md)")
-    args = parser.parse_args()
-
-    result = validate_skill(Path(args.skill_dir))
-    for warning in result.warnings:
-        print(f"[WARN] {warning}")
-    if not result.ok:
-        print("[ERROR] Skill validation failed:")
-        for error in result.errors:
-            print(f"- {error}")
-        return 1
-    print("[OK] Skill is valid")
-    return 0
+    parser.add_argument(
+        "skill_dir",
+        nargs="+",
+        help="Skill directories (containing SKILL.md) or packaged .skill files; a directory of .skill files "
+        "validates each of them.",
+    )
+    parser.add_argument("--jobs", type=int, default=0, help="Parallel validations (default: auto).")
+    args = parser.parse_args(argv)
+
+    paths: list[Path] = []
+    for raw in args.skill_dir:
+        path = Path(raw).expanduser()
+        archives = sorted(path.rglob("*.skill")) if path.is_dir() and not (path / "SKILL.md").is_file() else []
+        paths.extend(archives or [path])
+    with ThreadPoolExecutor(max_workers=args.jobs or None) as pool:
+        results = list(pool.map(validate_path, paths))
+
+    failed = 0
+    for path, result in zip(paths, results):
+        prefix = f"{path}: " if len(paths) > 1 else ""
+        for warning in result.warnings:
+            print(f"[WARN] {prefix}{warning}")
+        if not result.ok:
+            failed += 1
+            print(f"[ERROR] {prefix}Skill validation failed:")
+            for error in result.errors:
+                print(f"- {error}")
+            continue
+        print(f"[OK] {prefix}Skill is valid")
+    return 1 if failed else 0
 
 
 if __name__ == "__main__":
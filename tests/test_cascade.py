@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "scripts"))
+
+from trigger_eval import CascadeThresholds, Skill, calibrate_cascade, cascade_decision  # noqa: E402
+
+SKILLS = [Skill("alpha", "a"), Skill("beta", "b"), Skill("gamma", "c")]
+
+# (BM25 ranking, expected) with margins 0.9, 0.5, 0.3 (wrong top skill) and 0.2.
+ACCEPT_SAMPLES = [
+    ([(0, 10.0), (1, 1.0)], {"alpha"}),
+    ([(0, 10.0), (1, 5.0)], {"alpha"}),
+    ([(1, 10.0), (0, 7.0)], {"alpha"}),
+    ([(0, 10.0), (1, 8.0)], {"alpha"}),
+]
+
+# Top scores 0, 0.5, 1.5 (a real request) and 2.0.
+ABSTAIN_SAMPLES = [
+    ([], set()),
+    ([(0, 0.5)], set()),
+    ([(0, 1.5)], {"alpha"}),
+    ([(2, 2.0)], set()),
+]
+
+
+def _precision(samples, thresholds: CascadeThresholds) -> tuple[int, float]:
+    decided = [
+        (picks, expected)
+        for ranked, expected in samples
+        if (picks := cascade_decision(ranked, SKILLS, thresholds)) is not None
+    ]
+    correct = sum(1 for picks, expected in decided if set(picks) == expected)
+    return len(decided), correct / len(decided) if decided else 1.0
+
+
+class CalibrateCascadeTest(unittest.TestCase):
+    def test_margin_is_the_loosest_cut_meeting_the_target(self) -> None:
+        self.assertEqual(calibrate_cascade(ACCEPT_SAMPLES, SKILLS, target_precision=1.0).margin, 0.5)
+        self.assertEqual(calibrate_cascade(ACCEPT_SAMPLES, SKILLS, target_precision=0.75).margin, 0.2)
+
+    def test_abstain_is_the_loosest_cut_meeting_the_target(self) -> None:
+        self.assertEqual(calibrate_cascade(ABSTAIN_SAMPLES, SKILLS, target_precision=1.0).abstain, 0.5)
+        self.assertEqual(calibrate_cascade(ABSTAIN_SAMPLES, SKILLS, target_precision=0.75).abstain, 2.0)
+
+    def test_unreachable_target_disables_the_rule(self) -> None:
+        thresholds = calibrate_cascade(ACCEPT_SAMPLES, SKILLS, target_precision=1.0)
+        self.assertIsNone(thresholds.abstain)
+        self.assertEqual(calibrate_cascade([], SKILLS, target_precision=0.9), CascadeThresholds())
+
+    def test_ties_are_decided_together(self) -> None:
+        tied = [([(0, 10.0), (1, 5.0)], {"alpha"}), ([(1, 10.0), (0, 5.0)], {"alpha"})]
+        self.assertIsNone(calibrate_cascade(tied, SKILLS, target_precision=1.0).margin)
+        confident = [([(0, 10.0), (1, 4.0)], {"alpha"})]
+        self.assertEqual(calibrate_cascade(confident + tied, SKILLS, target_precision=1.0).margin, 0.6)
+
+    def test_calibrated_thresholds_meet_the_target_on_their_samples(self) -> None:
+        samples = ACCEPT_SAMPLES + ABSTAIN_SAMPLES
+        for target in (1.0, 0.9, 0.75, 0.5):
+            thresholds = calibrate_cascade(samples, SKILLS, target_precision=target)
+            decided, precision = _precision(samples, thresholds)
+            self.assertGreater(decided, 0)
+            self.assertGreaterEqual(precision, target)
+
+
+class CascadeDecisionTest(unittest.TestCase):
+    thresholds = CascadeThresholds(margin=0.5, abstain=1.0)
+
+    def test_accepts_a_clear_top_skill(self) -> None:
+        self.assertEqual(cascade_decision([(1, 10.0), (0, 4.0)], SKILLS, self.thresholds), ["beta"])
+
+    def test_escalates_a_close_call(self) -> None:
+        self.assertIsNone(cascade_decision([(0, 10.0), (1, 8.0)], SKILLS, self.thresholds))
+
+    def test_abstains_on_a_weak_top_score_before_checking_the_margin(self) -> None:
+        self.assertEqual(cascade_decision([(0, 0.8), (1, 0.1)], SKILLS, self.thresholds), [])
+        self.assertEqual(cascade_decision([], SKILLS, self.thresholds), [])
+
+    def test_disabled_rules_escalate(self) -> None:
+        self.assertIsNone(cascade_decision([(0, 10.0)], SKILLS, CascadeThresholds()))
+        self.assertIsNone(cascade_decision([], SKILLS, CascadeThresholds(margin=0.0)))
+
+
+if __name__ == "__main__":
+    unittest.main()
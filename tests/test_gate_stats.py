@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "scripts"))
+
+from gate_stats import case_outcomes, paired_deltas  # noqa: E402
+
+
+def _payload(*items: tuple[str, list[str], list[str]]) -> dict:
+    return {
+        "summary": {"top_k": 3},
+        "results": [{"id": case_id, "expected": expected, "bm25_top_k": top} for case_id, expected, top in items],
+    }
+
+
+class CaseIdTest(unittest.TestCase):
+    def test_outcomes_keyed_by_id(self) -> None:
+        payload = _payload(("a", ["x"], ["x"]), ("b", ["y"], ["x"]))
+        self.assertEqual(case_outcomes(payload)["bm25_hit_at_k"], {"a": 1.0, "b": 0.0})
+
+    def test_duplicate_ids_rejected(self) -> None:
+        payload = _payload(("a", ["x"], ["x"]), ("a", ["y"], ["x"]))
+        with self.assertRaisesRegex(SystemExit, "duplicate case ids: a"):
+            case_outcomes(payload)
+
+    def test_blank_id_rejected(self) -> None:
+        # A blank id used to fall back to the position, which could collide with a case named "1".
+        payload = _payload(("1", ["x"], ["x"]), (" ", ["y"], ["x"]))
+        with self.assertRaisesRegex(SystemExit, "without an id"):
+            paired_deltas(payload, payload)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import stat
+import sys
+import tempfile
+import unittest
+import zipfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "scripts"))
+
+from install_skill import install_archive, install_archives  # noqa: E402
+from package_skill import MANIFEST_NAME, package_skill  # noqa: E402
+
+SKILL_MD = "---\nname: demo-skill\ndescription: Demo skill for install tests.\n---\n\nBody.\n"
+
+
+class InstallArchiveTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+        skill_dir = self.root / "src" / "demo-skill"
+        (skill_dir / "scripts").mkdir(parents=True)
+        (skill_dir / "SKILL.md").write_text(SKILL_MD, encoding="utf-8")
+        (skill_dir / "scripts" / "run.sh").write_text("echo hi\n", encoding="utf-8")
+        self.archive = package_skill(skill_dir=skill_dir, out_dir=self.root / "dist")
+        self.install_root = self.root / "installed"
+
+    def tearDown(self) -> None:
+        self._tmp.cleanup()
+
+    def _rewrite(self, name: str, *, drop: str = "", replace: dict[str, bytes] | None = None, extra=()) -> Path:
+        """Copy of the packaged archive without `drop`, with members replaced, plus (ZipInfo, data) extras."""
+        out = self.root / "dist" / name
+        with zipfile.ZipFile(self.archive) as src, zipfile.ZipFile(out, "w") as dst:
+            for info in src.infolist():
+                if info.filename != drop:
+                    dst.writestr(info, (replace or {}).get(info.filename, src.read(info)))
+            for info, data in extra:
+                dst.writestr(info, data)
+        return out
+
+    def _assert_rejected(self, archive: Path, message: str) -> None:
+        result = install_archive(archive, install_root=self.install_root)
+        self.assertEqual(result.status, "failed")
+        self.assertIn(message, result.detail)
+        self.assertFalse((self.install_root / "demo-skill").exists())
+
+    def test_install_then_unchanged_then_forced_update(self) -> None:
+        result = install_archive(self.archive, install_root=self.install_root)
+        self.assertEqual((result.status, result.skill), ("installed", "demo-skill"))
+        installed = self.install_root / "demo-skill"
+        self.assertEqual((installed / "SKILL.md").read_text(encoding="utf-8"), SKILL_MD)
+        self.assertTrue((installed / MANIFEST_NAME).is_file())
+        self.assertEqual(install_archive(self.archive, install_root=self.install_root).status, "unchanged")
+        self.assertEqual(install_archive(self.archive, install_root=self.install_root, force=True).status, "updated")
+
+    def test_zip_slip_member_rejected(self) -> None:
+        archive = self._rewrite("slip.skill", extra=[(zipfile.ZipInfo("demo-skill/../../evil.txt"), b"x")])
+        self._assert_rejected(archive, "unsafe member path")
+        self.assertFalse((self.root / "evil.txt").exists())
+
+    def test_absolute_member_rejected(self) -> None:
+        archive = self._rewrite("abs.skill", extra=[(zipfile.ZipInfo("/tmp/evil.txt"), b"x")])
+        self._assert_rejected(archive, "unsafe member path")
+
+    def test_symlink_member_rejected(self) -> None:
+        link = zipfile.ZipInfo("demo-skill/link")
+        link.external_attr = (stat.S_IFLNK | 0o777) << 16
+        self._assert_rejected(self._rewrite("link.skill", extra=[(link, b"/etc/passwd")]), "symlink member")
+
+    def test_missing_manifest_rejected(self) -> None:
+        archive = self._rewrite("nomanifest.skill", drop=f"demo-skill/{MANIFEST_NAME}")
+        self._assert_rejected(archive, MANIFEST_NAME)
+
+    def test_member_not_in_manifest_rejected(self) -> None:
+        archive = self._rewrite("extra.skill", extra=[(zipfile.ZipInfo("demo-skill/extra.txt"), b"x")])
+        self._assert_rejected(archive, "does not match manifest")
+
+    def test_tampered_content_rejected(self) -> None:
+        archive = self._rewrite("tampered.skill", replace={"demo-skill/scripts/run.sh": b"rm -rf /\n"})
+        self._assert_rejected(archive, "sha256 mismatch")
+
+    def test_tampered_manifest_rejected(self) -> None:
+        with zipfile.ZipFile(self.archive) as zipf:
+            manifest = zipf.read(f"demo-skill/{MANIFEST_NAME}").replace(b'"digest": "', b'"digest": "0')
+        archive = self._rewrite("badmanifest.skill", replace={f"demo-skill/{MANIFEST_NAME}": manifest})
+        self._assert_rejected(archive, "manifest digest")
+
+    def test_failed_update_keeps_previous_install(self) -> None:
+        install_archive(self.archive, install_root=self.install_root)
+        archive = self._rewrite("tampered.skill", replace={"demo-skill/SKILL.md": b"changed"})
+        result = install_archive(archive, install_root=self.install_root, force=True)
+        self.assertEqual(result.status, "failed")
+        self.assertEqual((self.install_root / "demo-skill" / "SKILL.md").read_text(encoding="utf-8"), SKILL_MD)
+        self.assertEqual([p.name for p in self.install_root.iterdir()], ["demo-skill"])
+
+    def test_archives_for_the_same_skill_rejected(self) -> None:
+        copy = self._rewrite("copy.skill")
+        with self.assertRaisesRegex(SystemExit, "same skill"):
+            install_archives([self.archive, copy], install_root=self.install_root)
+
+
+if __name__ == "__main__":
+    unittest.main()
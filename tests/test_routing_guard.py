@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import io
+import json
+import sys
+import tempfile
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import redirect_stdout
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "scripts"))
+
+from router_backends import TransientRouterError  # noqa: E402
+from trigger_eval import RoutingGuard, RoutingSkipped, main, route_with_retries  # noqa: E402
+
+
+class _Router:
+    """Fails `failures` times with TransientRouterError, then returns ["skill"]; records timeouts."""
+
+    def __init__(self, failures: int = 0):
+        self.failures = failures
+        self.timeouts: list[float] = []
+
+    def __call__(self, timeout_s: float) -> list[str]:
+        self.timeouts.append(timeout_s)
+        if len(self.timeouts) <= self.failures:
+            raise TransientRouterError("timed out")
+        return ["skill"]
+
+
+def _route(router: _Router, guard: RoutingGuard, *, retries: int = 2, backoff_s: float = 0.0) -> list[str]:
+    return route_with_retries(router, guard=guard, timeout_s=10.0, retries=retries, backoff_s=backoff_s)
+
+
+class RouteWithRetriesTest(unittest.TestCase):
+    def test_retries_until_success(self) -> None:
+        guard = RoutingGuard()
+        router = _Router(failures=2)
+        self.assertEqual(_route(router, guard), ["skill"])
+        self.assertEqual((guard.calls, guard.retries, guard.consecutive_failures), (3, 2, 0))
+
+    def test_raises_last_error_when_retries_are_exhausted(self) -> None:
+        guard = RoutingGuard()
+        with self.assertRaises(TransientRouterError):
+            _route(_Router(failures=5), guard, retries=1)
+        self.assertEqual((guard.calls, guard.retries), (2, 1))
+
+    def test_non_transient_errors_are_not_retried(self) -> None:
+        guard = RoutingGuard()
+
+        def broken(timeout_s: float) -> list[str]:
+            raise ValueError("bad JSON")
+
+        with self.assertRaises(ValueError):
+            route_with_retries(broken, guard=guard, timeout_s=10.0, retries=3, backoff_s=0.0)
+        self.assertEqual(guard.calls, 1)
+
+    def test_breaker_counts_failed_calls_not_cases(self) -> None:
+        # A hung router: every call times out. With 3 retries per case, a per-case breaker would
+        # allow 3 cases x 4 calls; the per-call breaker stops after 3 calls, inside the first case.
+        guard = RoutingGuard(breaker_threshold=3)
+        router = _Router(failures=100)
+        with self.assertRaises(RoutingSkipped) as skipped:
+            _route(router, guard, retries=3)
+        self.assertEqual(skipped.exception.reason, "circuit_open")
+        self.assertEqual(len(router.timeouts), 3)
+        with self.assertRaises(RoutingSkipped):
+            _route(_Router(), guard)
+
+    def test_success_resets_the_breaker(self) -> None:
+        guard = RoutingGuard(breaker_threshold=3)
+        _route(_Router(failures=2), guard)
+        _route(_Router(failures=2), guard)
+        self.assertEqual(guard.consecutive_failures, 0)
+
+    def test_deadline_skips_and_clips_timeouts(self) -> None:
+        guard = RoutingGuard(deadline_s=5.0)
+        router = _Router()
+        _route(router, guard)
+        self.assertLessEqual(router.timeouts[0], 5.0)
+        guard.deadline -= 10.0
+        with self.assertRaises(RoutingSkipped) as skipped:
+            _route(_Router(), guard)
+        self.assertEqual(skipped.exception.reason, "deadline")
+
+    def test_backoff_is_full_jitter_exponential(self) -> None:
+        with mock.patch("trigger_eval.time.sleep") as sleep, mock.patch(
+            "trigger_eval.random.uniform", side_effect=lambda low, high: high
+        ) as uniform:
+            _route(_Router(failures=3), RoutingGuard(), retries=3, backoff_s=0.5)
+        self.assertEqual([c.args for c in uniform.call_args_list], [(0, 0.5), (0, 1.0), (0, 2.0)])
+        self.assertEqual([c.args[0] for c in sleep.call_args_list], [0.5, 1.0, 2.0])
+
+    def test_backoff_past_the_deadline_gives_up(self) -> None:
+        guard = RoutingGuard(deadline_s=1.0)
+        with mock.patch("trigger_eval.time.sleep") as sleep, mock.patch(
+            "trigger_eval.random.uniform", side_effect=lambda low, high: high
+        ):
+            with self.assertRaises(TransientRouterError):
+                _route(_Router(failures=1), guard, backoff_s=1000.0)
+        sleep.assert_not_called()
+
+
+class RouterConcurrencyTest(unittest.TestCase):
+    def test_shared_guard_counts_every_call(self) -> None:
+        guard = RoutingGuard()
+        with ThreadPoolExecutor(max_workers=16) as pool:
+            picks = list(pool.map(lambda _: _route(_Router(failures=1), guard, retries=1), range(400)))
+        self.assertEqual(picks, [["skill"]] * 400)
+        self.assertEqual((guard.calls, guard.retries, guard.consecutive_failures), (800, 400, 0))
+
+    def test_concurrent_routing_reports_the_same_results(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            skills = [
+                {"name": "frontend-design", "description": "Design landing pages and dashboards."},
+                {"name": "release-notes", "description": "Draft release notes and changelogs."},
+                {"name": "pdf-tools", "description": "Merge, split and fill PDF forms."},
+            ]
+            (root / "skills.json").write_text(json.dumps({"skills": skills}), encoding="utf-8")
+            prompts = ["a landing page", "release notes please", "fill a PDF form", "the weather", "a dashboard"]
+            cases = [
+                {"id": f"case-{i}", "prompt": f"{prompt} {i}", "expected": [skills[i % 3]["name"]] if i % 5 else []}
+                for i, prompt in enumerate(prompts * 4)
+            ]
+            (root / "cases.json").write_text(json.dumps({"cases": cases}), encoding="utf-8")
+
+            def run(concurrency: int) -> dict:
+                out = root / f"results_{concurrency}.json"
+                argv = ["--skills", str(root / "skills.json"), "--cases", str(root / "cases.json"), "--out", str(out)]
+                argv += ["--use-codex", "--router", "stub", "--stub-error-rate", "0.3", "--retry-backoff", "0"]
+                # Which cases a tripped breaker skips depends on call timing, so keep it out of the comparison.
+                argv += ["--breaker-threshold", "0"]
+                with redirect_stdout(io.StringIO()):
+                    main([*argv, "--router-concurrency", str(concurrency)])
+                return json.loads(out.read_text(encoding="utf-8"))
+
+            serial, parallel = run(1), run(4)
+        self.assertEqual(parallel["results"], serial["results"])
+        for name in ("codex_exact_match_rate", "codex_retries", "codex_errors", "codex_skipped"):
+            self.assertEqual(parallel["summary"][name], serial["summary"][name], name)
+        self.assertGreater(serial["summary"]["codex_retries"], 0)
+        self.assertEqual(parallel["summary"]["router_concurrency"], 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "scripts"))
+
+from index_skills import SkillRecord  # noqa: E402
+from skill_catalog import _HEADER, SkillCatalog, encode_catalog  # noqa: E402
+
+
+def _record(name: str) -> SkillRecord:
+    return SkillRecord(
+        name=name,
+        description=f"{name} description",
+        short_description="",
+        version="",
+        license="",
+        allowed_tools="",
+        skill_dir=f"/skills/{name}",
+        skill_md=f"/skills/{name}/SKILL.md",
+        scope_hint="custom",
+        has_scripts=True,
+        has_references=False,
+        has_examples=False,
+        has_assets=False,
+    )
+
+
+class SkillCatalogTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self._tmp.name) / "skills.skcat"
+        self.data = encode_catalog({"skills_dir": "/skills", "skills": [_record("alpha"), _record("beta")]})
+
+    def tearDown(self) -> None:
+        self._tmp.cleanup()
+
+    def _open(self, data: bytes) -> SkillCatalog:
+        self.path.write_bytes(data)
+        return SkillCatalog(self.path)
+
+    def test_round_trip(self) -> None:
+        with self._open(self.data) as catalog:
+            self.assertEqual(len(catalog), 2)
+            self.assertEqual(catalog.get("beta"), _record("beta"))
+
+    def test_empty_file(self) -> None:
+        with self.assertRaisesRegex(SystemExit, "truncated"):
+            self._open(b"")
+
+    def test_truncated_header(self) -> None:
+        with self.assertRaisesRegex(SystemExit, "truncated"):
+            self._open(self.data[: _HEADER.size - 1])
+
+    def test_truncated_sections(self) -> None:
+        with self.assertRaisesRegex(SystemExit, "truncated"):
+            self._open(self.data[: _HEADER.size + 10])
+
+    def test_truncated_string_table(self) -> None:
+        with self._open(self.data[:-5]) as catalog:
+            with self.assertRaisesRegex(SystemExit, "[Tt]runcated"):
+                list(catalog)
+
+    def test_bad_magic(self) -> None:
+        with self.assertRaisesRegex(SystemExit, "bad magic"):
+            self._open(b"NOTACAT!" + self.data[8:])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "scripts"))
+
+from skill_dupes import MIN_CANDIDATE_RECALL, collision_probability, find_near_duplicates, lsh_bands  # noqa: E402
+
+
+def _pair(shared: int, size: int = 20) -> list[tuple[str, str]]:
+    """Two docs of `size` distinct tokens sharing `shared` of them: Jaccard shared / (2 * size - shared)."""
+    a = [f"common{i}" for i in range(shared)] + [f"left{i}" for i in range(size - shared)]
+    b = [f"common{i}" for i in range(shared)] + [f"right{i}" for i in range(size - shared)]
+    return [("skill-a", " ".join(a)), ("skill-b", " ".join(b))]
+
+
+class NearDuplicateTest(unittest.TestCase):
+    def test_derived_bands_reach_the_threshold(self) -> None:
+        for threshold in (0.2, 0.3, 0.5, 0.8, 0.9):
+            bands, rows = lsh_bands(threshold, num_perm=128)
+            self.assertLessEqual(bands * rows, 128)
+            self.assertGreaterEqual(collision_probability(threshold, bands=bands, rows=rows), MIN_CANDIDATE_RECALL)
+
+    def test_pair_just_above_low_threshold_is_found(self) -> None:
+        docs = _pair(10)  # Jaccard 10 / 30 = 0.333
+        for seed in range(1, 21):
+            pairs = find_near_duplicates(docs, threshold=0.3, seed=seed)
+            self.assertEqual([(p["a"], p["b"]) for p in pairs], [("skill-a", "skill-b")], f"seed {seed}")
+            self.assertAlmostEqual(pairs[0]["jaccard"], 1 / 3)
+
+    def test_pair_below_threshold_is_not_reported(self) -> None:
+        docs = _pair(8)  # Jaccard 8 / 32 = 0.25
+        self.assertEqual(find_near_duplicates(docs, threshold=0.3), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import json
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "scripts"))
+
+from skill_mentions import MentionAutomaton  # noqa: E402
+
+NAMES = {
+    "frontend-design": ["ui kit"],
+    "pdf": [],
+    "pdf-tools": [],
+    "数据分析": ["数据 报表"],
+    "分析师": [],
+}
+
+
+class MentionAutomatonTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.automaton = MentionAutomaton.build(NAMES)
+
+    def test_hyphen_space_and_underscore_spellings(self) -> None:
+        for prompt in (
+            "Use frontend-design for this",
+            "use Frontend Design for this",
+            "use frontend_design for this",
+            "(frontend-design).",
+        ):
+            with self.subTest(prompt=prompt):
+                self.assertEqual(self.automaton.find(prompt), ["frontend-design"])
+
+    def test_aliases_map_to_their_skill(self) -> None:
+        self.assertEqual(self.automaton.find("build it with the UI-kit"), ["frontend-design"])
+        self.assertEqual(self.automaton.find("生成数据报表"), ["数据分析"])
+
+    def test_ascii_spellings_must_be_whole_words(self) -> None:
+        for prompt in ("myfrontend-design", "frontend-designer", "frontend-design-v2", "pdfs", "xpdf"):
+            with self.subTest(prompt=prompt):
+                self.assertEqual(self.automaton.find(prompt), [])
+
+    def test_cjk_spellings_match_without_word_boundaries(self) -> None:
+        self.assertEqual(self.automaton.find("请帮我做数据分析报告"), ["数据分析"])
+        self.assertEqual(self.automaton.find("找一个分析师"), ["分析师"])
+
+    def test_leftmost_longest_non_overlapping(self) -> None:
+        self.assertEqual(self.automaton.find("use pdf tools"), ["pdf-tools"])
+        self.assertEqual(self.automaton.find("use pdf, then pdf-tools"), ["pdf", "pdf-tools"])
+        # "分析师" overlaps the earlier, longer "数据分析" mention and is dropped.
+        self.assertEqual(self.automaton.spans("数据分析师"), [(0, 4, "数据分析")])
+
+    def test_find_dedupes_in_order_of_first_mention(self) -> None:
+        self.assertEqual(self.automaton.find("pdf, frontend design, then pdf again"), ["pdf", "frontend-design"])
+
+    def test_strip_blanks_out_mentions(self) -> None:
+        self.assertEqual(self.automaton.strip("Use Frontend-Design for a landing page"), "use   for a landing page")
+        self.assertEqual(self.automaton.strip("请做数据分析报告"), "请做 报告")
+        self.assertEqual(self.automaton.strip("No mentions here"), "no mentions here")
+
+    def test_serialized_automaton_matches_the_same_spans(self) -> None:
+        loaded = MentionAutomaton.from_json(json.loads(json.dumps(self.automaton.to_json())))
+        assert loaded is not None
+        for prompt in ("use pdf tools and the ui kit", "请帮我做数据分析师报告", "frontend-designer"):
+            with self.subTest(prompt=prompt):
+                self.assertEqual(loaded.spans(prompt), self.automaton.spans(prompt))
+
+    def test_unknown_version_is_not_loaded(self) -> None:
+        self.assertIsNone(MentionAutomaton.from_json({**self.automaton.to_json(), "version": 0}))
+
+
+if __name__ == "__main__":
+    unittest.main()
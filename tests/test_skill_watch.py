@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "scripts"))
+
+from skill_watch import WatchState  # noqa: E402
+
+SKILLS = {
+    "frontend-design": "Design responsive landing pages and dashboards with polished UI.",
+    "product-roadmap": "Prioritize a product roadmap with RICE scoring and sequencing.",
+    "release-notes": "Draft release notes and changelogs from merged pull requests.",
+}
+
+
+def _write_skill(root: Path, dir_name: str, name: str, description: str) -> Path:
+    skill_md = root / dir_name / "SKILL.md"
+    skill_md.parent.mkdir(parents=True, exist_ok=True)
+    skill_md.write_text(f"---\nname: {name}\ndescription: {description}\n---\n\nBody.\n", encoding="utf-8")
+    return skill_md
+
+
+class WatchStateTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        root = Path(self._tmp.name)
+        self.skills_dir = root / "skills"
+        for name, description in SKILLS.items():
+            _write_skill(self.skills_dir, name, name, description)
+        self.cases_path = root / "cases.json"
+        cases = [
+            {"id": "explicit", "prompt": "Use frontend-design for a landing page", "expected": ["frontend-design"]},
+            {"id": "implicit", "prompt": "make my dashboard look polished", "expected": ["frontend-design"]},
+            {"id": "roadmap", "prompt": "rank the roadmap with RICE", "expected": ["product-roadmap"]},
+        ]
+        self.cases_path.write_text(json.dumps({"cases": cases}), encoding="utf-8")
+
+    def tearDown(self) -> None:
+        self._tmp.cleanup()
+
+    def _state(self, **overrides) -> WatchState:
+        options = dict(
+            skills_dir=self.skills_dir,
+            cases_path=self.cases_path,
+            top_k=3,
+            scopes=None,
+            global_idf=True,
+            fuzzy=False,
+            fuzzy_max_edits=2,
+            fuzzy_weight=0.5,
+        )
+        options.update(overrides)
+        return WatchState(**options)
+
+    def _assert_matches_fresh_build(self, **overrides) -> WatchState:
+        state = self._state(**overrides)
+        skill_md = _write_skill(self.skills_dir, "frontend-design", "frontend-design-v2", SKILLS["frontend-design"])
+        update = state.apply({skill_md}, rescan=False)
+        self.assertEqual(update["skills_changed"], ["frontend-design-v2"])
+        self.assertEqual(state.items, self._state(**overrides).items)
+        self.assertEqual(state.summary(), self._state(**overrides).summary())
+        return state
+
+    def test_rename_matches_fresh_build(self) -> None:
+        state = self._assert_matches_fresh_build()
+        picks = [name for item in state.items for name in item["bm25_top_k"]]
+        self.assertNotIn("frontend-design", picks)
+        self.assertIn("frontend-design-v2", picks)
+        self.assertLess(state.summary()["bm25_hit_at_k"], 1.0)
+
+    def test_rename_matches_fresh_build_with_per_shard_idf(self) -> None:
+        self._assert_matches_fresh_build(global_idf=False)
+
+    def test_description_edit_matches_fresh_build(self) -> None:
+        state = self._state()
+        skill_md = _write_skill(
+            self.skills_dir, "release-notes", "release-notes", "Polished landing page dashboards for releases."
+        )
+        state.apply({skill_md}, rescan=False)
+        self.assertEqual(state.items, self._state().items)
+
+
+if __name__ == "__main__":
+    unittest.main()
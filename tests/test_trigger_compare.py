@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "scripts"))
+
+from trigger_compare import Side, compare, expected_ranks, main, rank_from_scores  # noqa: E402
+from trigger_eval import Case, ShardedBM25, Skill, skill_doc, tokenize  # noqa: E402
+
+SKILLS = [
+    {"name": "frontend-design", "description": "Design responsive landing pages and dashboards with polished UI."},
+    {"name": "product-roadmap", "description": "Prioritize a product roadmap with RICE scoring and sequencing."},
+    {"name": "release-notes", "description": "Draft release notes and changelogs from merged pull requests."},
+    {"name": "pdf-tools", "description": "Merge, split and fill PDF forms.", "scope_hint": "system"},
+    {"name": "spreadsheet", "description": "Clean up spreadsheet data and build pivot tables.", "scope_hint": "system"},
+]
+
+CASES = [
+    Case("explicit", "Use frontend-design for a landing page", ["frontend-design"]),
+    Case("implicit", "make my dashboard look polished", ["frontend-design"]),
+    Case("roadmap", "rank the roadmap with RICE scoring", ["product-roadmap"]),
+    Case("notes", "draft notes for the release", ["release-notes"]),
+    Case("pdf", "fill in this PDF form", ["pdf-tools"]),
+    Case("pivot", "pivot tables for the roadmap data", ["spreadsheet"]),
+    Case("mixed", "release notes for the roadmap", ["product-roadmap"]),
+    Case("negative", "what is the weather tomorrow", []),
+]
+
+
+def _args(**overrides) -> argparse.Namespace:
+    options = dict(
+        scopes="",
+        per_shard_idf=False,
+        top_k=3,
+        mention_trust="corroborated",
+        cascade_target_precision=0.95,
+        cascade_margin=None,
+        cascade_abstain=None,
+        bootstrap_resamples=200,
+    )
+    options.update(overrides)
+    return argparse.Namespace(**options)
+
+
+class RankFromScoresTest(unittest.TestCase):
+    def test_matches_sharded_rank(self) -> None:
+        skills = [Skill(s["name"], s["description"], s.get("scope_hint", "custom")) for s in SKILLS]
+        for global_idf in (True, False):
+            bm25 = ShardedBM25([skill_doc(s) for s in skills], [s.scope for s in skills], global_idf=global_idf)
+            for c in CASES:
+                query = tokenize(c.prompt)
+                for scopes in (None, {"system"}, {"custom"}):
+                    for top_k in (1, 2, 5, 10):
+                        with self.subTest(prompt=c.prompt, scopes=scopes, top_k=top_k, global_idf=global_idf):
+                            scores = bm25.scores(query, scopes=scopes)
+                            self.assertEqual(
+                                rank_from_scores(scores, skills, top_k=top_k, scopes=scopes),
+                                bm25.rank(query, top_k=top_k, scopes=scopes),
+                            )
+
+    def test_expected_ranks(self) -> None:
+        skills = [Skill("a", ""), Skill("b", ""), Skill("c", "")]
+        ranks = expected_ranks({0: 1.0, 1: 2.0, 2: 1.0}, skills, ["a", "b", "c", "missing"])
+        self.assertEqual(ranks, {"a": 2, "b": 1, "c": 3, "missing": None})
+        self.assertEqual(expected_ranks({1: 2.0}, skills, ["a"]), {"a": None})
+
+
+class CompareTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.skills_path = Path(self._tmp.name) / "skills_index.json"
+        self.skills_path.write_text(json.dumps({"skills": SKILLS}), encoding="utf-8")
+        self.bm25 = Side("baseline", self.skills_path, 1.5, 0.75, "bm25")
+        self.cascade = Side("candidate", self.skills_path, 1.5, 0.75, "cascade")
+
+    def tearDown(self) -> None:
+        self._tmp.cleanup()
+
+    def test_sides_sharing_an_index_score_each_prompt_once(self) -> None:
+        with mock.patch.object(ShardedBM25, "scores", autospec=True, side_effect=ShardedBM25.scores) as scores:
+            report = compare(self.bm25, self.cascade, CASES, _args(cascade_margin=0.2, cascade_abstain=0.0))
+        self.assertEqual(report["summary"]["indices_built"], 1)
+        self.assertEqual(scores.call_count, len(CASES))
+
+    def test_route_exact_match_delta_is_over_cases_both_sides_route(self) -> None:
+        report = compare(self.bm25, self.cascade, CASES, _args(cascade_margin=0.9, cascade_abstain=0.0))
+        summary = report["summary"]
+        sides = summary["sides"]
+        by_id = {r["id"]: r for r in report["results"]}
+        picks = [(r["baseline"]["route_picks"], r["candidate"]["route_picks"]) for r in report["results"]]
+        compared = [(before, after) for before, after in picks if after is not None]
+        self.assertEqual(summary["route_cases_compared"], len(compared))
+        self.assertEqual(sides["candidate"]["metrics"]["route_escalation_rate"], 1 - len(compared) / len(CASES))
+        paired = summary["paired_deltas"]["cascade_exact_match_rate"]
+        self.assertEqual(paired["n"], len(compared))
+        self.assertAlmostEqual(summary["deltas"]["route_exact_match_rate"], paired["point"])
+        # The baseline's miss on "mixed" is escalated by the cascade, so it is not compared.
+        self.assertEqual(by_id["mixed"]["baseline"]["route_picks"], ["release-notes"])
+        self.assertIsNone(by_id["mixed"]["candidate"]["route_picks"])
+        self.assertEqual(sides["baseline"]["metrics"]["route_exact_match_rate"], 1.0)
+
+    def test_thresholds_are_fixed_or_flagged_as_calibrated_on_the_suite(self) -> None:
+        fixed = compare(self.bm25, self.cascade, CASES, _args(cascade_margin=0.5, cascade_abstain=0.0))
+        thresholds = fixed["summary"]["sides"]["candidate"]["cascade_thresholds"]
+        self.assertEqual(thresholds, {"margin": 0.5, "abstain": 0.0, "calibrated_on_suite": False})
+        calibrated = compare(self.bm25, self.cascade, CASES, _args(cascade_margin=0.5))
+        thresholds = calibrated["summary"]["sides"]["candidate"]["cascade_thresholds"]
+        self.assertEqual((thresholds["margin"], thresholds["calibrated_on_suite"]), (0.5, True))
+        self.assertNotIn("cascade_thresholds", calibrated["summary"]["sides"]["baseline"])
+
+    def test_changed_cases_and_ranks(self) -> None:
+        candidate = Side("candidate", self.skills_path, 1.5, 0.75, "bm25", (3.0, 1.0, 0.5))
+        report = compare(self.bm25, candidate, CASES, _args())
+        self.assertEqual(report["summary"]["indices_built"], 2)
+        by_id = {r["id"]: r for r in report["results"]}
+        self.assertEqual(by_id["explicit"]["baseline"]["expected_ranks"], {"frontend-design": 1})
+        self.assertEqual(by_id["negative"]["baseline"]["route_picks"], [])
+        for name, ids in report["summary"]["changed_cases"].items():
+            for case_id in ids:
+                self.assertIn(case_id, by_id, name)
+
+    def test_identical_sides_are_rejected(self) -> None:
+        cases_path = Path(self._tmp.name) / "cases.json"
+        cases_path.write_text(json.dumps({"cases": [{"id": "a", "prompt": "x", "expected": []}]}), encoding="utf-8")
+        with self.assertRaisesRegex(SystemExit, "identical"):
+            main(["--baseline", str(self.skills_path), "--cases", str(cases_path), "--out", str(cases_path)])
+
+
+if __name__ == "__main__":
+    unittest.main()